@@ -9,6 +9,7 @@ import epyqlib.utils.general
 import mpm.c
 import mpm.mpm_helper
 import mpm.anomalymodel
+import mpm.xlsx
 
 builders = epyqlib.utils.general.TypeMap()
 
@@ -90,7 +91,6 @@ def export(
 
     workbook = builder.gen()
     if workbook:
-        path.parent.mkdir(parents=True, exist_ok=True)
         workbook.save(path)
 
 
@@ -104,21 +104,17 @@ class Root:
     trigger_types = attr.ib()
     skip_output = attr.ib(default=False)
 
-    header_font = openpyxl.styles.Font(bold=True)
-    header_fill = openpyxl.styles.PatternFill(
-        start_color="FF8DB4E2", end_color="FF8DB4E2", fill_type="solid"
-    )
-    table_alignment = openpyxl.styles.Alignment(
-        horizontal="left", vertical="top", wrapText=True
-    )
+    header_style = "Anomaly Header"
+    table_style = "Anomaly Table"
+    info_header_style = "Anomaly Info Header"
+    info_style = "Anomaly Info"
 
     def gen(self):
 
         if self.skip_output:
             return None
 
-        workbook = openpyxl.Workbook()
-        workbook.remove(workbook.active)
+        workbook = mpm.xlsx.Workbook(styles=self.create_styles())
 
         # Add sheet for response level descriptions
         worksheet = workbook.create_sheet("Anomalies")
@@ -134,14 +130,50 @@ class Root:
 
         return workbook
 
-    def generate_anomalies_sheet(
-        self, worksheet: openpyxl.worksheet.worksheet.Worksheet
-    ) -> None:
+    def create_styles(self) -> typing.List[openpyxl.styles.NamedStyle]:
+        """
+        Creates the named styles used by the sheets, so each cell only refers
+        to a style rather than carrying its own font, fill and alignment.
+
+        Returns:
+            list of named styles
+        """
+        header_font = openpyxl.styles.Font(bold=True)
+        header_fill = openpyxl.styles.PatternFill(
+            start_color="FF8DB4E2", end_color="FF8DB4E2", fill_type="solid"
+        )
+        table_alignment = openpyxl.styles.Alignment(
+            horizontal="left", vertical="top", wrapText=True
+        )
+
+        return [
+            openpyxl.styles.NamedStyle(
+                name=self.header_style,
+                font=header_font,
+                fill=header_fill,
+            ),
+            openpyxl.styles.NamedStyle(
+                name=self.table_style,
+                alignment=table_alignment,
+            ),
+            openpyxl.styles.NamedStyle(
+                name=self.info_header_style,
+                font=header_font,
+                fill=header_fill,
+                alignment=table_alignment,
+            ),
+            openpyxl.styles.NamedStyle(
+                name=self.info_style,
+                alignment=table_alignment,
+            ),
+        ]
+
+    def generate_anomalies_sheet(self, worksheet: mpm.xlsx.Sheet) -> None:
         """
         Generates a spreadsheet for anomalies.
 
         Args:
-            worksheet: Empty openpyxl worksheet object.
+            worksheet: Empty worksheet object.
 
         Returns:
             None
@@ -153,38 +185,35 @@ class Root:
                 return ""
             return str(value)
 
-        # Add and format header row
-        worksheet.append(field_names.as_filtered_tuple(self.column_filter))
-        for cell in worksheet[1]:
-            cell.font = self.header_font
-            cell.fill = self.header_fill
+        # Add header row
+        rows = [field_names.as_filtered_tuple(self.column_filter)]
 
         # Iterate anomaly tables and add new rows from them
         for anomaly_table in self.wrapped.children:
 
-            rows = builders.wrap(
+            table_rows = builders.wrap(
                 wrapped=anomaly_table,
                 parameter_uuid_finder=self.parameter_uuid_finder,
             ).gen()
 
-            for row in rows:
-                worksheet.append(
+            for row in table_rows:
+                rows.append(
                     row.as_filtered_tuple(self.column_filter),
                 )
 
-        # Apply text alignment to table
-        for row in worksheet.iter_rows(min_row=2):
-            for cell in row:
-                cell.alignment = self.table_alignment
+        worksheet.rows = rows
+        worksheet.header_style = self.header_style
+        worksheet.style = self.table_style
 
         # Adjust column widths in the worksheet in regards of text length
-        for column_cells in worksheet.columns:
-            length = max(len(as_text(cell.value)) for cell in column_cells)
-            worksheet.column_dimensions[column_cells[0].column].width = length + 5
+        for index, column_values in enumerate(zip(*rows), start=1):
+            length = max(len(as_text(value)) for value in column_values)
+            column = openpyxl.utils.get_column_letter(index)
+            worksheet.column_widths[column] = length + 5
 
     def generate_enum_info_sheet(
         self,
-        worksheet: openpyxl.worksheet.worksheet.Worksheet,
+        worksheet: mpm.xlsx.Sheet,
         enumeration: epyqlib.pm.parametermodel.Enumeration,
     ) -> None:
         """
@@ -192,44 +221,36 @@ class Root:
         The sheet contains enumerator names and their respective comments.
 
         Args:
-            worksheet:   Empty openpyxl worksheet object.
+            worksheet:   Empty worksheet object.
             enumeration: Enumeration for which the sheet is generated.
 
         Returns:
             None
         """
 
-        # Add and format header row
-        worksheet.append(
-            info_sheet_field_names.as_filtered_tuple(self.column_filter),
-        )
-        for cell in worksheet[1]:
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-
-        # Add response level descriptions
-        row = InfoSheetFields()
-        for enum in enumeration.children:
-            row.name = enum.name
-            row.desc = enum.description
-            worksheet.append(
-                row.as_filtered_tuple(self.column_filter),
-            )
+        def gen_rows():
+            # Add header row
+            yield info_sheet_field_names.as_filtered_tuple(self.column_filter)
+
+            # Add response level descriptions
+            row = InfoSheetFields()
+            for enum in enumeration.children:
+                row.name = enum.name
+                row.desc = enum.description
+                yield row.as_filtered_tuple(self.column_filter)
+
+        worksheet.rows = gen_rows()
 
         # Format cell text alignment for all cells in the sheet
-        for col in worksheet.iter_cols():
-            for cell in col:
-                cell.alignment = openpyxl.styles.Alignment(
-                    wrap_text=True, horizontal="left", vertical="top"
-                )
+        worksheet.header_style = self.info_header_style
+        worksheet.style = self.info_style
 
         # Format column widths
-        worksheet.column_dimensions["A"].width = 50
-        worksheet.column_dimensions["B"].width = 200
+        worksheet.column_widths["A"] = 50
+        worksheet.column_widths["B"] = 200
 
         # Format row heights
-        for cell in worksheet["A"][1:]:
-            worksheet.row_dimensions[cell.row].height = 50
+        worksheet.row_height = 50
 
 
 @builders(mpm.anomalymodel.AnomalyTable)
@@ -0,0 +1,4 @@
+"""Timing of project loading and the exporters on synthetic projects.
+
+Run with ``python -m mpm.benchmarks --help``.
+"""
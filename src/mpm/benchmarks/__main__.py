@@ -0,0 +1,175 @@
+import pathlib
+import sys
+import tempfile
+
+import attr
+import click
+
+import mpm.benchmarks.suite
+import mpm.benchmarks.synthetic
+import mpm.modelcache
+import mpm.project
+
+
+@click.command()
+@click.option(
+    "--scale",
+    "scale_name",
+    type=click.Choice(sorted(mpm.benchmarks.synthetic.scales)),
+    default="small",
+    show_default=True,
+    help="Preset size of the synthetic project",
+)
+@click.option("--parameters", type=int, help="Override the parameter count")
+@click.option("--multiplexers", type=int, help="Override the multiplexer count")
+@click.option("--sunspec-models", type=int, help="Override the SunSpec model count")
+@click.option("--points-per-model", type=int, help="Override the points per model")
+@click.option("--tables", type=int, help="Override the curve table count")
+@click.option(
+    "--benchmark",
+    "selected",
+    multiple=True,
+    help="Benchmark to run, may be repeated (default: all)",
+)
+@click.option("--repeat", type=int, default=3, show_default=True)
+@click.option(
+    "--work-path",
+    type=click.Path(file_okay=False, resolve_path=True),
+    help="Directory for the generated project, a temporary one when omitted",
+)
+@click.option(
+    "--model-cache/--no-model-cache",
+    default=False,
+    show_default=True,
+    help="Cache the loaded models in the work directory between repeats",
+)
+@click.option(
+    "--save",
+    type=click.Path(dir_okay=False, resolve_path=True),
+    help="Save the results as a baseline for later comparison",
+)
+@click.option(
+    "--compare",
+    type=click.Path(exists=True, dir_okay=False, resolve_path=True),
+    help="Baseline to compare against, regressions give a non-zero exit code",
+)
+@click.option(
+    "--tolerance",
+    type=float,
+    default=0.2,
+    show_default=True,
+    help="Allowed fractional slowdown versus the baseline",
+)
+def main(
+    scale_name,
+    parameters,
+    multiplexers,
+    sunspec_models,
+    points_per_model,
+    tables,
+    selected,
+    repeat,
+    work_path,
+    model_cache,
+    save,
+    compare,
+    tolerance,
+):
+    """Time project loading and the exporters on a synthetic project"""
+    overrides = {
+        "parameters": parameters,
+        "multiplexers": multiplexers,
+        "sunspec_models": sunspec_models,
+        "points_per_model": points_per_model,
+        "tables": tables,
+    }
+    scale = attr.evolve(
+        mpm.benchmarks.synthetic.scales[scale_name],
+        **{name: value for name, value in overrides.items() if value is not None},
+    )
+
+    benchmarks = mpm.benchmarks.suite.benchmarks
+    if len(selected) > 0:
+        unknown = set(selected) - {benchmark.name for benchmark in benchmarks}
+        if len(unknown) > 0:
+            raise click.BadParameter(
+                f"Unknown benchmarks: {', '.join(sorted(unknown))}",
+                param_hint="--benchmark",
+            )
+
+        benchmarks = [
+            benchmark for benchmark in benchmarks if benchmark.name in selected
+        ]
+
+    with tempfile.TemporaryDirectory() as temporary:
+        if work_path is None:
+            work_path = temporary
+
+        work_path = pathlib.Path(work_path)
+
+        if model_cache:
+            mpm.project.model_cache = mpm.modelcache.ModelCache(
+                directory=work_path / "cache" / "models",
+            )
+        else:
+            mpm.project.model_cache = None
+
+        click.echo(f"Generating {scale}")
+        project_path = mpm.benchmarks.synthetic.generate(
+            directory=work_path,
+            scale=scale,
+        )
+
+        pmvs_path = work_path / "pmvs"
+        pmvs_path.mkdir(exist_ok=True)
+
+        context = mpm.benchmarks.suite.Context(
+            project_path=project_path,
+            paths=mpm.benchmarks.synthetic.target_paths(work_path),
+            pmvs_path=pmvs_path,
+        )
+
+        results = mpm.benchmarks.suite.Results(scale=attr.asdict(scale))
+
+        for benchmark in benchmarks:
+            timing = mpm.benchmarks.suite.time_benchmark(
+                benchmark=benchmark,
+                context=context,
+                repeat=repeat,
+            )
+            results.timings[benchmark.name] = timing
+            click.echo(
+                f"{benchmark.name:<24} "
+                f"min {timing.minimum:9.4f}s  median {timing.median:9.4f}s"
+            )
+
+    if save is not None:
+        results.save(save)
+
+    if compare is not None:
+        baseline = mpm.benchmarks.suite.Results.load(compare)
+        comparisons = mpm.benchmarks.suite.compare(
+            baseline=baseline,
+            current=results,
+            tolerance=tolerance,
+        )
+
+        click.echo()
+        if baseline.scale != results.scale:
+            click.echo(f"Baseline was run at a different scale: {baseline.scale}")
+
+        for comparison in comparisons:
+            if comparison.ratio is None:
+                change = "no baseline"
+            else:
+                change = f"{comparison.ratio:6.2f}x"
+
+            flag = "  REGRESSED" if comparison.regressed else ""
+            click.echo(f"{comparison.name:<24} {change}{flag}")
+
+        if any(comparison.regressed for comparison in comparisons):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
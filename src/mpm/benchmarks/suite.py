@@ -0,0 +1,326 @@
+"""The benchmarked operations along with timing and baseline comparison."""
+
+import gc
+import json
+import pathlib
+import platform
+import statistics
+import time
+import typing
+
+import attr
+
+import mpm
+import mpm.anomaliestoc
+import mpm.anomaliestoxlsx
+import mpm.cantosym
+import mpm.cantoxlsx
+import mpm.mpm_helper
+import mpm.parameterstobitfieldsc
+import mpm.parameterstohierarchy
+import mpm.parameterstointerface
+import mpm.parameterstosil
+import mpm.paths
+import mpm.project
+import mpm.sunspectocsv
+import mpm.sunspectointerface
+import mpm.sunspectotablesc
+import mpm.sunspectoxlsx
+
+
+format_version = 1
+
+
+@attr.s
+class Context:
+    """What the benchmarks operate on, the project is loaded on first use."""
+
+    project_path = attr.ib(converter=pathlib.Path)
+    paths = attr.ib(type=mpm.paths.ImportPaths)
+    pmvs_path = attr.ib(converter=pathlib.Path)
+    _project = attr.ib(default=None)
+
+    @property
+    def project(self) -> mpm.project.Project:
+        if self._project is None:
+            self._project = mpm.project.loadp(self.project_path)
+
+        return self._project
+
+
+def fresh_index(context: Context) -> None:
+    # Include building the node lookups in each exporter timing
+    context.project.index.invalidate()
+
+
+@attr.s(frozen=True)
+class Benchmark:
+    """
+    A timed operation.  `setup` is run untimed before each run and its result
+    is passed to `run`.
+    """
+
+    name = attr.ib()
+    run = attr.ib()
+    setup = attr.ib(default=fresh_index)
+
+
+def unloaded_project(context: Context) -> mpm.project.Project:
+    return mpm.project.loadp(context.project_path, post_load=False)
+
+
+def interface_export(context: Context, prepared) -> None:
+    project = context.project
+
+    mpm.parameterstointerface.export(
+        c_path=context.paths.interface_c,
+        h_path=context.paths.interface_c.with_suffix(".h"),
+        c_path_rejected_callback=context.paths.rejected_callback_c,
+        can_model=project.models.can,
+        sunspec1_model=project.models.sunspec1,
+        sunspec2_model=project.models.sunspec2,
+        staticmodbus_model=project.models.staticmodbus,
+        parameters_model=project.models.parameters,
+        project_index=project.index,
+    )
+
+
+def bitfields_export(context: Context, prepared) -> None:
+    project = context.project
+
+    mpm.parameterstobitfieldsc.export(
+        c_path=context.paths.bitfields_c,
+        h_path=context.paths.bitfields_c.with_suffix(".h"),
+        parameters_model=project.models.parameters,
+        sunspec1_model=project.models.sunspec1,
+        sunspec2_model=project.models.sunspec2,
+        staticmodbus_model=project.models.staticmodbus,
+    )
+
+
+# The SunSpec manual and static Modbus C and spreadsheet generators don't
+# handle the model tables of the synthetic projects and aren't run by
+# `mpm export build`, so they aren't benchmarked.
+benchmarks = [
+    Benchmark(
+        name="loadp",
+        run=lambda context, prepared: mpm.project.loadp(
+            context.project_path,
+            post_load=False,
+        ),
+        setup=lambda context: None,
+    ),
+    Benchmark(
+        name="post_load",
+        run=lambda context, project: mpm.project._post_load(project),
+        setup=unloaded_project,
+    ),
+    Benchmark(
+        name="cantosym",
+        run=lambda context, prepared: mpm.cantosym.export(
+            path=context.paths.can,
+            can_model=context.project.models.can,
+            parameters_model=context.project.models.parameters,
+        ),
+    ),
+    Benchmark(
+        name="parameterstohierarchy",
+        run=lambda context, prepared: mpm.parameterstohierarchy.export(
+            path=context.paths.hierarchy,
+            can_model=context.project.models.can,
+            parameters_model=context.project.models.parameters,
+            project_index=context.project.index,
+        ),
+    ),
+    Benchmark(name="parameterstointerface", run=interface_export),
+    Benchmark(
+        name="parameterstosil",
+        run=lambda context, prepared: mpm.parameterstosil.export(
+            c_path=context.paths.sil_c,
+            h_path=context.paths.sil_c.with_suffix(".h"),
+            parameters_model=context.project.models.parameters,
+        ),
+    ),
+    Benchmark(
+        name="anomaliestoc",
+        run=lambda context, prepared: mpm.anomaliestoc.export(
+            h_path=context.paths.anomalies_h,
+            anomaly_model=context.project.models.anomalies,
+            parameters_model=context.project.models.parameters,
+        ),
+    ),
+    Benchmark(name="parameterstobitfieldsc", run=bitfields_export),
+    Benchmark(
+        name="sunspectointerface",
+        run=lambda context, prepared: mpm.sunspectointerface.export(
+            c_path=context.paths.sunspec1_interface_gen_c,
+            h_path=context.paths.sunspec1_interface_gen_c.with_suffix(".h"),
+            sunspec_model=context.project.models.sunspec1,
+            sunspec_id=mpm.mpm_helper.SunSpecSection.SUNSPEC_ONE,
+        ),
+    ),
+    Benchmark(
+        name="sunspectotablesc",
+        run=lambda context, prepared: mpm.sunspectotablesc.export(
+            c_path=context.paths.sunspec1_tables_c,
+            h_path=context.paths.sunspec1_tables_c.with_suffix(".h"),
+            sunspec_model=context.project.models.sunspec1,
+            sunspec_id=mpm.mpm_helper.SunSpecSection.SUNSPEC_ONE,
+        ),
+    ),
+    Benchmark(
+        name="sunspectocsv",
+        run=lambda context, prepared: mpm.sunspectocsv.export(
+            path=context.paths.sunspec1_spreadsheet.with_suffix(".csv"),
+            sunspec_model=context.project.models.sunspec1,
+            sunspec_id=mpm.mpm_helper.SunSpecSection.SUNSPEC_ONE,
+            parameters_model=context.project.models.parameters,
+        ),
+    ),
+    Benchmark(
+        name="sunspectoxlsx",
+        run=lambda context, prepared: mpm.sunspectoxlsx.export(
+            path=context.paths.sunspec1_spreadsheet,
+            sunspec_model=context.project.models.sunspec1,
+            sunspec_id=mpm.mpm_helper.SunSpecSection.SUNSPEC_ONE,
+            parameters_model=context.project.models.parameters,
+        ),
+    ),
+    Benchmark(
+        name="cantoxlsx",
+        run=lambda context, prepared: mpm.cantoxlsx.export(
+            path=context.paths.spreadsheet_can,
+            can_model=context.project.models.can,
+            pmvs_path=context.pmvs_path,
+        ),
+    ),
+    Benchmark(
+        name="anomaliestoxlsx",
+        run=lambda context, prepared: mpm.anomaliestoxlsx.export(
+            path=context.paths.anomalies_spreadsheet,
+            anomaly_model=context.project.models.anomalies,
+            parameters_model=context.project.models.parameters,
+        ),
+    ),
+]
+
+
+@attr.s(frozen=True)
+class Timing:
+    """Seconds taken by the runs of a benchmark."""
+
+    minimum = attr.ib()
+    median = attr.ib()
+    runs = attr.ib()
+
+    @classmethod
+    def from_durations(cls, durations: typing.Sequence[float]) -> "Timing":
+        return cls(
+            minimum=min(durations),
+            median=statistics.median(durations),
+            runs=len(durations),
+        )
+
+
+def time_benchmark(benchmark: Benchmark, context: Context, repeat: int) -> Timing:
+    durations = []
+
+    for _ in range(repeat):
+        prepared = benchmark.setup(context)
+        gc.collect()
+
+        start = time.perf_counter()
+        benchmark.run(context, prepared)
+        durations.append(time.perf_counter() - start)
+
+    return Timing.from_durations(durations)
+
+
+@attr.s
+class Results:
+    """Timings of a benchmark session, saved as a baseline for later runs."""
+
+    scale = attr.ib(factory=dict)
+    timings = attr.ib(factory=dict)
+    version = attr.ib(default=mpm.__version__)
+    python = attr.ib(default=platform.python_version())
+
+    def save(self, path: pathlib.Path) -> None:
+        raw = {
+            "format": format_version,
+            "version": self.version,
+            "python": self.python,
+            "scale": self.scale,
+            "timings": {
+                name: attr.asdict(timing)
+                for name, timing in sorted(self.timings.items())
+            },
+        }
+
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8", newline="\n") as f:
+            json.dump(raw, f, indent=4)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> "Results":
+        raw = json.loads(pathlib.Path(path).read_text(encoding="utf-8"))
+
+        if raw.get("format") != format_version:
+            raise ValueError(f"Unsupported benchmark results format in {path}")
+
+        return cls(
+            scale=raw["scale"],
+            timings={name: Timing(**timing) for name, timing in raw["timings"].items()},
+            version=raw["version"],
+            python=raw["python"],
+        )
+
+
+@attr.s(frozen=True)
+class Comparison:
+    name = attr.ib()
+    baseline = attr.ib(type=typing.Optional[Timing])
+    current = attr.ib(type=Timing)
+    tolerance = attr.ib()
+
+    @property
+    def ratio(self) -> typing.Optional[float]:
+        if self.baseline is None or self.baseline.minimum == 0:
+            return None
+
+        return self.current.minimum / self.baseline.minimum
+
+    @property
+    def regressed(self) -> bool:
+        ratio = self.ratio
+
+        return ratio is not None and ratio > 1 + self.tolerance
+
+
+def compare(
+    baseline: Results,
+    current: Results,
+    tolerance: float,
+) -> typing.List[Comparison]:
+    """
+    Compare the fastest run of each benchmark against a baseline.
+
+    Args:
+        baseline: earlier results
+        current: results to check
+        tolerance: allowed fractional slowdown before a regression is reported
+
+    Returns:
+        comparisons in the order of the current timings
+    """
+    return [
+        Comparison(
+            name=name,
+            baseline=baseline.timings.get(name),
+            current=timing,
+            tolerance=tolerance,
+        )
+        for name, timing in current.timings.items()
+    ]
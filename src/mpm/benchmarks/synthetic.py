@@ -0,0 +1,575 @@
+"""Synthetic projects of a chosen size.
+
+The sample project from the tests provides the enumerations, anomalies and a
+curve table present in every model.  The curve table is cloned as many times
+as requested, the sample content is completed where the exporters need more
+than the tests provide and then parameters, multiplexed CAN messages and
+SunSpec models are added.
+"""
+
+import copy
+import decimal
+import json
+import pathlib
+import shutil
+import typing
+import uuid
+
+import attr
+import epyqlib.pm.parametermodel
+
+import mpm.anomalymodel
+import mpm.canmodel
+import mpm.importexport
+import mpm.paths
+import mpm.project
+import mpm.smdxtosunspec
+import mpm.staticmodbusmodel
+import mpm.sunspecmodel
+
+
+sample_project = (
+    pathlib.Path(__file__).resolve().parents[1] / "tests" / "project" / "project.pmp"
+)
+
+parameters_per_group = 50
+multiplexers_per_message = 250
+signals_per_multiplexer = 3
+first_sunspec_model_id = 64200
+
+internal_types = {
+    "int16": "int16_t",
+    "uint16": "uint16_t",
+}
+
+# TODO: CAMPid 0795436754762451671643967431
+table_axes = ["x", "y", "z"]
+
+
+@attr.s(frozen=True)
+class Scale:
+    """Sizes of the generated content, in addition to the sample project."""
+
+    parameters = attr.ib(default=1000)
+    multiplexers = attr.ib(default=100)
+    sunspec_models = attr.ib(default=4)
+    points_per_model = attr.ib(default=20)
+    tables = attr.ib(default=2)
+
+
+scales = {
+    "small": Scale(
+        parameters=200,
+        multiplexers=20,
+        sunspec_models=2,
+        points_per_model=10,
+        tables=1,
+    ),
+    "medium": Scale(
+        parameters=2000,
+        multiplexers=300,
+        sunspec_models=10,
+        points_per_model=30,
+        tables=4,
+    ),
+    "large": Scale(
+        parameters=10000,
+        multiplexers=1500,
+        sunspec_models=40,
+        points_per_model=60,
+        tables=16,
+    ),
+}
+
+
+def walk(raw) -> typing.Iterator[typing.Tuple[typing.Optional[dict], dict]]:
+    """Yield each serialized node along with its parent."""
+    stack = [(None, raw)]
+
+    while len(stack) > 0:
+        parent, node = stack.pop()
+        yield parent, node
+
+        for child in reversed(node.get("children", [])):
+            stack.append((node, child))
+
+
+def first_of_type(raw, type_name):
+    return next(
+        (parent, node) for parent, node in walk(raw) if node["_type"] == type_name
+    )
+
+
+def replace_uuids(raw, replacements: typing.Dict[str, str]) -> None:
+    """Replace every string value, including those in lists, found in the map."""
+    stack = [raw]
+
+    while len(stack) > 0:
+        value = stack.pop()
+
+        if isinstance(value, dict):
+            items = value.items()
+        else:
+            items = enumerate(value)
+
+        for key, item in list(items):
+            if isinstance(item, str):
+                value[key] = replacements.get(item, item)
+            elif isinstance(item, (dict, list)):
+                stack.append(item)
+
+
+def clone_tables(raw_models: typing.Dict[str, dict], count: int) -> None:
+    """
+    Clone the sample curve table until each model has the requested number.
+    The clones reference each other the same way the sample tables do.
+
+    Args:
+        raw_models: serialized models by name, modified in place
+        count: total number of tables
+    """
+    parameters_group, parameters_table = first_of_type(
+        raw_models["parameters"], "table"
+    )
+    can_message, _ = first_of_type(raw_models["can"], "table")
+    sunspec_root, sunspec_table = first_of_type(raw_models["sunspec1"], "table")
+    staticmodbus_root, staticmodbus_table = first_of_type(
+        raw_models["staticmodbus"], "table"
+    )
+    can_root = raw_models["can"]
+
+    originals = [
+        (parameters_group, parameters_table),
+        (can_root, can_message),
+        (sunspec_root, sunspec_table),
+        (staticmodbus_root, staticmodbus_table),
+    ]
+
+    for index in range(1, count):
+        clones = [(parent, copy.deepcopy(node)) for parent, node in originals]
+
+        replacements = {
+            node["uuid"]: str(uuid.uuid4())
+            for _, clone in clones
+            for _, node in walk(clone)
+            if "uuid" in node
+        }
+
+        name = f"Table {index}"
+
+        for parent, clone in clones:
+            replace_uuids(clone, replacements)
+            parent["children"].append(clone)
+
+            for _, node in walk(clone):
+                if node["_type"] == "table":
+                    node["name"] = name
+
+        _, can_clone = clones[1]
+        can_clone["name"] = f"{can_message['name']}{index}"
+        can_clone["identifier"] = hex(int(can_message["identifier"], 16) - index)
+
+
+def add_types(project: mpm.project.Project) -> None:
+    enumerations = project.models.parameters.list_selection_roots["enumerations"]
+    names = {child.name for child in enumerations.children}
+
+    for build in (
+        mpm.sunspecmodel.build_sunspec_types_enumeration,
+        mpm.staticmodbusmodel.build_staticmodbus_types_enumeration,
+    ):
+        enumeration = build()
+        if enumeration.name not in names:
+            enumerations.append_child(enumeration)
+
+    project.models.update_enumeration_roots()
+
+
+def access_level_uuid(project: mpm.project.Project) -> uuid.UUID:
+    access_levels = project.models.parameters.list_selection_roots["access level"]
+
+    return access_levels.children[0].uuid
+
+
+def ensure_parameters_group(
+    project: mpm.project.Project,
+) -> epyqlib.pm.parametermodel.Group:
+    """
+    Get the top level "Parameters" group the generators export, adding it if
+    the base project doesn't have one.
+    """
+    root = project.models.parameters.root
+
+    for child in root.children:
+        if (
+            isinstance(child, epyqlib.pm.parametermodel.Group)
+            and child.name == "Parameters"
+        ):
+            return child
+
+    group = epyqlib.pm.parametermodel.Group(name="Parameters")
+    root.append_child(group)
+
+    return group
+
+
+def add_parameters(
+    project: mpm.project.Project,
+    count: int,
+) -> typing.List[epyqlib.pm.parametermodel.Parameter]:
+    """
+    Add groups of parameters which are accessed through interface variables.
+
+    Returns:
+        the added parameters
+    """
+    parameters_group = ensure_parameters_group(project)
+    access_level = access_level_uuid(project)
+    parameters = []
+
+    for first in range(0, count, parameters_per_group):
+        group = epyqlib.pm.parametermodel.Group(
+            name=f"Synthetic Group {first // parameters_per_group}",
+        )
+        parameters_group.append_child(group)
+
+        for index in range(first, min(first + parameters_per_group, count)):
+            parameter = epyqlib.pm.parametermodel.Parameter(
+                name=f"Synthetic Parameter {index}",
+                abbreviation=f"SP{index}",
+                units="V",
+                default=decimal.Decimal(0),
+                minimum=decimal.Decimal(-1000),
+                maximum=decimal.Decimal(1000),
+                decimal_places=1,
+                internal_variable=f"syntheticParameters[{index}]",
+                internal_type="int16_t",
+                access_level_uuid=access_level,
+                comment=f"Synthetic parameter number {index}",
+            )
+            group.append_child(parameter)
+            parameters.append(parameter)
+
+    return parameters
+
+
+def complete_tables(project: mpm.project.Project) -> None:
+    """
+    Shape the tables as the curve tables the interface exporter expects.  The
+    last enumeration of each table numbers the curves, the arrays get
+    interface variables and the untyped SunSpec and static Modbus points a
+    type.
+    """
+    parameters_model = project.models.parameters
+    access_level = access_level_uuid(project)
+
+    tables = list(
+        parameters_model.root.nodes_by_filter(
+            filter=lambda node: isinstance(node, epyqlib.pm.parametermodel.Table),
+        )
+    )
+
+    curve_enumerations = set()
+    for table in tables:
+        references = [
+            child
+            for child in table.children
+            if isinstance(child, epyqlib.pm.parametermodel.TableEnumerationReference)
+        ]
+        curve_enumerations.add(references[-1].enumeration_uuid)
+
+    for enumeration_uuid in curve_enumerations:
+        enumeration = parameters_model.node_from_uuid(enumeration_uuid)
+        for index, enumerator in enumerate(enumeration.children, start=1):
+            enumerator.name = str(index)
+
+    for index, table in enumerate(tables):
+        arrays = [
+            child
+            for child in table.children
+            if isinstance(child, epyqlib.pm.parametermodel.Array)
+        ]
+
+        for axis, array in zip(table_axes, arrays):
+            parameter = array.children[0]
+            parameter.access_level_uuid = access_level
+            parameter.internal_type = internal_types["int16"]
+            parameter.internal_variable = (
+                f"syntheticTables[{index}].curves[{{curve}}].{axis}"
+            )
+
+    typed_points = (
+        (project.models.sunspec1, mpm.sunspecmodel.DataPoint, "sunspec types"),
+        (project.models.sunspec2, mpm.sunspecmodel.DataPoint, "sunspec types"),
+        (
+            project.models.staticmodbus,
+            mpm.staticmodbusmodel.FunctionData,
+            "staticmodbus types",
+        ),
+    )
+
+    for model, point_type, types_root in typed_points:
+        (int16,) = (
+            child
+            for child in model.list_selection_roots[types_root].children
+            if child.name == "int16"
+        )
+
+        for point in model.root.nodes_by_filter(
+            filter=lambda node: (
+                isinstance(node, point_type) and node.type_uuid is None
+            ),
+        ):
+            point.type_uuid = int16.uuid
+
+
+def complete_anomalies(project: mpm.project.Project) -> None:
+    """Give the anomalies lacking them the trigger type and response levels."""
+    selection_roots = project.models.anomalies.list_selection_roots
+    response_level = selection_roots["anomaly_response_levels"].children[0].uuid
+    trigger_type = selection_roots["anomaly_trigger_types"].children[0].uuid
+
+    for anomaly in project.models.anomalies.root.nodes_by_filter(
+        filter=lambda node: isinstance(node, mpm.anomalymodel.Anomaly),
+    ):
+        if anomaly.response_level_active is None:
+            anomaly.response_level_active = response_level
+        if anomaly.response_level_inactive is None:
+            anomaly.response_level_inactive = response_level
+        if anomaly.trigger_type is None:
+            anomaly.trigger_type = trigger_type
+
+
+def add_can_messages(
+    project: mpm.project.Project,
+    count: int,
+    parameters: typing.Sequence[epyqlib.pm.parametermodel.Parameter],
+) -> None:
+    """
+    Add multiplexed messages with signals for the passed parameters, each
+    parameter is used by at most one signal.
+
+    Args:
+        project: project to extend
+        count: number of multiplexers to add
+        parameters: parameters to be referenced by the signals
+    """
+    root = project.models.can.root
+    remaining = iter(parameters)
+
+    for first in range(0, count, multiplexers_per_message):
+        message_index = first // multiplexers_per_message
+        message = mpm.canmodel.MultiplexedMessage(
+            name=f"Synthetic{message_index}",
+            identifier=0x1F000000 + message_index,
+            extended=True,
+            length=8,
+        )
+        root.append_child(message)
+        message.append_child(mpm.canmodel.Signal(name="MultiplexSignal", bits=8))
+
+        for identifier in range(1, min(count - first, multiplexers_per_message) + 1):
+            multiplexer = mpm.canmodel.Multiplexer(
+                name=f"Synthetic{message_index}_{identifier}",
+                identifier=identifier,
+                length=8,
+            )
+            message.append_child(multiplexer)
+
+            for position in range(signals_per_multiplexer):
+                parameter = next(remaining, None)
+                if parameter is None:
+                    break
+
+                multiplexer.append_child(
+                    mpm.canmodel.Signal(
+                        name=parameter.abbreviation,
+                        bits=16,
+                        signed=True,
+                        start_bit=16 * (position + 1),
+                        parameter_uuid=parameter.uuid,
+                    )
+                )
+
+
+def smdx(model_id: int, points: int) -> str:
+    """
+    Create the SMDX definition of a model with a single fixed block.
+
+    Args:
+        model_id: SunSpec model ID
+        points: number of 16 bit points in the block
+
+    Returns:
+        the XML
+    """
+    point_types = list(internal_types)
+
+    point_lines = [
+        f'      <point id="P{index}" offset="{index}"'
+        f' type="{point_types[index % len(point_types)]}"'
+        f' access="rw" units="V"/>'
+        for index in range(points)
+    ]
+    string_lines = [
+        f'    <point id="P{index}">'
+        f"<label>Point {index}</label>"
+        f"<description>Synthetic point {index}</description>"
+        f"<notes></notes></point>"
+        for index in range(points)
+    ]
+
+    return "\n".join(
+        [
+            '<sunSpecModels v="1">',
+            f'  <model id="{model_id}" len="{points}" name="synthetic{model_id}">',
+            f'    <block len="{points}">',
+            *point_lines,
+            "    </block>",
+            "  </model>",
+            f'  <strings id="{model_id}" locale="en">',
+            f"    <model><label>Synthetic {model_id}</label>"
+            f"<description>Synthetic model {model_id}</description>"
+            f"<notes></notes></model>",
+            *string_lines,
+            "  </strings>",
+            "</sunSpecModels>",
+            "",
+        ]
+    )
+
+
+def add_sunspec_models(
+    project: mpm.project.Project,
+    count: int,
+    points: int,
+    smdx_directory: pathlib.Path,
+) -> None:
+    """
+    Import generated SMDX models into the first SunSpec model, giving their
+    parameters interface variables and access levels.
+
+    Args:
+        project: project to extend
+        count: number of SunSpec models
+        points: number of points per model
+        smdx_directory: where to write the generated SMDX files
+    """
+    if count == 0:
+        return
+
+    smdx_directory.mkdir(parents=True, exist_ok=True)
+    model_ids = [first_sunspec_model_id + index for index in range(count)]
+
+    for model_id in model_ids:
+        path = smdx_directory / f"smdx_{model_id:05}.xml"
+        path.write_text(smdx(model_id=model_id, points=points), encoding="utf-8")
+
+    parameters_model = project.models.parameters
+    access_level = access_level_uuid(project)
+
+    models = mpm.smdxtosunspec.import_models(
+        *model_ids,
+        parameter_model=parameters_model,
+        paths=[smdx_directory],
+    )
+
+    for model in models:
+        project.models.sunspec1.root.append_child(model)
+
+        for block in model.children:
+            if not isinstance(block, mpm.sunspecmodel.FixedBlock):
+                continue
+
+            for point in block.children:
+                parameter = parameters_model.node_from_uuid(point.parameter_uuid)
+                point_type = parameters_model.node_from_uuid(point.type_uuid).name
+
+                parameter.access_level_uuid = access_level
+                parameter.internal_type = internal_types[point_type]
+                parameter.internal_variable = (
+                    f"sunspecModel{model.id}.{parameter.abbreviation}"
+                )
+
+
+def write_templates(paths: mpm.paths.ImportPaths) -> None:
+    """Write minimal templates for the generators which render them."""
+    templates = {
+        paths.interface_c: "{{ interface_items }}\n",
+        paths.interface_c.with_suffix(".h"): "{{ declarations }}\n",
+        paths.rejected_callback_c: (
+            "{% for uuid in uuid_list %}\n{{ uuid }}\n{% endfor %}\n"
+        ),
+        paths.sil_c: "{{ initializers }}\n",
+        paths.sil_c.with_suffix(".h"): "{{ declarations }}\n",
+        paths.anomalies_h: "{{ anomaly_tables | length }}\n",
+    }
+
+    for path, text in templates.items():
+        template = mpm.importexport.template_path(path)
+        template.parent.mkdir(parents=True, exist_ok=True)
+        template.write_text(text, encoding="utf-8")
+
+
+def generate(directory: pathlib.Path, scale: Scale) -> pathlib.Path:
+    """
+    Generate a project along with an embedded project directory holding the
+    templates the exporters render.
+
+    Args:
+        directory: empty directory to generate into
+        scale: amount of content to generate
+
+    Returns:
+        path to the .pmp project file
+    """
+    directory = pathlib.Path(directory)
+    project_directory = directory / "project"
+    project_directory.mkdir(parents=True, exist_ok=True)
+
+    raw_project = json.loads(sample_project.read_text(encoding="utf-8"))
+    model_paths = {
+        name: path for name, path in raw_project["paths"].items() if name != "_type"
+    }
+    raw_models = {
+        name: json.loads((sample_project.parent / path).read_text(encoding="utf-8"))
+        for name, path in model_paths.items()
+    }
+
+    clone_tables(raw_models=raw_models, count=scale.tables)
+
+    for name, raw in raw_models.items():
+        with open(project_directory / model_paths[name], "w", newline="\n") as f:
+            json.dump(raw, f, indent=4)
+
+    project_path = project_directory / sample_project.name
+    shutil.copyfile(sample_project, project_path)
+
+    project = mpm.project.loadp(project_path)
+
+    add_types(project)
+    complete_tables(project)
+    complete_anomalies(project)
+    parameters = add_parameters(project=project, count=scale.parameters)
+    add_can_messages(
+        project=project,
+        count=scale.multiplexers,
+        parameters=parameters,
+    )
+    add_sunspec_models(
+        project=project,
+        count=scale.sunspec_models,
+        points=scale.points_per_model,
+        smdx_directory=directory / "smdx",
+    )
+
+    project.save()
+
+    write_templates(paths=target_paths(directory))
+
+    return project_path
+
+
+def target_paths(directory: pathlib.Path) -> mpm.paths.ImportPaths:
+    """Export paths within a directory passed to `generate()`."""
+    return mpm.paths.paths_from_directory(pathlib.Path(directory) / "target")
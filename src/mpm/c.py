@@ -1,38 +1,143 @@
+import itertools
 import os
 
 import jinja2
 
+import mpm.modelcache
+import mpm.outputs
 
-# TODO: CAMPid 073407143081341008467657184603164130
-def format_nested_lists(it, indent=""):
-    result = []
 
-    for item in it:
-        if isinstance(item, list):
-            result.extend(format_nested_lists(item, indent=indent + "    "))
-        elif item.strip() == "":
-            result.append("")
+def iter_nested_lists(it, indent=""):
+    """
+    Yield the lines of nested lists with each level of nesting indented by a
+    further four spaces.  Iterative so output is produced as the lists are
+    walked, without building intermediate lists at each level.
+
+    Args:
+        it: lines and nested lists of lines
+        indent: indentation of the outermost lines
+
+    Returns:
+        the indented lines, blank lines having no indentation
+    """
+    indents = [indent]
+    stack = [iter(it)]
+
+    while len(stack) > 0:
+        depth = len(stack) - 1
+
+        for item in stack[-1]:
+            if isinstance(item, list):
+                if len(indents) == depth + 1:
+                    indents.append(indents[-1] + "    ")
+                stack.append(iter(item))
+                break
+            elif item.strip() == "":
+                yield ""
+            else:
+                yield indents[depth] + item
         else:
-            result.append(indent + item)
+            stack.pop()
+
+
+# TODO: CAMPid 073407143081341008467657184603164130
+def format_nested_lists(it, indent=""):
+    lines = iter_nested_lists(it, indent=indent)
 
     if indent == "":
-        result.append("")
-        return "\n".join(result)
+        return "\n".join(itertools.chain(lines, [""]))
     else:
-        return result
+        return list(lines)
 
 
-def render(source, destination, context={}, encoding="utf-8", newline="\n"):
-    environment = jinja2.Environment(
+_environments = {}
+
+
+def bytecode_cache_directory():
+    """Get the template bytecode cache directory, None when caching is disabled."""
+    directory = mpm.modelcache.cache_directory()
+    if directory is None:
+        return None
+
+    return directory / "templates"
+
+
+def environment(directory, newline="\n"):
+    """
+    Get the shared environment for templates in a directory.  Compiled
+    templates are cached in memory, and as bytecode in the mpm cache
+    directory when enabled so later exports skip compiling them.
+
+    Args:
+        directory: directory containing the templates
+        newline: line ending used in rendered output
+
+    Returns:
+        the Jinja2 environment
+    """
+    directory = os.path.abspath(directory)
+    bytecode_directory = bytecode_cache_directory()
+    key = (directory, newline, bytecode_directory)
+
+    cached = _environments.get(key)
+    if cached is not None:
+        return cached
+
+    bytecode_cache = None
+    if bytecode_directory is not None:
+        try:
+            os.makedirs(bytecode_directory, exist_ok=True)
+        except OSError:
+            # Bytecode caching is only an optimization
+            pass
+        else:
+            # Templates are keyed by their absolute path so directories of
+            # templates can share the cache
+            bytecode_cache = jinja2.FileSystemBytecodeCache(
+                directory=str(bytecode_directory),
+            )
+
+    created = jinja2.Environment(
         undefined=jinja2.StrictUndefined,
-        loader=jinja2.FileSystemLoader(os.fspath(source.parent)),
+        loader=jinja2.FileSystemLoader(directory),
+        bytecode_cache=bytecode_cache,
         newline_sequence=newline,
         autoescape=False,
         trim_blocks=True,
     )
-    template = environment.get_template(name=source.name)
 
-    rendered = template.render(context)
-    rendered = rendered.rstrip() + newline
+    return _environments.setdefault(key, created)
+
+
+def rstripped(chunks, newline="\n"):
+    """
+    Strip the trailing whitespace from streamed text and end it with a single
+    newline, holding back only the whitespace that may turn out to be trailing.
+    """
+    pending = ""
+
+    for chunk in chunks:
+        stripped = chunk.rstrip()
 
-    destination.write_bytes(rendered.encode(encoding))
+        if stripped == "":
+            pending += chunk
+            continue
+
+        yield pending + stripped
+        pending = chunk[len(stripped) :]
+
+    yield newline
+
+
+def render(source, destination, context={}, encoding="utf-8", newline="\n"):
+    template = environment(
+        directory=source.parent,
+        newline=newline,
+    ).get_template(name=source.name)
+
+    chunks = rstripped(template.generate(context), newline=newline)
+
+    return mpm.outputs.write_chunks(
+        path=destination,
+        chunks=(chunk.encode(encoding) for chunk in chunks),
+    )
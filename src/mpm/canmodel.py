@@ -14,11 +14,17 @@ import epyqlib.treenode
 import epyqlib.utils.general
 import epyqlib.utils.qt
 
+import mpm.headless
+
 # See file COPYING in this source tree
 __copyright__ = "Copyright 2017, EPC Power Corp."
 __license__ = "GPLv2+"
 
 
+# Arbitration ID of new messages until one is assigned
+placeholder_identifier = 0x1FFFFFFF
+
+
 class ConsistencyError(Exception):
     pass
 
@@ -65,6 +71,11 @@ def find_nodes_by_type(root, type, skip=None) -> list:
     return results
 
 
+def unassigned_last(node):
+    """Sort key ordering nodes by identifier with those lacking one last."""
+    return (node.identifier is None, node.identifier or 0)
+
+
 class HexadecimalIntegerField(marshmallow.fields.Field):
     def _serialize(self, value, attr, obj):
         if self.allow_none and value is None:
@@ -89,9 +100,9 @@ def create_child_signal_from(node):
 
 @graham.schemify(tag="signal")
 @epyqlib.attrsmodel.ify()
-@epyqlib.utils.qt.pyqtify()
+@mpm.headless.pyqtify()
 @attr.s(hash=False)
-class Signal(epyqlib.treenode.TreeNode):
+class Signal(mpm.headless.TreeNode):
     name = epyqlib.attrsmodel.create_code_identifier_string_attribute(
         default="NewSignal",
     )
@@ -218,7 +229,7 @@ class Message(epyqlib.treenode.TreeNode):
     )
 
     identifier = attr.ib(
-        default=0x1FFFFFFF,
+        default=placeholder_identifier,
         converter=based_int,
         metadata=graham.create_metadata(
             field=HexadecimalIntegerField(),
@@ -465,7 +476,7 @@ class MultiplexedMessage(epyqlib.treenode.TreeNode):
     )
 
     identifier = attr.ib(
-        default=0x1FFFFFFF,
+        default=placeholder_identifier,
         converter=based_int,
         metadata=graham.create_metadata(
             field=HexadecimalIntegerField(),
@@ -583,9 +594,10 @@ class MultiplexedMessage(epyqlib.treenode.TreeNode):
             None
         """
 
-        # Find multiplexers outside tables and sort by IDs
+        # Find multiplexers outside tables and sort by IDs, those without
+        # an ID are given the IDs after the rest
         multiplexers = find_nodes_by_type(self, Multiplexer, skip=CanTable)
-        multiplexers.sort(key=lambda x: x.identifier)
+        multiplexers.sort(key=unassigned_last)
 
         # Find CAN tables and sort by first ID in the table
         cantables = find_nodes_by_type(self, CanTable)
@@ -602,7 +614,7 @@ class MultiplexedMessage(epyqlib.treenode.TreeNode):
 
             # Find multiplexers inside the table and sort by IDs
             multiplexers = find_nodes_by_type(table, Multiplexer)
-            multiplexers.sort(key=lambda x: x.identifier)
+            multiplexers.sort(key=unassigned_last)
 
             # Set the table start ID
             table.multiplexer_range_first = id
@@ -626,21 +638,13 @@ class MultiplexedMessage(epyqlib.treenode.TreeNode):
             List of duplicate multiplexers found.
         """
 
-        # Find multiplexers outside tables and sort by IDs
+        # Find multiplexers, including those in tables, and sort by IDs
         multiplexers = find_nodes_by_type(self, Multiplexer)
-        multiplexers.sort(key=lambda x: x.identifier)
+        multiplexers.sort(key=unassigned_last)
 
-        duplicates = []
-        for mux in multiplexers:
-            if any(
-                [
-                    (mux is not m) and (mux.identifier == m.identifier)
-                    for m in multiplexers
-                ]
-            ):
-                duplicates.append(mux)
+        index = IdentifierIndex.build(self)
 
-        return duplicates
+        return [mux for mux in multiplexers if len(index.conflicts_with(mux)) > 0]
 
     remove_old_on_drop = epyqlib.attrsmodel.default_remove_old_on_drop
     internal_move = epyqlib.attrsmodel.default_internal_move
@@ -660,7 +664,7 @@ class MultiplexedMessageClone(epyqlib.treenode.TreeNode):
     )
 
     identifier = attr.ib(
-        default=0x1FFFFFFF,
+        default=placeholder_identifier,
         converter=based_int,
         metadata=graham.create_metadata(
             field=HexadecimalIntegerField(),
@@ -1324,3 +1328,255 @@ class ReferencedUuidNotifier(PyQt5.QtCore.QObject):
         node = model.node_from_index(index)
         if isinstance(node, Signal):
             self.changed.emit(node.parameter_uuid)
+
+
+def multiplexed_message_of(node):
+    """Get the multiplexed message containing a node, None if there is none."""
+    parent = node.tree_parent
+
+    while parent is not None and not isinstance(parent, MultiplexedMessage):
+        parent = parent.tree_parent
+
+    return parent
+
+
+@attr.s(frozen=True)
+class IdentifierConflict:
+    """
+    Nodes sharing an arbitration ID, or sharing a multiplexer ID within one
+    multiplexed message.
+    """
+
+    identifier = attr.ib()
+    nodes = attr.ib()
+    extended = attr.ib(default=None)
+    message = attr.ib(default=None)
+
+
+@attr.s
+class IdentifierIndex:
+    """
+    The arbitration IDs of the messages and the multiplexer IDs within each
+    multiplexed message.
+
+    Arbitration IDs are project wide with standard and extended IDs kept
+    apart, clones use the frame format of their original.  Nodes are indexed
+    as they are passed to `add()` and `update()` and dropped by `remove()`,
+    `connect()` calls these as the attrs model reports changes.  Lookups by
+    ID don't depend on the number of nodes.
+    """
+
+    _keys = attr.ib(factory=dict, init=False)
+    _nodes = attr.ib(factory=dict, init=False)
+    _clones = attr.ib(factory=dict, init=False)
+
+    @classmethod
+    def build(cls, root):
+        index = cls()
+        index.add(root)
+
+        return index
+
+    def add(self, node) -> None:
+        """Index a node and those below it."""
+        for each in subtree(node):
+            self.update(each)
+
+    def remove(self, node) -> None:
+        """Drop a node and those below it from the index."""
+        for each in subtree(node):
+            self._discard(each)
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._nodes.clear()
+        self._clones.clear()
+
+    def update(self, node) -> None:
+        """Index a node again after its identifier or position changed."""
+        self._discard(node)
+
+        key = self._key_for(node)
+        if key is None:
+            return
+
+        self._keys[id(node)] = (node, key)
+        self._nodes.setdefault(key, []).append(node)
+
+        if isinstance(node, MultiplexedMessageClone):
+            self._clones[id(node)] = node
+        elif isinstance(node, MultiplexedMessage):
+            for clone in list(self._clones.values()):
+                if clone.original is node:
+                    self.update(clone)
+
+    def nodes_with_arbitration_id(self, identifier, extended) -> list:
+        return list(self._nodes.get(("arbitration", bool(extended), identifier), ()))
+
+    def nodes_with_multiplexer_id(self, message, identifier) -> list:
+        return list(self._nodes.get(("multiplexer", id(message), identifier), ()))
+
+    def conflicts_with(self, node) -> list:
+        """
+        Get the other nodes using the identifier of a node.
+
+        Args:
+            node: message, message clone or multiplexer
+
+        Returns:
+            list of nodes, empty when the node is not indexed
+        """
+        entry = self._keys.get(id(node))
+        if entry is None:
+            return []
+
+        return [other for other in self._nodes[entry[1]] if other is not node]
+
+    def conflicts(self) -> list:
+        """
+        Get every identifier in use by more than one node.  Messages with
+        the placeholder arbitration ID and multiplexers without an ID have
+        yet to be assigned one and are left out.
+
+        Returns:
+            list of `IdentifierConflict`
+        """
+        conflicts = []
+
+        for key, nodes in self._nodes.items():
+            if len(nodes) < 2:
+                continue
+
+            if key[0] == "arbitration":
+                _, extended, identifier = key
+                if identifier == placeholder_identifier:
+                    continue
+
+                conflicts.append(
+                    IdentifierConflict(
+                        identifier=identifier,
+                        nodes=tuple(nodes),
+                        extended=extended,
+                    )
+                )
+            else:
+                _, _, identifier = key
+                if identifier is None:
+                    continue
+
+                conflicts.append(
+                    IdentifierConflict(
+                        identifier=identifier,
+                        nodes=tuple(nodes),
+                        message=multiplexed_message_of(nodes[0]),
+                    )
+                )
+
+        return conflicts
+
+    def free_arbitration_id(self, extended, start=0) -> int:
+        """
+        Get the lowest unused arbitration ID.
+
+        Args:
+            extended: True for a 29 bit ID, False for an 11 bit ID
+            start: lowest ID to consider
+
+        Returns:
+            the ID
+        """
+        last = 0x1FFFFFFF if extended else 0x7FF
+
+        for identifier in range(start, last + 1):
+            if ("arbitration", bool(extended), identifier) not in self._nodes:
+                return identifier
+
+        raise Exception(f"No free arbitration ID from {start:#x}")
+
+    def free_multiplexer_id(self, message, start=0) -> int:
+        """
+        Get the lowest unused multiplexer ID within a multiplexed message.
+
+        Args:
+            message: multiplexed message
+            start: lowest ID to consider
+
+        Returns:
+            the ID
+        """
+        identifier = start
+
+        while ("multiplexer", id(message), identifier) in self._nodes:
+            identifier += 1
+
+        return identifier
+
+    def connect(self, model) -> None:
+        """Keep the index up to date with the changes to an attrs model."""
+
+        def data_changed(top_left, bottom_right, *args):
+            for row in range(top_left.row(), bottom_right.row() + 1):
+                self.update(model.node_from_index(top_left.sibling(row, 0)))
+
+        def rows_inserted(parent, first, last):
+            for row in range(first, last + 1):
+                self.add(model.node_from_index(model.model.index(row, 0, parent)))
+
+        def rows_removing(parent, first, last):
+            for row in range(first, last + 1):
+                self.remove(model.node_from_index(model.model.index(row, 0, parent)))
+
+        def rows_moved(parent, start, end, destination, row):
+            # Multiplexers moved to another message are keyed by it
+            self.add(model.node_from_index(destination))
+
+        def reset(*args):
+            self.clear()
+            self.add(model.root)
+
+        item_model = model.model
+        item_model.dataChanged.connect(data_changed)
+        item_model.rowsInserted.connect(rows_inserted)
+        item_model.rowsAboutToBeRemoved.connect(rows_removing)
+        item_model.rowsMoved.connect(rows_moved)
+        item_model.layoutChanged.connect(reset)
+        item_model.modelReset.connect(reset)
+
+    def _key_for(self, node):
+        if isinstance(node, (Message, MultiplexedMessage)):
+            return ("arbitration", bool(node.extended), node.identifier)
+
+        if isinstance(node, MultiplexedMessageClone):
+            extended = getattr(node.original, "extended", True)
+            return ("arbitration", bool(extended), node.identifier)
+
+        if isinstance(node, Multiplexer):
+            message = multiplexed_message_of(node)
+            if message is None:
+                return None
+
+            return ("multiplexer", id(message), node.identifier)
+
+        return None
+
+    def _discard(self, node):
+        entry = self._keys.pop(id(node), None)
+        if entry is None:
+            return
+
+        nodes = self._nodes[entry[1]]
+        nodes[:] = [other for other in nodes if other is not node]
+        if len(nodes) == 0:
+            del self._nodes[entry[1]]
+
+        self._clones.pop(id(node), None)
+
+
+def subtree(node):
+    """Iterate over a node and those below it."""
+    nodes = [node]
+
+    while len(nodes) > 0:
+        node = nodes.pop()
+        yield node
+        nodes.extend(reversed(getattr(node, "children", ())))
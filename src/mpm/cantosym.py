@@ -10,6 +10,7 @@ import epyqlib.pm.parametermodel
 import epyqlib.utils.general
 
 import mpm.canmodel
+import mpm.outputs
 import mpm.symtoproject
 
 builders = epyqlib.utils.general.TypeMap()
@@ -33,9 +34,7 @@ def export(path, can_model, parameters_model):
         parameter_model=parameters_model,
     )
 
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8", newline="\n") as f:
-        f.write(builder.gen())
+    mpm.outputs.write_text(path=path, text=builder.gen(), encoding="utf-8")
 
 
 class SignalOutsideMessageError(Exception):
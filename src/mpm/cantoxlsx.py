@@ -1,19 +1,20 @@
 from __future__ import (
     annotations,
 )  # See PEP 563, check to remove in future Python version higher than 3.7
+import concurrent.futures
+import json
 import re
 import attr
 import decimal
 import openpyxl
 import pathlib
 import typing
-import glob
 import uuid
 import mpm.mpm_helper
+import mpm.xlsx
 import epyqlib.treenode
 import epyqlib.utils.general
 from natsort import natsorted
-from tqdm import tqdm
 
 EXCEL_COLUMN_LETTERS = [c for c in "ABCDEFGHIJKLMNOPQRSTU"]
 PMVS_UUID_TO_DECIMAL_LIST = typing.List[typing.Dict[uuid.UUID, decimal.Decimal]]
@@ -37,6 +38,10 @@ CELL_BORDER = openpyxl.styles.Border(
 CELL_FONT = openpyxl.styles.Font(size=8)
 # All values are stored as text to have consistent left alignment
 NUMBER_FORMAT_TEXT = openpyxl.styles.numbers.FORMAT_TEXT
+MANUAL_SECTION_STYLE = "Manual Section"
+MANUAL_CELL_STYLE = "Manual Cell"
+MANUAL_NAME_STYLE = "Manual Name"
+MANUAL_DESCRIPTION_STYLE = "Manual Description"
 NUMBERED_VARIANT_PATTERN = r"_(0[2-9]|1[0-9]|20)$"
 MIN_MANUAL_COLUMN_COUNT = 5  # Name, access level, min, max, default
 
@@ -81,6 +86,68 @@ field_names = Fields(
 )
 
 
+def read_pmvs_values(
+    pmvs_file: pathlib.Path,
+) -> typing.Dict[uuid.UUID, decimal.Decimal]:
+    """
+    Read the parameter values from a PMVS file without building the value set
+    model.
+
+    Args:
+        pmvs_file: path to the pmvs file
+
+    Returns:
+        parameter UUID to decimal value dict
+    """
+    with open(pmvs_file, encoding="utf-8") as f:
+        raw = json.load(f, parse_float=decimal.Decimal)
+
+    pmvs_uuid_to_value = {}
+    for child in raw.get("children", []):
+        parameter_uuid = child.get("parameter_uuid")
+        if parameter_uuid is None:
+            continue
+
+        value = child.get("value")
+        if value is not None:
+            value = decimal.Decimal(value)
+
+        pmvs_uuid_to_value[uuid.UUID(parameter_uuid)] = value
+
+    return pmvs_uuid_to_value
+
+
+@attr.s
+class PmvsValues:
+    """The parameter values of each PMVS file, one column per value set."""
+
+    names = attr.ib(factory=list, type=typing.List[str])
+    uuid_to_value_list = attr.ib(factory=list, type=PMVS_UUID_TO_DECIMAL_LIST)
+
+    @classmethod
+    def load(cls, pmvs_path: pathlib.Path, max_workers: int = None) -> PmvsValues:
+        """
+        Load the values of all the PMVS files in a directory, reading the
+        files concurrently.
+
+        Args:
+            pmvs_path: directory path to the pmvs files
+            max_workers: maximum number of files to read at once
+
+        Returns:
+            values of the PMVS files, ordered by file name
+        """
+        pmvs_files = sorted(pathlib.Path(pmvs_path).glob("*.pmvs"))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            uuid_to_value_list = list(pool.map(read_pmvs_values, pmvs_files))
+
+        return cls(
+            names=[pmvs_file.stem for pmvs_file in pmvs_files],
+            uuid_to_value_list=uuid_to_value_list,
+        )
+
+
 def create_pmvs_uuid_to_value_list(
     pmvs_path: pathlib.Path,
 ) -> PMVS_UUID_TO_DECIMAL_LIST:
@@ -95,21 +162,7 @@ def create_pmvs_uuid_to_value_list(
     Returns:
         list of PMVS UUID to decimal dict's
     """
-    pmvs_files = glob.glob(f"{pmvs_path}/*.pmvs")
-    pmvs_list = []
-    for pmvs_file in pmvs_files:
-        pmvs = epyqlib.pm.valuesetmodel.loadp(pmvs_file)
-        pmvs_list.append(pmvs)
-        field_names.defaults.append(pmvs.path.stem)
-
-    pmvs_uuid_to_value_list = []
-    for pmvs in pmvs_list:
-        pmvs_uuid_to_value = {}
-        for child in pmvs.model.root.children:
-            pmvs_uuid_to_value.update({child.parameter_uuid: child.value})
-        pmvs_uuid_to_value_list.append(pmvs_uuid_to_value)
-
-    return pmvs_uuid_to_value_list
+    return PmvsValues.load(pmvs_path).uuid_to_value_list
 
 
 def export(
@@ -117,6 +170,7 @@ def export(
     can_model: epyqlib.attrsmodel.Model,
     pmvs_path: pathlib.Path,
     column_filter: mpm.mpm_helper.FieldsInterface = None,
+    generate_formatted_output: bool = False,
 ) -> None:
     """
     Generate the CAN model parameter data in Excel format (.xlsx).
@@ -127,11 +181,13 @@ def export(
         parameters_model: parameters model
         pmvs_path: directory path to the pmvs files
         column_filter: columns to be output to .xls file
+        generate_formatted_output: also generate the spreadsheet formatted for
+            the controls manual, see `format_for_manual()`
 
     Returns:
 
     """
-    pmvs_uuid_to_value_list = create_pmvs_uuid_to_value_list(pmvs_path)
+    pmvs_values = PmvsValues.load(pmvs_path)
 
     if column_filter is None:
         column_filter = mpm.mpm_helper.attr_fill(Fields, True)
@@ -140,14 +196,22 @@ def export(
         wrapped=can_model.root,
         parameter_uuid_finder=can_model.node_from_uuid,
         column_filter=column_filter,
-        pmvs_uuid_to_value_list=pmvs_uuid_to_value_list,
+        pmvs_uuid_to_value_list=pmvs_values.uuid_to_value_list,
+        pmvs_names=pmvs_values.names,
     )
 
-    workbook = builder.gen()
+    rows = builder.gen_fields()
+    workbook = builder.gen(rows=rows)
 
-    path.parent.mkdir(parents=True, exist_ok=True)
     workbook.save(path)
 
+    if generate_formatted_output:
+        format_for_manual(
+            rows=rows,
+            output_path=path.with_name(path.stem + "_for_manual" + path.suffix),
+            default_names=pmvs_values.names,
+        )
+
 
 @builders(mpm.canmodel.Root)
 @attr.s
@@ -158,19 +222,49 @@ class Root:
     column_filter = attr.ib(type=Fields)
     parameter_uuid_finder = attr.ib(default=None, type=typing.Callable)
     pmvs_uuid_to_value_list = attr.ib(default=None, type=PMVS_UUID_TO_DECIMAL_LIST)
+    pmvs_names = attr.ib(factory=list, type=typing.List[str])
 
-    def gen(self) -> openpyxl.workbook.workbook.Workbook:
+    def gen(self, rows: typing.List[Fields] = None) -> mpm.xlsx.Workbook:
         """
         Excel spreadsheet generator for the CAN Root class.
 
+        Args:
+            rows: rows already generated by `gen_fields()`
+
         Returns:
             workbook: generated Excel workbook
         """
-        workbook = openpyxl.Workbook()
-        workbook.remove(workbook.active)
-        worksheet = workbook.create_sheet("Parameters")
-        worksheet.append(field_names.as_expanded_list(self.column_filter))
+        if rows is None:
+            rows = self.gen_fields()
 
+        workbook = mpm.xlsx.Workbook()
+        workbook.create_sheet("Parameters", rows=self.gen_rows(rows=rows))
+
+        return workbook
+
+    def gen_rows(self, rows: typing.List[Fields]) -> typing.Iterator[typing.List]:
+        """
+        Generate the worksheet rows, starting with the header.
+
+        Args:
+            rows: Fields rows
+
+        Returns:
+            iterator of row values
+        """
+        header = attr.evolve(field_names, defaults=list(self.pmvs_names))
+        yield header.as_expanded_list(self.column_filter)
+
+        for row in rows:
+            yield row.as_expanded_list(self.column_filter)
+
+    def gen_fields(self) -> typing.List[Fields]:
+        """
+        Generate the Fields rows for all signals, sorted by parameter path.
+
+        Returns:
+            list of Fields rows
+        """
         unsorted_rows = []
         for child in self.wrapped.children:
             rows = builders.wrap(
@@ -182,12 +276,7 @@ class Root:
             for row in rows:
                 unsorted_rows.append(row)
 
-        sorted_rows = natsorted(unsorted_rows, key=lambda x: x.parameter_path)
-
-        for row in sorted_rows:
-            worksheet.append(row.as_expanded_list(self.column_filter))
-
-        return workbook
+        return natsorted(unsorted_rows, key=lambda x: x.parameter_path)
 
 
 @builders(mpm.canmodel.Signal)
@@ -345,328 +434,322 @@ class GenericNode:
         return output_list
 
 
+def create_manual_styles() -> typing.List[openpyxl.styles.NamedStyle]:
+    """
+    Create the named styles used by the controls manual spreadsheet.
+
+    Returns:
+        list of named styles
+    """
+
+    def cell_style(name, alignment=None):
+        style = openpyxl.styles.NamedStyle(
+            name=name,
+            font=CELL_FONT,
+            border=CELL_BORDER,
+            number_format=NUMBER_FORMAT_TEXT,
+        )
+        if alignment is not None:
+            style.alignment = alignment
+
+        return style
+
+    return [
+        openpyxl.styles.NamedStyle(name=MANUAL_SECTION_STYLE, font=CELL_FONT),
+        cell_style(name=MANUAL_CELL_STYLE),
+        cell_style(
+            name=MANUAL_NAME_STYLE,
+            alignment=openpyxl.styles.alignment.Alignment(
+                horizontal="left", vertical="top"
+            ),
+        ),
+        cell_style(
+            name=MANUAL_DESCRIPTION_STYLE,
+            alignment=openpyxl.styles.alignment.Alignment(wrap_text=True),
+        ),
+    ]
+
+
+def filter_for_manual(rows: typing.Iterable[Fields]) -> typing.Iterator[Fields]:
+    """
+    Select the rows to be included in the controls manual.
+
+    Args:
+        rows: Fields rows for all signals
+
+    Returns:
+        iterator of the Fields rows of EPyQ parameters for service access levels
+    """
+    filter_prefixes = tuple(
+        PARAMETERS_PREFIX + group_parameter_filter
+        for group_parameter_filter in FILTER_GROUPS
+    )
+
+    for row in rows:
+        # Only output parameters that are in EPyQ.
+        if not row.parameter_path.startswith(PARAMETERS_PREFIX):
+            continue
+
+        # Filter out parameter groups in FILTER_GROUPS list.
+        if row.parameter_path.startswith(filter_prefixes):
+            continue
+
+        # Only allow access levels: Service_Tech and Service_Eng.
+        if row.access_level in ["Service_Tech", "Service_Eng"]:
+            yield row
+
+
 def format_for_manual(
-    input_path: pathlib.Path,
+    rows: typing.List[Fields],
+    output_path: pathlib.Path,
+    default_names: typing.List[str] = (),
 ) -> None:
     """
     Translate the CAN model parameter data to formatted Excel format (.xlsx)
     for the purpose of insertion into the controls manual documentation.
 
     Args:
-        input_path: path and filename for input .xlsx file
+        rows: Fields rows generated by `Root.gen_fields()`
+        output_path: path and filename for output .xlsx file
+        default_names: names of the value sets the row defaults are from
 
     Returns:
 
     """
-    input_workbook = openpyxl.load_workbook(filename=input_path)
-    input_worksheet = input_workbook.active
-    input_worksheet_col_count = input_worksheet.max_column
-
-    output_path = input_path.with_name(
-        input_path.stem + "_for_manual" + input_path.suffix
-    )
-    print(f"input spreadsheet: {input_path}")
     print(f"output spreadsheet: {output_path}")
-    print("Be patient. Generation of the output spreadsheet takes a long time.")
 
     output_workbook = openpyxl.Workbook()
     output_workbook.remove(output_workbook.active)
+    for style in create_manual_styles():
+        output_workbook.add_named_style(style)
     output_worksheet = output_workbook.create_sheet("Parameters")
 
-    # Perform all filtering activities.
-    filtered_rows = []
-    for row in input_worksheet.iter_rows(min_row=2, max_col=input_worksheet_col_count):
-        # Only output parameters that are in EPyQ.
-        parameter_path = row[6].value
-        if not parameter_path.startswith(PARAMETERS_PREFIX):
-            continue
-
-        # Filter out parameter groups in FILTER_GROUPS list.
-        filter_out = False
-        for group_parameter_filter in FILTER_GROUPS:
-            if parameter_path.startswith(PARAMETERS_PREFIX + group_parameter_filter):
-                filter_out = True
-        if filter_out:
-            continue
-
-        # Only allow access levels: Service_Tech and Service_Eng.
-        access_level_out = row[3].value
-        if access_level_out in ["Service_Tech", "Service_Eng"]:
-            filtered_rows.append(row)
+    # Collected rather than merged one at a time since each merge checks all
+    # existing ranges.
+    merged_ranges = []
+    # (first row, row count, column count, table row) of each parameter entry
+    entries = []
+    # (row, column count) of each header description
+    sections = []
+
+    def merge(start_row, start_column, end_row, end_column):
+        merged_ranges.append(
+            openpyxl.worksheet.cell_range.CellRange(
+                min_row=start_row,
+                min_col=start_column,
+                max_row=end_row,
+                max_col=end_column,
+            )
+        )
 
     # Track the current row in the output worksheet.
     current_row = 1
+    current_parameter_path = ""
+    entered_tables_section = False
+
+    for row in filter_for_manual(rows):
+        parameter_path = row.parameter_path
+        description_out = row.description
+        access_level_out = row.access_level
+        units_out = row.units
+        enumerator_list = row.enumerator_list
+        parameter_name_out = row.epyq_can_parameter_name
+        minimum_out = row.minimum
+        maximum_out = row.maximum
+        defaults_out = [
+            "" if default is None else f"{default}" for default in row.defaults
+        ]
 
-    # Display a progress bar since the generation of the output takes a long time.
-    with tqdm(total=len(filtered_rows)) as progress_bar:
-        current_parameter_path = ""
-        entered_tables_section = False
-
-        for row in filtered_rows:
-            is_numbered_variant = False
-
-            parameter_path = row[6].value
-            if not parameter_path.startswith(PARAMETERS_PREFIX):
-                # Only output parameters that are in EPyQ.
-                continue
-            description_out = row[2].value
-            access_level_out = row[3].value
-            units_out = row[4].value
-            # can_path = row[5].value
-            # parameter_path = row[6].value
-            enumerator_list = row[7].value
-            # uuid = row[8].value
-            parameter_name_out = row[9].value
-            minimum_out = row[10].value
-            maximum_out = row[11].value
-            defaults_out = []
-            for col in row[12:]:
-                if col.value != None:
-                    defaults_out.append(f"{col.value}")
-                else:
-                    defaults_out.append("")
-
-            # is_numbered_variant is necessary to distinguish parameters that are similarly named
-            # (differ by numbers) from those that aren't (differ by word(s)) since both have
-            # entered_table_section and all_defaults_same set to True
-            is_numbered_variant = (
-                True
-                if re.search(NUMBERED_VARIANT_PATTERN, parameter_name_out)
-                else False
+        # is_numbered_variant is necessary to distinguish parameters that are similarly named
+        # (differ by numbers) from those that aren't (differ by word(s)) since both have
+        # entered_table_section and all_defaults_same set to True
+        is_numbered_variant = (
+            True if re.search(NUMBERED_VARIANT_PATTERN, parameter_name_out) else False
+        )
+
+        if units_out:
+            # If there is a units value, append it to the end of the numeric default value.
+            if minimum_out is not None:
+                minimum_out = f"{minimum_out} {units_out}"
+            if maximum_out is not None:
+                maximum_out = f"{maximum_out} {units_out}"
+            for i in range(len(defaults_out)):
+                if defaults_out[i] != "":
+                    defaults_out[i] = f"{defaults_out[i]} {units_out}"
+
+        # Discover if all the product defaults are equal.
+        all_defaults_same = len(set(defaults_out)) == 1
+
+        # +1 for parameter name
+        column_count = max(MIN_MANUAL_COLUMN_COUNT, len(defaults_out) + 1)
+
+        # If applicable, add a header description for a set of parameters.
+        # Chop off the parameters prefix to match the path that is seen in the EPyQ parameters tab.
+        parameter_path_to_check = parameter_path[len(PARAMETERS_PREFIX) :]
+        if parameter_path_to_check != current_parameter_path:
+            # Add the parameter path for this section of parameters.
+            current_parameter_path = parameter_path_to_check
+            output_worksheet.append([current_parameter_path])
+
+            # Merge cells for header description.
+            merge(
+                start_row=current_row,
+                start_column=1,
+                end_row=current_row,
+                end_column=column_count,
+            )
+            sections.append((current_row, column_count))
+
+            current_row += 1
+            # Reset the tables section logic.
+            entered_tables_section = False
+
+        # Track the rows used for each parameter entry.
+        rows_used = 0
+
+        table_row = entered_tables_section and is_numbered_variant
+        if table_row:
+            # Different table defaults for different products would need to keep track of all
+            # table parameters and add the header row with product variants if the defaults differ
+            # in any of them. So far the default is the same for all products so this is not
+            # yet implemented.
+            assert (
+                all_defaults_same
+            ), "Different defaults for table parameters has not been implemented"
+            # Output single Default cells section for additional table row.
+            output_worksheet.append(
+                [parameter_name_out, access_level_out]
+                + (column_count - MIN_MANUAL_COLUMN_COUNT) * [""]
+                + [
+                    minimum_out,
+                    maximum_out,
+                    defaults_out[0],
+                ]
+            )
+            rows_used += 1
+
+            # Merge access level; minimum, maximum and default stay as 1 column
+            merge(
+                start_row=current_row,
+                start_column=2,
+                end_row=current_row,
+                end_column=column_count - 3,
             )
 
-            if units_out:
-                # If there is a units value, append it to the end of the numeric default value.
-                if minimum_out is not None:
-                    minimum_out = f"{minimum_out} {units_out}"
-                if maximum_out is not None:
-                    maximum_out = f"{maximum_out} {units_out}"
-                for i in range(len(defaults_out)):
-                    if defaults_out[i] != "":
-                        defaults_out[i] = f"{defaults_out[i]} {units_out}"
-
-            # Discover if all the product defaults are equal.
-            all_defaults_same = len(set(defaults_out)) == 1
-
-            # +1 for parameter name
-            column_count = max(MIN_MANUAL_COLUMN_COUNT, len(defaults_out) + 1)
-
-            # If applicable, add a header description for a set of parameters.
-            # Chop off the parameters prefix to match the path that is seen in the EPyQ parameters tab.
-            parameter_path_to_check = parameter_path[len(PARAMETERS_PREFIX) :]
-            if parameter_path_to_check != current_parameter_path:
-                # Add the parameter path for this section of parameters.
-                current_parameter_path = parameter_path_to_check
-                output_worksheet.append([current_parameter_path])
-
-                # Merge cells for header description.
-                output_worksheet.merge_cells(
-                    start_row=current_row,
-                    start_column=1,
-                    end_row=current_row,
-                    end_column=column_count,
-                )
+        else:
+            # Check and set if this parameter is the start of table rows section.
+            entered_tables_section = TABLES_TREE_STR in parameter_path
 
-                # Set the font size for header description.
-                for col in EXCEL_COLUMN_LETTERS[:column_count]:
-                    output_worksheet[col + str(current_row)].font = CELL_FONT
-
-                current_row += 1
-                # Reset the tables section logic.
-                entered_tables_section = False
-
-            # Track the rows used for each parameter entry.
-            rows_used = 0
-
-            if entered_tables_section and is_numbered_variant:
-                # Different table defaults for different products would need to keep track of all
-                # table parameters and add the header row with product variants if the defaults differ
-                # in any of them. So far the default is the same for all products so this is not
-                # yet implemented.
-                assert (
-                    all_defaults_same
-                ), "Different defaults for table parameters has not been implemented"
-                # Output single Default cells section for additional table row.
-                row = (
-                    [parameter_name_out, access_level_out]
-                    + (column_count - MIN_MANUAL_COLUMN_COUNT) * [""]
-                    + [
-                        minimum_out,
-                        maximum_out,
-                        defaults_out[0],
-                    ]
-                )
-                output_worksheet.append(row)
+            # Add the parameter name and description cells.
+            output_worksheet.append([parameter_name_out, description_out])
+            rows_used += 1
+
+            if enumerator_list:
+                # Add the enumerator list cell / row.
+                output_worksheet.append(["", enumerator_list])
                 rows_used += 1
 
-                # Set horizontal & vertical alignment for parameter name.
-                output_worksheet[
-                    "A" + str(current_row)
-                ].alignment = openpyxl.styles.alignment.Alignment(
-                    horizontal="left", vertical="top"
+            if all_defaults_same:
+                # Output single Default cells section.
+                output_worksheet.append(
+                    ["", field_names.access_level]
+                    + (column_count - MIN_MANUAL_COLUMN_COUNT) * [""]
+                    + [field_names.minimum, field_names.maximum, "Default"]
                 )
-
-                # Merge access level; minimum, maximum and default stay as 1 column
-                output_worksheet.merge_cells(
-                    start_row=current_row,
-                    start_column=2,
-                    end_row=current_row,
-                    end_column=column_count - 3,
+                output_worksheet.append(
+                    ["", access_level_out]
+                    + (column_count - MIN_MANUAL_COLUMN_COUNT) * [""]
+                    + [minimum_out, maximum_out, defaults_out[0]]
                 )
-
+                rows_used += 2
+                # Merge access level; minimum, maximum and default stay as 1 column
+                access_level_end_column = column_count - 3
             else:
-                # Check and set if this parameter is the start of table rows section.
-                entered_tables_section = TABLES_TREE_STR in parameter_path
-
-                # Add the parameter name and description cells.
-                output_worksheet.append([parameter_name_out, description_out])
-                rows_used += 1
-
-                if enumerator_list:
-                    # Add the enumerator list cell / row.
-                    output_worksheet.append(["", enumerator_list])
-                    rows_used += 1
-
-                if all_defaults_same:
-                    row1 = (
-                        ["", field_names.access_level]
-                        + (column_count - MIN_MANUAL_COLUMN_COUNT) * [""]
-                        + [field_names.minimum, field_names.maximum, "Default"]
-                    )
-                    row2 = (
-                        ["", access_level_out]
-                        + (column_count - MIN_MANUAL_COLUMN_COUNT) * [""]
-                        + [minimum_out, maximum_out, defaults_out[0]]
-                    )
-                    # Output single Default cells section.
-                    output_worksheet.append(row1)
-                    output_worksheet.append(row2)
-                    rows_used += 2
-                else:
-                    # Output multiple Default cells sections, +1 for no default column
-                    row1 = (
-                        ["", field_names.access_level]
-                        + (column_count - MIN_MANUAL_COLUMN_COUNT + 1) * [""]
-                        + [field_names.minimum, field_names.maximum]
-                    )
-                    row2 = (
-                        ["", access_level_out]
-                        + (column_count - MIN_MANUAL_COLUMN_COUNT + 1) * [""]
-                        + [minimum_out, maximum_out]
-                    )
-                    output_worksheet.append(row1)
-                    output_worksheet.append(row2)
-                    output_worksheet.append([""] + field_names.defaults)
-                    output_worksheet.append([""] + defaults_out)
-                    rows_used += 4
-
-                # Merge cells for parameter name.
-                output_worksheet.merge_cells(
-                    start_row=current_row,
-                    start_column=1,
-                    end_row=current_row + rows_used - 1,
-                    end_column=1,
+                # Output multiple Default cells sections, +1 for no default column
+                output_worksheet.append(
+                    ["", field_names.access_level]
+                    + (column_count - MIN_MANUAL_COLUMN_COUNT + 1) * [""]
+                    + [field_names.minimum, field_names.maximum]
                 )
-
-                # Set horizontal & vertical alignment for parameter name.
-                output_worksheet[
-                    "A" + str(current_row)
-                ].alignment = openpyxl.styles.alignment.Alignment(
-                    horizontal="left", vertical="top"
+                output_worksheet.append(
+                    ["", access_level_out]
+                    + (column_count - MIN_MANUAL_COLUMN_COUNT + 1) * [""]
+                    + [minimum_out, maximum_out]
                 )
+                output_worksheet.append([""] + list(default_names))
+                output_worksheet.append([""] + defaults_out)
+                rows_used += 4
+                # Merge access level; minimum and maximum stay as 1 column; no default column.
+                # The product specific defaults each get their own column.
+                access_level_end_column = column_count - 2
+
+            # Merge cells for parameter name.
+            merge(
+                start_row=current_row,
+                start_column=1,
+                end_row=current_row + rows_used - 1,
+                end_column=1,
+            )
 
-                # Set alignment of description to wrap text.
-                for col in EXCEL_COLUMN_LETTERS[1:column_count]:
-                    output_worksheet[
-                        col + str(current_row)
-                    ].alignment = openpyxl.styles.alignment.Alignment(wrap_text=True)
+            # Merge cells for description.
+            merge(
+                start_row=current_row,
+                start_column=2,
+                end_row=current_row,
+                end_column=column_count,
+            )
 
-                # Merge cells for description.
-                output_worksheet.merge_cells(
-                    start_row=current_row,
+            access_level_row = current_row + 1
+            if enumerator_list:
+                # Merge cells for enumerator list cell.
+                merge(
+                    start_row=current_row + 1,
                     start_column=2,
-                    end_row=current_row,
+                    end_row=current_row + 1,
                     end_column=column_count,
                 )
+                access_level_row += 1
 
-                if enumerator_list:
-                    # Merge cells for enumerator list cell.
-                    output_worksheet.merge_cells(
-                        start_row=current_row + 1,
-                        start_column=2,
-                        end_row=current_row + 1,
-                        end_column=column_count,
-                    )
+            for merge_row in (access_level_row, access_level_row + 1):
+                merge(
+                    start_row=merge_row,
+                    start_column=2,
+                    end_row=merge_row,
+                    end_column=access_level_end_column,
+                )
 
-                if all_defaults_same:
-                    # Merge access level; minimum, maximum and default stay as 1 column
-                    if enumerator_list:
-                        output_worksheet.merge_cells(
-                            start_row=current_row + 2,
-                            start_column=2,
-                            end_row=current_row + 2,
-                            end_column=column_count - 3,
-                        )
-                        output_worksheet.merge_cells(
-                            start_row=current_row + 3,
-                            start_column=2,
-                            end_row=current_row + 3,
-                            end_column=column_count - 3,
-                        )
-                    else:
-                        output_worksheet.merge_cells(
-                            start_row=current_row + 1,
-                            start_column=2,
-                            end_row=current_row + 1,
-                            end_column=column_count - 3,
-                        )
-                        output_worksheet.merge_cells(
-                            start_row=current_row + 2,
-                            start_column=2,
-                            end_row=current_row + 2,
-                            end_column=column_count - 3,
-                        )
+        entries.append((current_row, rows_used, column_count, table_row))
+
+        # Update the current row with the number of rows used plus one to go to the next row.
+        current_row += rows_used
+
+    # Set the font size for header descriptions.
+    for section_row, column_count in sections:
+        for column in range(1, column_count + 1):
+            output_worksheet.cell(
+                row=section_row, column=column
+            ).style = MANUAL_SECTION_STYLE
+
+    # Set the font size, border and alignment for the parameter entries.
+    for first_row, rows_used, column_count, table_row in entries:
+        for style_row in range(first_row, first_row + rows_used):
+            for column in range(1, column_count + 1):
+                if style_row != first_row:
+                    style = MANUAL_CELL_STYLE
+                elif column == 1:
+                    # Horizontal & vertical alignment for parameter name.
+                    style = MANUAL_NAME_STYLE
+                elif not table_row:
+                    # Description wraps text.
+                    style = MANUAL_DESCRIPTION_STYLE
                 else:
-                    # Merge access level; minimum and maximum stay as 1 column; no default column.
-                    # The product specific defaults each get their own column.
-                    if enumerator_list:
-                        output_worksheet.merge_cells(
-                            start_row=current_row + 2,
-                            start_column=2,
-                            end_row=current_row + 2,
-                            end_column=column_count - 2,
-                        )
-                        output_worksheet.merge_cells(
-                            start_row=current_row + 3,
-                            start_column=2,
-                            end_row=current_row + 3,
-                            end_column=column_count - 2,
-                        )
-                    else:
-                        output_worksheet.merge_cells(
-                            start_row=current_row + 1,
-                            start_column=2,
-                            end_row=current_row + 1,
-                            end_column=column_count - 2,
-                        )
-                        output_worksheet.merge_cells(
-                            start_row=current_row + 2,
-                            start_column=2,
-                            end_row=current_row + 2,
-                            end_column=column_count - 2,
-                        )
+                    style = MANUAL_CELL_STYLE
 
-            # Set the font size and border for non header description rows.
-            for style_row in range(current_row, current_row + rows_used):
-                for col in EXCEL_COLUMN_LETTERS[:column_count]:
-                    output_worksheet[col + str(style_row)].font = CELL_FONT
-                    output_worksheet[col + str(style_row)].border = CELL_BORDER
-                    output_worksheet[
-                        col + str(style_row)
-                    ].number_format = NUMBER_FORMAT_TEXT
+                output_worksheet.cell(row=style_row, column=column).style = style
 
-            # Update the current row with the number of rows used plus one to go to the next row.
-            current_row += rows_used
-            progress_bar.update(1)
+    output_worksheet.merged_cells = openpyxl.worksheet.cell_range.MultiCellRange(
+        merged_ranges,
+    )
 
+    output_path.parent.mkdir(parents=True, exist_ok=True)
     output_workbook.save(output_path)
@@ -0,0 +1,535 @@
+"""Incremental consistency checking of the project models."""
+
+import typing
+
+import attr
+
+import epyqlib.attrsmodel
+import epyqlib.checkresultmodel
+import epyqlib.treenode
+
+import mpm.canmodel
+
+
+def is_group(node) -> bool:
+    """Whether the check of a node only collects the checks of its children."""
+    return getattr(type(node), "check", None) is epyqlib.attrsmodel.check_just_children
+
+
+def check_unit(root, node):
+    """
+    Get the node checked for a change to a node, the outermost node on its
+    path from the root which is not a group.
+
+    Returns:
+        the checked node, the node itself for the root or a group not within
+        a checked node, None for a detached node
+    """
+    unit = node
+
+    while node is not root:
+        if node is None:
+            return None
+
+        if not is_group(node):
+            unit = node
+
+        node = node.tree_parent
+
+    return unit
+
+
+def check_units(node):
+    """Iterate over the nodes checked for the tree below a node."""
+    for child in node.children:
+        if is_group(child):
+            yield from check_units(child)
+        else:
+            yield child
+
+
+@attr.s
+class ModelResults:
+    """
+    Check results of the checked nodes of one model along with the result
+    nodes standing for the groups containing them.  All are keyed by node id
+    and hold the node to catch reused ids.
+    """
+
+    results = attr.ib(factory=dict)
+    groups = attr.ib(factory=dict)
+    dirty = attr.ib(factory=set)
+
+    def clear(self):
+        self.results.clear()
+        self.groups.clear()
+        self.dirty.clear()
+
+
+@attr.s
+class DependentsIndex:
+    """
+    The nodes of a model keyed by the parameter UUID they refer to.
+
+    Nodes are indexed as they are passed to `add()` and `update()` and
+    dropped by `remove()`, the checker calls these as the attrs model reports
+    changes so the index is never rebuilt for an edit.
+    """
+
+    _uuids = attr.ib(factory=dict, init=False)
+    _nodes = attr.ib(factory=dict, init=False)
+
+    @classmethod
+    def build(cls, root):
+        index = cls()
+        index.add(root)
+
+        return index
+
+    def add(self, node) -> None:
+        """Index a node and those below it."""
+        for each in mpm.canmodel.subtree(node):
+            self.update(each)
+
+    def remove(self, node) -> None:
+        """Drop a node and those below it from the index."""
+        for each in mpm.canmodel.subtree(node):
+            self._discard(each)
+
+    def clear(self) -> None:
+        self._uuids.clear()
+        self._nodes.clear()
+
+    def update(self, node) -> None:
+        """Index a node again after its parameter UUID changed."""
+        self._discard(node)
+
+        parameter_uuid = getattr(node, "parameter_uuid", None)
+        if parameter_uuid is None:
+            return
+
+        self._uuids[id(node)] = (node, parameter_uuid)
+        self._nodes.setdefault(parameter_uuid, []).append(node)
+
+    def nodes_by_parameter_uuid(self, parameter_uuid) -> list:
+        return list(self._nodes.get(parameter_uuid, ()))
+
+    def _discard(self, node):
+        entry = self._uuids.pop(id(node), None)
+        if entry is None:
+            return
+
+        nodes = self._nodes[entry[1]]
+        nodes[:] = [other for other in nodes if other is not node]
+        if len(nodes) == 0:
+            del self._nodes[entry[1]]
+
+
+@attr.s
+class SunSpecNodes:
+    """
+    Stand in for the root of the single SunSpec model the parameter checks
+    search for linked data points, covering both SunSpec models.
+    """
+
+    checker = attr.ib()
+
+    @property
+    def root(self):
+        return self
+
+    def nodes_by_attribute(self, attribute_value, attribute_name, raise_=True):
+        nodes = []
+
+        for name in ("sunspec1", "sunspec2"):
+            model = self.checker.project.models[name]
+            if model is None:
+                continue
+
+            if attribute_name == "parameter_uuid":
+                nodes.extend(
+                    self.checker.dependents(name).nodes_by_parameter_uuid(
+                        attribute_value
+                    )
+                )
+            else:
+                nodes.extend(
+                    model.root.nodes_by_attribute(
+                        attribute_value=attribute_value,
+                        attribute_name=attribute_name,
+                        raise_=False,
+                    )
+                )
+
+        if len(nodes) == 0 and raise_:
+            raise epyqlib.treenode.NotFoundError(
+                f"Attribute {attribute_name!r} with value {attribute_value!r} "
+                f"not found"
+            )
+
+        return nodes
+
+
+@attr.s
+class CheckModels:
+    """
+    The project models as passed to the node checks.  The models are resolved
+    through the project as they are used and `sunspec` covers both SunSpec
+    models.
+    """
+
+    checker = attr.ib()
+
+    @property
+    def sunspec(self):
+        return SunSpecNodes(checker=self.checker)
+
+    def __getattr__(self, name):
+        return getattr(self.checker.project.models, name)
+
+    def __getitem__(self, item):
+        return self.checker.project.models[item]
+
+
+@attr.s
+class Checker:
+    """
+    Check results for the project models, kept up to date as they change.
+
+    The results are kept for each checked node of each model, the outermost
+    nodes which are not groups only collecting the results of their children.
+    The model change signals mark the checked node containing a change as
+    dirty, along with those of nodes referring to the changed node by
+    parameter UUID.  The nodes referring to each parameter UUID are indexed
+    by a `DependentsIndex` for each model, updated by the same signals.  Only
+    dirty and new checked nodes are checked again.  Their results are placed
+    in `root` as they are checked, so a model over it only sees the changed
+    rows.  Changes the models don't report, such as to fields without a
+    column, need an `invalidate()`.
+    """
+
+    project = attr.ib()
+    root = attr.ib(factory=epyqlib.checkresultmodel.Root, init=False)
+    _model_results = attr.ib(factory=dict, init=False)
+    _model_nodes = attr.ib(factory=dict, init=False)
+    _dependents = attr.ib(factory=dict, init=False)
+    _connected = attr.ib(factory=list, init=False)
+
+    @property
+    def models(self):
+        """Get the set models of the project by name, loading deferred ones."""
+        models = self.project.models
+
+        return {name: models[name] for name in models if models[name] is not None}
+
+    def invalidate(self, name=None) -> None:
+        names = list(self.project.models) if name is None else [name]
+
+        for name in names:
+            self._results_for(name).clear()
+            self._dependents.pop(name, None)
+
+            node = self._model_nodes.pop(name, None)
+            if node is not None:
+                self.root.remove_child(child=node)
+
+    def dependents(self, name) -> DependentsIndex:
+        """Get the index of the nodes of the named model by parameter UUID."""
+        model = self.project.models[name]
+        cached = self._dependents.get(name)
+
+        if cached is None or cached[0] is not model:
+            self._connect(name=name, model=model)
+            cached = (model, DependentsIndex.build(root=model.root))
+            self._dependents[name] = cached
+
+        return cached[1]
+
+    def pending(self) -> typing.List[typing.Tuple[str, typing.Any]]:
+        """
+        Get the checked nodes needing to be checked again, dropping the
+        results of those which have been removed.
+
+        Returns:
+            list of model name and node pairs
+        """
+        pending = []
+        models = self.models
+
+        for name, node in list(self._model_nodes.items()):
+            if name not in models or node.node is not models[name].root:
+                self.invalidate(name=name)
+
+        for name, model in models.items():
+            self._connect(name=name, model=model)
+            self._group_node(name=name, group=model.root)
+            model_results = self._results_for(name)
+
+            units = list(check_units(model.root))
+            keys = {id(unit) for unit in units}
+
+            for key, (node, result) in list(model_results.results.items()):
+                if key not in keys:
+                    self.forget(name=name, node=node)
+
+            for unit in units:
+                node, _ = model_results.results.get(id(unit), (None, None))
+
+                if id(unit) in model_results.dirty or node is not unit:
+                    pending.append((name, unit))
+
+        return pending
+
+    def check(self, name, node) -> None:
+        """
+        Check a checked node of the named model and place its result in
+        `root`.  Nodes which are no longer checked nodes of the model, such
+        as those removed since they were found pending, are skipped.
+        """
+        model = self.project.models[name]
+
+        if is_group(node) or check_unit(root=model.root, node=node) is not node:
+            return
+
+        result = node.check(models=CheckModels(checker=self))
+
+        model_results = self._results_for(name)
+        _, previous = model_results.results.pop(id(node), (None, None))
+        if previous is not None and self._placed(name=name, node=previous):
+            self._detach(name=name, node=previous)
+
+        model_results.results[id(node)] = (node, result)
+        model_results.dirty.discard(id(node))
+
+        if result is not None:
+            self._insert(
+                parent=self._group_node(name=name, group=node.tree_parent),
+                node=result,
+            )
+
+    def check_all(self) -> epyqlib.checkresultmodel.Root:
+        """Check everything pending and collect the results."""
+        for name, node in self.pending():
+            self.check(name=name, node=node)
+
+        return self.collect()
+
+    def collect(self) -> epyqlib.checkresultmodel.Root:
+        """
+        Get the current results, checked nodes yet to be checked are left
+        out.
+        """
+        return self.root
+
+    def forget(self, name, node) -> None:
+        """Drop the results for a node of the named model and those below it."""
+        model_results = self._results_for(name)
+
+        for each in mpm.canmodel.subtree(node):
+            key = id(each)
+            model_results.dirty.discard(key)
+
+            checked, result = model_results.results.get(key, (None, None))
+            if checked is each:
+                del model_results.results[key]
+
+                if result is not None and self._placed(name=name, node=result):
+                    self._detach(name=name, node=result)
+
+            group_node = model_results.groups.get(key)
+            if group_node is not None and group_node.node is each:
+                del model_results.groups[key]
+
+                if self._placed(name=name, node=group_node):
+                    self._detach(name=name, node=group_node)
+
+    def mark(self, name, node) -> None:
+        """
+        Mark a changed node, and the nodes referring to it, to be checked.
+
+        Args:
+            name: name of the model containing the node
+            node: changed node
+        """
+        model = self.models[name]
+        unit = check_unit(root=model.root, node=node)
+
+        if unit is None:
+            self.invalidate(name=name)
+            return
+
+        if unit is model.root:
+            # Added and removed checked nodes are found by `pending()`
+            return
+
+        if is_group(unit):
+            group_node = self._results_for(name).groups.get(id(unit))
+            group_name = getattr(unit, "name", "")
+
+            if group_node is not None and group_node.node is unit:
+                if group_node.name != group_name:
+                    group_node.name = group_name
+        else:
+            self._results_for(name).dirty.add(id(unit))
+
+        self.mark_dependents(uuids=[getattr(node, "uuid", None)])
+
+    def mark_dependents(self, uuids) -> None:
+        """Mark the nodes referring to the passed UUIDs by parameter UUID."""
+        uuids = [uuid for uuid in uuids if uuid is not None]
+
+        for name, model in self.models.items():
+            dirty = self._results_for(name).dirty
+            index = self.dependents(name)
+
+            for uuid in uuids:
+                for dependent in index.nodes_by_parameter_uuid(uuid):
+                    unit = check_unit(root=model.root, node=dependent)
+                    if unit is not None and unit is not model.root:
+                        dirty.add(id(unit))
+
+    def _results_for(self, name) -> ModelResults:
+        return self._model_results.setdefault(name, ModelResults())
+
+    def _group_node(self, name, group) -> epyqlib.checkresultmodel.Node:
+        """Get the result node of a group, adding it to `root` if missing."""
+        model_results = self._results_for(name)
+        group_node = model_results.groups.get(id(group))
+
+        if group_node is not None and group_node.node is group:
+            return group_node
+
+        if group is self.project.models[name].root:
+            group_node = epyqlib.checkresultmodel.Node.build(name=name, node=group)
+
+            names = list(self.project.models)
+            row = len(
+                [
+                    node
+                    for node in self.root.children
+                    if names.index(node.name) < names.index(name)
+                ]
+            )
+            self.root.insert_child(row, group_node)
+            self._model_nodes[name] = group_node
+        else:
+            group_node = epyqlib.checkresultmodel.Node.build(
+                name=getattr(group, "name", ""),
+                node=group,
+            )
+            self._insert(
+                parent=self._group_node(name=name, group=group.tree_parent),
+                node=group_node,
+            )
+
+        model_results.groups[id(group)] = group_node
+
+        return group_node
+
+    def _insert(self, parent, node) -> None:
+        """Insert a result node in the order of the checked nodes."""
+        rows = {id(child): row for row, child in enumerate(parent.node.children)}
+        row = rows[id(node.node)]
+
+        index = len(parent.children)
+        while index > 0 and rows.get(id(parent.children[index - 1].node), -1) > row:
+            index -= 1
+
+        parent.insert_child(index, node)
+
+    def _placed(self, name, node) -> bool:
+        """Whether a result node is in the current result node of its group."""
+        parent = node.tree_parent
+        if parent is None:
+            return False
+
+        return self._results_for(name).groups.get(id(parent.node)) is parent
+
+    def _detach(self, name, node) -> None:
+        """Remove a result node along with the group result nodes left empty."""
+        groups = self._results_for(name).groups
+
+        parent = node.tree_parent
+        parent.remove_child(child=node)
+
+        while (
+            len(parent.children) == 0
+            and parent.tree_parent is not self.root
+            and groups.get(id(parent.node)) is parent
+        ):
+            del groups[id(parent.node)]
+            node = parent
+            parent = node.tree_parent
+            parent.remove_child(child=node)
+
+    def _connect(self, name, model):
+        if any(connected is model for connected in self._connected):
+            return
+
+        self._connected.append(model)
+
+        def dependents(name=name, model=model):
+            cached = self._dependents.get(name)
+            if cached is None or cached[0] is not model:
+                return None
+
+            return cached[1]
+
+        def data_changed(top_left, bottom_right, *args, name=name, model=model):
+            for row in range(top_left.row(), bottom_right.row() + 1):
+                node = model.node_from_index(top_left.sibling(row, 0))
+
+                index = dependents()
+                if index is not None:
+                    index.update(node)
+
+                self.mark(name=name, node=node)
+
+        def rows_inserted(parent, first, last, name=name, model=model):
+            index = dependents()
+            if index is not None:
+                for row in range(first, last + 1):
+                    index.add(model.node_from_index(model.model.index(row, 0, parent)))
+
+            self.mark(name=name, node=model.node_from_index(parent))
+
+        def rows_removing(parent, first, last, name=name, model=model):
+            removed = [
+                model.node_from_index(model.model.index(row, 0, parent))
+                for row in range(first, last + 1)
+            ]
+
+            uuids = []
+            for node in removed:
+                uuids.extend(
+                    getattr(each, "uuid", None) for each in mpm.canmodel.subtree(node)
+                )
+
+            self.mark_dependents(uuids=uuids)
+
+            index = dependents()
+            if index is not None:
+                for node in removed:
+                    index.remove(node)
+
+            for node in removed:
+                self.forget(name=name, node=node)
+
+        def rows_removed(parent, *args, name=name, model=model):
+            self.mark(name=name, node=model.node_from_index(parent))
+
+        def rows_moved(parent, start, end, destination, row, name=name, model=model):
+            self.mark(name=name, node=model.node_from_index(parent))
+            self.mark(name=name, node=model.node_from_index(destination))
+
+        def reset(*args, name=name):
+            self.invalidate(name=name)
+
+        item_model = model.model
+        item_model.dataChanged.connect(data_changed)
+        item_model.rowsInserted.connect(rows_inserted)
+        item_model.rowsAboutToBeRemoved.connect(rows_removing)
+        item_model.rowsRemoved.connect(rows_removed)
+        item_model.rowsMoved.connect(rows_moved)
+        item_model.layoutChanged.connect(reset)
+        item_model.modelReset.connect(reset)
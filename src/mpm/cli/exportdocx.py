@@ -11,7 +11,7 @@ import mpm.project
 @click.option("--template", type=click.File("rb"))
 @click.option("--access-level", default="user")
 def cli(project_file, docx_file, template, access_level):
-    project = mpm.project.load(project_file)
+    project = mpm.project.load(project_file, lazy=True)
 
     (access_levels,) = project.models.parameters.root.nodes_by_filter(
         filter=(lambda node: isinstance(node, epyqlib.pm.parametermodel.AccessLevels)),
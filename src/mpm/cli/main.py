@@ -7,14 +7,14 @@ import textwrap
 import click
 import epyqlib.pm.valueset
 import epyqlib.pm.valuesetmodel
-import lxml.etree
 
-import mpm.__main__
+import mpm.canmodel
 import mpm.cli.exportdocx
 import mpm.cli.sunspectostaticmodbus
 import mpm.cli.utils
 import mpm.importexport
-import mpm.importexportdialog
+import mpm.manifest
+import mpm.paths
 import mpm.project
 import mpm.smdx
 
@@ -24,7 +24,17 @@ def main():
     """Parameter manager"""
 
 
-main.add_command(mpm.__main__._entry_point, name="gui")
+@main.command(
+    context_settings={"ignore_unknown_options": True},
+    add_help_option=False,
+)
+@click.argument("args", nargs=-1, type=click.UNPROCESSED)
+def gui(args):
+    """Parameter Manager GUI"""
+    # Only the GUI needs the Qt widgets, keep them out of the other commands
+    import mpm.__main__
+
+    mpm.__main__._entry_point.main(args=list(args), prog_name="mpmcli gui")
 
 
 @main.group(name="import")
@@ -40,7 +50,7 @@ def full(project, target_path):
     """Import PM data from embedded project directory"""
     project = pathlib.Path(project)
 
-    paths = mpm.importexportdialog.paths_from_directory(target_path)
+    paths = mpm.paths.paths_from_directory(target_path)
 
     imported_project = mpm.importexport.full_import(
         paths=paths,
@@ -76,6 +86,14 @@ export.add_command(mpm.cli.exportdocx.cli, name="docx")
     "include_uuid_in_item",
     default=False,
 )
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of generators to run concurrently",
+)
+@mpm.cli.utils.profile_options
 def build(
     project,
     bcu_project,
@@ -83,46 +101,82 @@ def build(
     only_if_stale,
     skip_sunspec,
     include_uuid_in_item,
+    jobs,
+    profile,
+    profile_output,
+    profile_dump,
 ):
     """Export PM data to embedded project directory"""
     project = pathlib.Path(project)
     target_path = pathlib.Path(target_path)
 
-    paths = mpm.importexportdialog.paths_from_directory(target_path)
+    paths = mpm.paths.paths_from_directory(target_path)
+
+    options = {
+        "skip_output": skip_sunspec,
+        "include_uuid_in_item": include_uuid_in_item,
+    }
+    sources = mpm.importexport.export_sources(
+        project_path=project,
+        bcu_project_path=bcu_project,
+    )
+    manifest = mpm.manifest.Manifest.load(
+        path=target_path / mpm.manifest.file_name,
+        version=mpm.importexport.manifest_version(),
+    )
+
+    generator_names = list(mpm.importexport.generators)
 
     if only_if_stale:
-        if not mpm.importexport.is_stale(
-            project=project,
+        generator_names = mpm.importexport.stale_generators(
+            manifest=manifest,
+            sources=sources,
             paths=paths,
-            skip_sunspec=skip_sunspec,
-        ):
+            options=options,
+        )
+
+        if len(generator_names) == 0:
             click.echo(
                 "Generated files appear to be up to date, skipping export",
             )
 
             return
 
-        click.echo("Generated files appear to be out of date, starting export")
-
-    loaded_project = mpm.project.loadp(project)
-
-    loaded_project2 = mpm.project.loadp(project)  # Project cannot be deep copied
-    loaded_project2.models.can.droppable_from.add(loaded_project.models.parameters)
-
-    loaded_bcu_project = mpm.project.loadp(bcu_project) if bcu_project else None
+        click.echo(
+            "Generated files appear to be out of date, starting export of: "
+            + ", ".join(generator_names)
+        )
 
-    mpm.importexport.can_hierarchy_export(
-        project=loaded_project2,
-        bcu_project=loaded_bcu_project,
-        paths=paths,
-    )
+    def export_done(name, changed):
+        click.echo(f"{name} export done, {len(changed)} files changed")
+
+    with mpm.cli.utils.profiled(
+        profile=profile,
+        profile_output=profile_output,
+        profile_dump=profile_dump,
+    ) as profiler:
+        if profiler is not None:
+            # Stages are only measured in this process
+            jobs = 1
+
+        mpm.importexport.run_generators(
+            project_path=project,
+            bcu_project_path=bcu_project,
+            paths=paths,
+            generator_names=generator_names,
+            options=options,
+            jobs=jobs,
+            done=export_done,
+        )
 
-    mpm.importexport.interface_code_export(
-        project=loaded_project,
+    mpm.importexport.record_generators(
+        manifest=manifest,
+        generator_names=generator_names,
+        sources=sources,
         paths=paths,
-        skip_output=skip_sunspec,
-        include_uuid_in_item=include_uuid_in_item,
+        options=options,
     )
+    manifest.save()
 
     click.echo()
     click.echo("done")
@@ -133,11 +187,15 @@ def build(
 @mpm.cli.utils.target_path_option(required=True)
 @mpm.cli.utils.pmvs_overlay_recipes_path_option(required=True)
 @click.option("--generate-formatted-output", "generate_formatted_output", is_flag=True)
+@mpm.cli.utils.profile_options
 def docs(
     project: str,
     target_path: str,
     pmvs_overlay_recipes_path: str,
     generate_formatted_output: bool,
+    profile: bool,
+    profile_output: str,
+    profile_dump: str,
 ) -> None:
     """
     Export PM documentation to embedded project directory
@@ -146,7 +204,10 @@ def docs(
         project: path to PM project file
         target_path: path to root target directory
         pmvs_overlay_recipes_path: path to PMVS overlay recipes directory (contains base.json)
-        generate_formatted_output: generate formatted output of the documentation (takes a long time)
+        generate_formatted_output: generate formatted output of the documentation for the controls manual
+        profile: report the time, memory and nodes of each stage
+        profile_output: path to write the stage report to as JSON
+        profile_dump: directory to write cProfile dumps of each stage to
     Returns:
 
     """
@@ -157,16 +218,21 @@ def docs(
     pmvs_configuration = epyqlib.pm.valueset.OverlayConfiguration.load(pmvs_base)
     pmvs_output_path = pmvs_configuration.reference_output_path()
 
-    paths = mpm.importexportdialog.paths_from_directory(target_path)
+    paths = mpm.paths.paths_from_directory(target_path)
 
-    loaded_project = mpm.project.loadp(project)
+    with mpm.cli.utils.profiled(
+        profile=profile,
+        profile_output=profile_output,
+        profile_dump=profile_dump,
+    ):
+        loaded_project = mpm.project.loadp(project, lazy=True, headless=True)
 
-    mpm.importexport.generate_docs(
-        project=loaded_project,
-        pmvs_path=pmvs_output_path,
-        paths=paths,
-        generate_formatted_output=generate_formatted_output,
-    )
+        mpm.importexport.generate_docs(
+            project=loaded_project,
+            pmvs_path=pmvs_output_path,
+            paths=paths,
+            generate_formatted_output=generate_formatted_output,
+        )
 
     click.echo()
     click.echo("Export documentation complete.")
@@ -193,7 +259,20 @@ def validate():
     type=click.Path(exists=True, dir_okay=False, resolve_path=True),
 )
 @click.option("--smdx-glob", default="smdx_*.xml")
-def batch(reference, schema, subject, smdx_glob):
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of files to validate concurrently",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=True,
+    show_default=True,
+    help="Reuse results for files unchanged since they were last validated",
+)
+def batch(reference, schema, subject, smdx_glob, jobs, cache):
     failed = False
 
     reference_directory_path = pathlib.Path(reference)
@@ -210,36 +289,57 @@ def batch(reference, schema, subject, smdx_glob):
         file_glob=smdx_glob,
     )
 
-    schema = lxml.etree.fromstring(schema.read_bytes())
-    schema = lxml.etree.XMLSchema(schema, attribute_defaults=True)
+    validations = [
+        mpm.smdx.Validation(subject=subject_path, reference=reference_path)
+        for reference_path, subject_path in sorted(paired_paths.pairs.items())
+    ]
+    validations.extend(
+        mpm.smdx.Validation(subject=subject_path)
+        for subject_path in sorted(paired_paths.only_right)
+    )
 
     spacing = "\n\n"
     present_spacing = ""
 
     diff_indent = "        "
 
-    for reference_path, subject_path in sorted(paired_paths.pairs.items()):
+    if cache:
+        cache = mpm.smdx.ValidationCache(
+            directory=mpm.smdx.default_cache_directory(),
+        )
+    else:
+        cache = None
+
+    results = mpm.smdx.validate_all(
+        validations=validations,
+        schema_path=schema,
+        jobs=jobs,
+        cache=cache,
+    )
+
+    for validation, result in results:
         click.echo(present_spacing, nl=False)
         present_spacing = spacing
 
-        click.echo(
-            textwrap.dedent(
-                f"""\
-        Cross validating: {subject_path.name}
-               reference: {reference_path}
-                 subject: {subject_path}
-        """
+        if validation.reference is None:
+            click.echo(
+                textwrap.dedent(
+                    f"""\
+            Validating: {validation.subject.name}
+               subject: {validation.subject}
+            """
+                )
+            )
+        else:
+            click.echo(
+                textwrap.dedent(
+                    f"""\
+            Cross validating: {validation.subject.name}
+                   reference: {validation.reference}
+                     subject: {validation.subject}
+            """
+                )
             )
-        )
-
-        reference = lxml.etree.fromstring(reference_path.read_bytes())
-        subject = lxml.etree.fromstring(subject_path.read_bytes())
-
-        result = mpm.smdx.validate_against_reference(
-            subject=subject,
-            schema=schema,
-            reference=reference,
-        )
 
         if result.failed:
             failed = True
@@ -247,31 +347,32 @@ def batch(reference, schema, subject, smdx_glob):
         for line in result.notes.splitlines():
             click.echo(diff_indent + line)
 
-    for subject in sorted(paired_paths.only_right):
-        click.echo(present_spacing, nl=False)
-        present_spacing = spacing
+    sys.exit(failed)
 
-        click.echo(
-            textwrap.dedent(
-                f"""\
-        Validating: {subject.name}
-           subject: {subject}
-        """
-            )
-        )
 
-        result = mpm.smdx.validate_against_schema(
-            subject=subject,
-            schema=schema,
-        )
+@validate.command(name="can-ids")
+@mpm.cli.utils.project_option(required=True)
+def can_ids(project):
+    """Report CAN arbitration and multiplexer IDs used more than once"""
+    project = mpm.project.loadp(pathlib.Path(project), lazy=True, headless=True)
 
-        if result.failed:
-            failed = True
+    index = mpm.canmodel.IdentifierIndex.build(root=project.models.can.root)
+    conflicts = index.conflicts()
 
-        for line in result.notes.splitlines():
-            click.echo(diff_indent + line)
+    for conflict in conflicts:
+        names = ", ".join(node.name for node in conflict.nodes)
 
-    sys.exit(failed)
+        if conflict.message is None:
+            identifier = mpm.canmodel.hex_upper(None, conflict.identifier)
+            frame = "extended" if conflict.extended else "standard"
+            click.echo(f"Arbitration ID {identifier} ({frame}): {names}")
+        else:
+            click.echo(
+                f"Multiplexer ID {conflict.identifier} in "
+                f"{conflict.message.name}: {names}"
+            )
+
+    sys.exit(len(conflicts) > 0)
 
 
 @main.group()
@@ -295,7 +396,7 @@ def pmvs():
 def filter(project, input, output):
     """Export PM data to embedded project directory"""
     project = pathlib.Path(project)
-    project = mpm.project.loadp(project)
+    project = mpm.project.loadp(project, lazy=True, headless=True)
 
     value_set = epyqlib.pm.valuesetmodel.load(input)
     items = mpm.parameterstosil.collect_items(project.models.parameters.root)
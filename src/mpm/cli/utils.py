@@ -1,5 +1,9 @@
+import contextlib
+
 import click
 
+import mpm.profiling
+
 
 def project_option(required=False):
     return click.option(
@@ -26,3 +30,54 @@ def pmvs_overlay_recipes_path_option(required):
         required=required,
         help="Path to the pmvs overlay recipes directory",
     )
+
+
+def profile_options(function):
+    """Add the options controlling `profiled()` to a command."""
+    options = [
+        click.option(
+            "--profile",
+            is_flag=True,
+            help="Report the time, memory and nodes of each stage",
+        ),
+        click.option(
+            "--profile-output",
+            type=click.Path(dir_okay=False, resolve_path=True),
+            help="Also write the stage report as JSON, implies --profile",
+        ),
+        click.option(
+            "--profile-dump",
+            type=click.Path(file_okay=False, resolve_path=True),
+            help="Write a cProfile dump of each stage here, implies --profile",
+        ),
+    ]
+
+    for option in reversed(options):
+        function = option(function)
+
+    return function
+
+
+@contextlib.contextmanager
+def profiled(profile, profile_output, profile_dump):
+    """
+    Profile the stages run within the context when requested by the options
+    from `profile_options()`, reporting them on exit.
+
+    Returns:
+        the active profiler, None when not profiling
+    """
+    if not (profile or profile_output is not None or profile_dump is not None):
+        yield None
+        return
+
+    profiler = mpm.profiling.Profiler(dump_directory=profile_dump)
+
+    with mpm.profiling.profiling(profiler):
+        yield profiler
+
+    click.echo()
+    click.echo(profiler.report())
+
+    if profile_output is not None:
+        profiler.save(profile_output)
@@ -0,0 +1,62 @@
+"""Editor delegates for the model views.
+
+The model modules only import this when a view asks for a delegate so that
+exporting without a GUI doesn't pull in the Qt widgets.
+"""
+
+from PyQt5 import QtWidgets
+
+import epyqlib.attrsmodel
+import epyqlib.utils.qt
+
+
+class ScaleFactorDelegate(QtWidgets.QStyledItemDelegate):
+    """Select one of the scale factor points beside the edited point."""
+
+    def __init__(self, type_name, text_column_name, root, parent):
+        super().__init__(parent)
+
+        self.type_name = type_name
+        self.root = root
+
+    def createEditor(self, parent, option, index):
+        return QtWidgets.QListWidget(parent=parent)
+
+    def setEditorData(self, editor, index):
+        model_index = epyqlib.attrsmodel.to_source_model(index)
+        model = model_index.model()
+
+        item = model.itemFromIndex(model_index)
+        attrs_model = item.data(epyqlib.utils.qt.UserRoles.attrs_model)
+
+        raw = model.data(model_index, epyqlib.utils.qt.UserRoles.raw)
+
+        points = []
+        for pt in self.root.children:
+            if hasattr(pt, "type_uuid"):
+                type_node = attrs_model.node_from_uuid(pt.type_uuid)
+                if type_node.name == self.type_name:
+                    points.append(pt)
+
+        it = QtWidgets.QListWidgetItem(editor)
+        it.setText("")
+        it.setData(epyqlib.utils.qt.UserRoles.raw, "")
+        it.setSelected(True)
+        for p in points:
+            it = QtWidgets.QListWidgetItem(editor)
+            param = attrs_model.node_from_uuid(p.parameter_uuid)
+            it.setText(param.abbreviation)
+            it.setData(epyqlib.utils.qt.UserRoles.raw, p.uuid)
+            if p.uuid == raw:
+                it.setSelected(True)
+
+        editor.setMinimumHeight(editor.sizeHint().height())
+        editor.itemClicked.connect(
+            lambda: epyqlib.attrsmodel.hide_popup(editor),
+        )
+        editor.show()
+
+    def setModelData(self, editor, model, index):
+        selected_item = editor.currentItem()
+        datum = str(selected_item.data(epyqlib.utils.qt.UserRoles.raw))
+        model.setData(index, datum)
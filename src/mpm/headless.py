@@ -0,0 +1,257 @@
+"""Nodes and models which only create Qt objects when a view needs them.
+
+Every `epyqlib.treenode.TreeNode` creates a `QObject` for its child signals
+and every `epyqlib.utils.qt.pyqtify()` node another for its field signals,
+and `epyqlib.attrsmodel.Model` creates a row of items for every node.  The
+large SunSpec, static Modbus and CAN trees spend much of their memory and
+construction time on these even when exported without a view.
+
+The `TreeNode` and `pyqtify()` here create their signals when one is first
+connected, until then nothing can be listening so emitting does nothing.
+The `Model` here gives the nodes no items and only follows the tree
+structure, so it never needs the signals of nodes without children.
+"""
+
+import attr
+import PyQt5.QtCore
+
+import epyqlib.attrsmodel
+import epyqlib.treenode
+import epyqlib.utils.qt
+
+
+def signal_name(name: str) -> str:
+    """Get the name of the change signal of a pyqtified field."""
+    return f"_pyqtify_signal_{name}"
+
+
+@attr.s(slots=True, eq=False)
+class LazySignal:
+    """
+    Stand in for a bound signal of a `LazySignals`.  Connecting creates the
+    signals while emitting before then does nothing.
+    """
+
+    signals = attr.ib()
+    name = attr.ib()
+
+    def connect(self, *args, **kwargs):
+        return getattr(self.signals.create(), self.name).connect(*args, **kwargs)
+
+    def disconnect(self, *args):
+        return getattr(self.signals.create(), self.name).disconnect(*args)
+
+    def emit(self, *args):
+        signals = self.signals.created
+        if signals is not None:
+            getattr(signals, self.name).emit(*args)
+
+    def __call__(self, *args):
+        # As a slot, such as when connected to another signal
+        self.emit(*args)
+
+
+class LazySignals:
+    """
+    Stand in for a `QObject` holding signals, created once they are
+    connected or anything else of the object is used.
+    """
+
+    __slots__ = ("type", "created")
+
+    def __init__(self, type_):
+        self.type = type_
+        self.created = None
+
+    def create(self):
+        """Get the signals object, creating it if needed."""
+        if self.created is None:
+            self.created = self.type()
+
+        return self.created
+
+    def notify(self, name, value) -> None:
+        """Emit the change signal of a pyqtified field if it was created."""
+        if self.created is None:
+            return
+
+        try:
+            self.created[name].emit(value)
+        except RuntimeError:
+            pass
+
+    def __getitem__(self, name):
+        if self.created is not None:
+            return self.created[name]
+
+        if name not in self.type.names:
+            raise KeyError(name)
+
+        return LazySignal(signals=self, name=signal_name(name))
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        if self.created is None:
+            if name in getattr(self.type, "names", ()):
+                name = signal_name(name)
+
+            if isinstance(getattr(self.type, name, None), PyQt5.QtCore.pyqtSignal):
+                return LazySignal(signals=self, name=name)
+
+        return getattr(self.create(), name)
+
+
+def signal_container(cls):
+    """
+    Create the class holding the field change signals of a pyqtified class,
+    as `epyqlib.utils.qt.pyqtify()` does.
+    """
+    names = tuple(field.name for field in attr.fields(cls))
+
+    def __getitem__(self, key):
+        if key not in self.names:
+            raise KeyError(key)
+
+        return getattr(self, signal_name(key))
+
+    def __getattr__(self, name):
+        if name not in self.names:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+
+        return getattr(self, signal_name(name))
+
+    return type(
+        "SignalContainer",
+        (PyQt5.QtCore.QObject,),
+        {
+            "names": names,
+            "__getattr__": __getattr__,
+            "__getitem__": __getitem__,
+            **{
+                signal_name(name): PyQt5.QtCore.pyqtSignal("PyQt_PyObject")
+                for name in names
+            },
+        },
+    )
+
+
+def pyqtify(name=None):
+    """
+    `epyqlib.utils.qt.pyqtify()` creating the field change signals of each
+    instance once they are first connected.
+    """
+
+    def inner(cls):
+        display_name = cls.__name__ if name is None else name
+        old_init = cls.__init__
+
+        cls = epyqlib.utils.qt.pyqtify(name=name)(cls)
+        container = signal_container(cls)
+
+        def __init__(self, *args, **kwargs):
+            instance = epyqlib.utils.qt.PyQtifyInstance.fill(
+                display_name=display_name,
+                attrs_class=type(self),
+            )
+            instance.changed = LazySignals(container)
+            self.__pyqtify_instance__ = instance
+
+            try:
+                old_init(self, *args, **kwargs)
+            except TypeError as e:
+                raise TypeError(
+                    ".".join(
+                        (type(self).__module__, type(self).__qualname__, e.args[0])
+                    ),
+                ) from e
+
+        cls.__init__ = __init__
+
+        for field in attr.fields(cls):
+            if getattr(cls, f"pyqtify_{field.name}", None) is not None:
+                continue
+
+            def get(self, name=field.name):
+                return self.__pyqtify_instance__.values[name]
+
+            def set_(self, value, name=field.name):
+                instance = self.__pyqtify_instance__
+                if value != instance.values[name]:
+                    instance.values[name] = value
+                    instance.changed.notify(name, value)
+
+            setattr(cls, field.name, property(get, set_))
+
+        return cls
+
+    return inner
+
+
+class TreeNode(epyqlib.treenode.TreeNode):
+    """`epyqlib.treenode.TreeNode` creating its signals once they are used."""
+
+    def __init__(self, tx=False, parent=None, children=None):
+        self.last = None
+
+        self.tx = tx
+
+        self.tree_parent = None
+        self.set_parent(parent)
+
+        self.pyqt_signals = LazySignals(epyqlib.treenode.Signals)
+
+        if children is None:
+            children = getattr(self, "children", None)
+
+        self.children = []
+        for child in children or ():
+            self.append_child(child)
+
+
+def has_children(cls) -> bool:
+    """Whether nodes of a class can have children."""
+    return attr.has(cls) and getattr(attr.fields(cls), "children", None) is not None
+
+
+class Model(epyqlib.attrsmodel.Model):
+    """
+    An attrs model for use without views, such as by exports.
+
+    The nodes are given no items and only child additions and removals are
+    followed, keeping `uuid_to_node` up to date and reported as a layout
+    change by `model`.  Changes to fields are not reported.
+    """
+
+    def _pyqtify_connect(self, parent, child):
+        connection_id = epyqlib.attrsmodel.get_connection_id(
+            parent=parent,
+            child=child,
+        )
+        if connection_id in self.connected_signals:
+            raise epyqlib.attrsmodel.ConsistencyError(
+                "already connected: {}".format((parent.uuid, child.uuid))
+            )
+
+        connections = {}
+        self.connected_signals[connection_id] = connections
+
+        if not has_children(type(child)):
+            return
+
+        connections[child.pyqt_signals.child_added] = self.child_added
+        connections[child.pyqt_signals.child_removed] = self.deleted
+
+        for signal, slot in connections.items():
+            signal.connect(slot)
+
+    def child_added(self, child, row):
+        super().child_added(child, row)
+        self.model.layoutChanged.emit()
+
+    def deleted(self, parent, node, row):
+        self.pyqtify_disconnect(parent, node)
+        self.model.layoutChanged.emit()
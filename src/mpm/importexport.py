@@ -1,17 +1,23 @@
-import itertools
-import math
+import concurrent.futures
+import contextlib
+import multiprocessing
 import os
 import pathlib
 import subprocess
+import threading
 
 import attr
-import graham
 
+import mpm
 import mpm.cantosym
 import mpm.cantoxlsx
 import mpm.canmodel
-import mpm.importexportdialog
+import mpm.manifest
+import mpm.modelcache
+import mpm.outputs
 import mpm.parameterstobitfieldsc
+import mpm.paths
+import mpm.profiling
 import mpm.parameterstohierarchy
 import mpm.parameterstointerface
 import mpm.parameterstosil
@@ -118,16 +124,95 @@ def full_import(paths):
     return project
 
 
-def merge_can_models(dest, src):
+@attr.s
+class MergeUndo:
+    """
+    Reverts a temporary merge of BCU nodes into the project trees.
+
+    The merged nodes are only linked into the destination trees, the Qt models
+    are not told about them.  The models key their bookkeeping by UUID and the
+    BCU nodes may share UUIDs with the project nodes, such as for common
+    enumerations, which would make connecting or later removing them fail.
+    """
+
+    actions = attr.ib(factory=list)
+    appended = attr.ib(factory=list)
+
+    def append_child(self, parent, child):
+        original_parent = child.tree_parent
+
+        blocked = parent.pyqt_signals.blockSignals(True)
+        try:
+            parent.append_child(child)
+        finally:
+            parent.pyqt_signals.blockSignals(blocked)
+
+        self.appended.append(child)
+
+        def restore():
+            # TreeNode.remove_child() locates the child by equality which could
+            # pick an identical node from the project instead of the BCU node.
+            row = parent.row_of_child(child)
+            del parent.children[row]
+            child.tree_parent = original_parent
+
+        self.actions.append(restore)
+
+    def set_attribute(self, node, name, value):
+        original = getattr(node, name)
+        self.actions.append(lambda: setattr(node, name, original))
+
+        setattr(node, name, value)
+
+    def merged_nodes(self, root):
+        """Yield the merged nodes, including descendants, now under root."""
+        for child in self.appended:
+            if child.find_root() is not root:
+                continue
+
+            nodes = []
+            child.traverse(
+                call_this=lambda node, payload: payload.append(node),
+                payload=nodes,
+                internal_nodes=True,
+            )
+            yield from nodes
+
+    def undo(self):
+        for action in reversed(self.actions):
+            action()
+
+        self.actions.clear()
+        self.appended.clear()
+
+
+def _append_child(parent, child, undo):
+    if undo is None:
+        parent.append_child(child)
+    else:
+        undo.append_child(parent, child)
+
+
+def _set_attribute(node, name, value, undo):
+    if undo is None:
+        setattr(node, name, value)
+    else:
+        undo.set_attribute(node, name, value)
+
+
+def merge_can_models(dest, src, undo=None):
     """
     Merges CAN root node src into dest.
 
     Args:
         dest: Destination CAN root node
         src: Source CAN root node
+        undo: Optional `MergeUndo` recording a temporary merge
     Returns:
         None
     """
+    index = mpm.canmodel.IdentifierIndex.build(dest)
+
     for src_child in src.children:
         if src_child.name == "ParameterQuery":
 
@@ -139,27 +224,34 @@ def merge_can_models(dest, src):
                     break
 
             # Append Multiplexers from source under it
-            # Shift identifiers and add "BCU_" prefix to avoid conflicts
-            for c in src_child.children:
+            # Shift identifiers and add "BCU_" prefix to avoid conflicts,
+            # moving on to the next free identifier if the shifted one is used
+            for c in list(src_child.children):
                 if isinstance(c, mpm.canmodel.Multiplexer):
-                    c.name = "BCU_" + c.name
-                    c.identifier += 1500
-                    dest_param_query.append_child(c)
+                    identifier = index.free_multiplexer_id(
+                        message=dest_param_query,
+                        start=c.identifier + 1500,
+                    )
+                    _set_attribute(c, "name", "BCU_" + c.name, undo)
+                    _set_attribute(c, "identifier", identifier, undo)
+                    _append_child(dest_param_query, c, undo)
+                    index.add(c)
 
         # Add everything else except ParameterResponse with a "BCU_" prefix
         # One ParameterResponse definition is enough as it is a clone of ParameterQuery
         elif src_child.name != "ParameterResponse":
-            dest.append_child(src_child)
-            dest.children[-1].name = "BCU_" + dest.children[-1].name
+            _append_child(dest, src_child, undo)
+            _set_attribute(src_child, "name", "BCU_" + src_child.name, undo)
 
 
-def merge_parameter_models(dest, src):
+def merge_parameter_models(dest, src, undo=None):
     """
     Merges parameter root node src into dest.
 
     Args:
         dest: Destination parameter root node
         src: Source parameter root node
+        undo: Optional `MergeUndo` recording a temporary merge
     Returns:
         None
     """
@@ -168,60 +260,135 @@ def merge_parameter_models(dest, src):
             for dest_child in dest.children:
                 # BCU parameters are added under the Parameter group as a subgroup
                 if dest_child.name == src_child.name == "Parameters":
-                    dest_child.append_child(src_child)
-                    dest_child.children[-1].name = "BCU_" + dest_child.children[-1].name
+                    _append_child(dest_child, src_child, undo)
+                    _set_attribute(src_child, "name", "BCU_" + src_child.name, undo)
                 # Enumerations are merged under the same group
                 if dest_child.name == src_child.name == "Enumerations":
-                    for enum in src_child.children:
-                        dest_child.append_child(enum)
+                    for enum in list(src_child.children):
+                        _append_child(dest_child, enum, undo)
                     break
         else:
             # Others are added under Root as subgroups
-            dest.append_child(src_child)
-            dest.children[-1].name = "BCU_" + dest.children[-1].name
+            _append_child(dest, src_child, undo)
+            _set_attribute(src_child, "name", "BCU_" + src_child.name, undo)
+
+
+@contextlib.contextmanager
+def merged_bcu_models(project, bcu_project):
+    """
+    Temporarily merges the BCU parameter and CAN models into the project.
+
+    The merge is undone on exit, so the same loaded project can be used for
+    the remaining exports rather than loading it a second time.
+
+    Args:
+        project: PM project to merge into
+        bcu_project: BCU project to merge from, nothing is merged when None
+    """
+    if bcu_project is None:
+        yield
+        return
+
+    undo = MergeUndo()
+    models = (project.models.parameters, project.models.can)
+    # BCU nodes may share UUIDs with the project, restore the originals
+    uuid_to_nodes = [dict(model.uuid_to_node) for model in models]
+
+    try:
+        with mpm.profiling.stage(
+            "bcu merge", nodes=mpm.profiling.node_counter(*models)
+        ):
+            merge_parameter_models(
+                project.models.parameters.root,
+                bcu_project.models.parameters.root,
+                undo=undo,
+            )
+            merge_can_models(
+                project.models.can.root,
+                bcu_project.models.can.root,
+                undo=undo,
+            )
+
+            # Resolve the merged UUIDs to the BCU nodes as a permanent merge
+            # connecting them to the models would.
+            for model in models:
+                model.uuid_to_node.update(
+                    (node.uuid, node) for node in undo.merged_nodes(model.root)
+                )
+
+        # Not all merged fields are reported by the models
+        project.index.invalidate()
+
+        yield
+    finally:
+        undo.undo()
+
+        for model, uuid_to_node in zip(models, uuid_to_nodes):
+            model.uuid_to_node = uuid_to_node
+
+        project.index.invalidate()
+
+
+def no_bcu_sym_path(paths):
+    return paths.can.with_name(paths.can.stem + "_NO_BCU" + paths.can.suffix)
 
 
 def can_hierarchy_export(
     project,
     bcu_project,
     paths,
+    generator_names=None,
 ) -> None:
     """
     Exports parameter hierarchy and CAN symbol files
+
+    Args:
+        project: PM project
+        bcu_project: optional BCU project to merge into the exported files
+        paths: import/export dialog paths
+        generator_names: names from `generators` to run, all when None
     """
 
+    def selected(name):
+        return generator_names is None or name in generator_names
+
+    if not (selected("sym") or selected("hierarchy")):
+        return
+
+    nodes = mpm.profiling.node_counter(project.models.parameters, project.models.can)
+
     # If BCU project is included, add its contents to CAN and Parameter models
     if bcu_project:
 
         # Before merging BCU and TCU models, export the TCU sym file without BCU parameters
-        no_bcu_symfile = paths.can.with_name(
-            paths.can.stem + "_NO_BCU" + paths.can.suffix
-        )
-        mpm.cantosym.export(
-            path=no_bcu_symfile,
-            can_model=project.models.can,
-            parameters_model=project.models.parameters,
-        )
-
-        # Merge BCU parameters and CAN definitions into TCU models
-        merge_parameter_models(
-            project.models.parameters.root, bcu_project.models.parameters.root
-        )
-        merge_can_models(project.models.can.root, bcu_project.models.can.root)
-
-    # Use extended models with BCU parameter info when exporing sym and
+        if selected("sym"):
+            with mpm.profiling.stage("sym export without bcu", nodes=nodes):
+                mpm.cantosym.export(
+                    path=no_bcu_sym_path(paths),
+                    can_model=project.models.can,
+                    parameters_model=project.models.parameters,
+                )
+
+    # Merge BCU parameters and CAN definitions into TCU models and use the
+    # extended models with BCU parameter info when exporing sym and
     # parameter hierarchies
-    mpm.cantosym.export(
-        path=paths.can,
-        can_model=project.models.can,
-        parameters_model=project.models.parameters,
-    )
-
-    mpm.parameterstohierarchy.export(
-        path=paths.hierarchy,
-        can_model=project.models.can,
-        parameters_model=project.models.parameters,
-    )
+    with merged_bcu_models(project=project, bcu_project=bcu_project):
+        if selected("sym"):
+            with mpm.profiling.stage("sym export", nodes=nodes):
+                mpm.cantosym.export(
+                    path=paths.can,
+                    can_model=project.models.can,
+                    parameters_model=project.models.parameters,
+                )
+
+        if selected("hierarchy"):
+            with mpm.profiling.stage("hierarchy export", nodes=nodes):
+                mpm.parameterstohierarchy.export(
+                    path=paths.hierarchy,
+                    can_model=project.models.can,
+                    parameters_model=project.models.parameters,
+                    project_index=project.index,
+                )
 
 
 def interface_code_export(
@@ -229,42 +396,78 @@ def interface_code_export(
     paths,
     skip_output=False,
     include_uuid_in_item=False,
+    generator_names=None,
 ):
     """
     Exports interface code
+
+    Args:
+        project: PM project
+        paths: import/export dialog paths
+        skip_output: skip the SunSpec and static modbus interface items
+        include_uuid_in_item: include parameter UUIDs in the interface items
+        generator_names: names from `generators` to run, all when None
     """
 
-    mpm.parameterstointerface.export(
-        c_path=paths.interface_c,
-        h_path=paths.interface_c.with_suffix(".h"),
-        c_path_rejected_callback=paths.rejected_callback_c,
-        can_model=project.models.can,
-        sunspec1_model=project.models.sunspec1,
-        sunspec2_model=project.models.sunspec2,
-        staticmodbus_model=project.models.staticmodbus,
-        parameters_model=project.models.parameters,
-        skip_output=skip_output,
-        include_uuid_in_item=include_uuid_in_item,
-    )
+    def selected(name):
+        return generator_names is None or name in generator_names
+
+    models = project.models
+
+    if selected("interface"):
+        with mpm.profiling.stage(
+            "interface export",
+            nodes=mpm.profiling.node_counter(
+                models.parameters,
+                models.can,
+                models.sunspec1,
+                models.sunspec2,
+                models.staticmodbus,
+            ),
+        ):
+            mpm.parameterstointerface.export(
+                c_path=paths.interface_c,
+                h_path=paths.interface_c.with_suffix(".h"),
+                c_path_rejected_callback=paths.rejected_callback_c,
+                can_model=models.can,
+                sunspec1_model=models.sunspec1,
+                sunspec2_model=models.sunspec2,
+                staticmodbus_model=models.staticmodbus,
+                parameters_model=models.parameters,
+                skip_output=skip_output,
+                include_uuid_in_item=include_uuid_in_item,
+                project_index=project.index,
+            )
 
-    mpm.parameterstosil.export(
-        c_path=paths.sil_c,
-        h_path=paths.sil_c.with_suffix(".h"),
-        parameters_model=project.models.parameters,
-    )
+    if selected("sil"):
+        with mpm.profiling.stage(
+            "sil export",
+            nodes=mpm.profiling.node_counter(models.parameters),
+        ):
+            mpm.parameterstosil.export(
+                c_path=paths.sil_c,
+                h_path=paths.sil_c.with_suffix(".h"),
+                parameters_model=models.parameters,
+            )
 
-    mpm.anomaliestoc.export(
-        h_path=paths.anomalies_h,
-        anomaly_model=project.models.anomalies,
-        parameters_model=project.models.parameters,
-    )
+    anomaly_nodes = mpm.profiling.node_counter(models.anomalies, models.parameters)
 
-    mpm.anomaliestoxlsx.export(
-        path=paths.anomalies_spreadsheet,
-        anomaly_model=project.models.anomalies,
-        parameters_model=project.models.parameters,
-        skip_output=False,
-    )
+    if selected("anomalies_h"):
+        with mpm.profiling.stage("anomalies export", nodes=anomaly_nodes):
+            mpm.anomaliestoc.export(
+                h_path=paths.anomalies_h,
+                anomaly_model=models.anomalies,
+                parameters_model=models.parameters,
+            )
+
+    if selected("anomalies_spreadsheet"):
+        with mpm.profiling.stage("anomalies xlsx export", nodes=anomaly_nodes):
+            mpm.anomaliestoxlsx.export(
+                path=paths.anomalies_spreadsheet,
+                anomaly_model=models.anomalies,
+                parameters_model=models.parameters,
+                skip_output=False,
+            )
 
 
 def full_export(
@@ -280,92 +483,468 @@ def full_export(
     interface_code_export(project, paths, skip_output, include_uuid_in_item)
 
 
-def modification_time_or(path, alternative):
-    try:
-        return path.stat().st_mtime
-    except FileNotFoundError:
-        return alternative
+def template_path(path):
+    return path.with_suffix(f"{path.suffix}_pm")
 
 
-def get_sunspec_models(path):
-    root_schema = graham.schema(mpm.sunspecmodel.Root)
-    raw = path.read_bytes()
-    root = root_schema.loads(raw).data
+@attr.s(frozen=True)
+class Generator:
+    """
+    Describes what a single export step reads and writes so that it can be
+    skipped when none of that has changed since it last ran.
+    """
 
-    return tuple(
-        child.id for child in root.children if isinstance(child, mpm.sunspecmodel.Model)
+    name = attr.ib()
+    models = attr.ib()
+    outputs = attr.ib()
+    templates = attr.ib(default=lambda paths: ())
+    bcu_outputs = attr.ib(default=None)
+    options = attr.ib(default=())
+
+    @property
+    def uses_bcu(self):
+        return self.bcu_outputs is not None
+
+
+generators = {
+    generator.name: generator
+    for generator in (
+        Generator(
+            name="sym",
+            models=("parameters", "can"),
+            outputs=lambda paths: (paths.can,),
+            bcu_outputs=lambda paths: (no_bcu_sym_path(paths),),
+        ),
+        Generator(
+            name="hierarchy",
+            models=("parameters", "can"),
+            outputs=lambda paths: (paths.hierarchy,),
+            bcu_outputs=lambda paths: (),
+        ),
+        Generator(
+            name="interface",
+            models=("parameters", "can", "sunspec1", "sunspec2", "staticmodbus"),
+            outputs=lambda paths: (
+                paths.interface_c,
+                paths.interface_c.with_suffix(".h"),
+                paths.rejected_callback_c,
+            ),
+            templates=lambda paths: (
+                template_path(paths.interface_c),
+                template_path(paths.interface_c.with_suffix(".h")),
+                template_path(paths.rejected_callback_c),
+            ),
+            options=("skip_output", "include_uuid_in_item"),
+        ),
+        Generator(
+            name="sil",
+            models=("parameters",),
+            outputs=lambda paths: (paths.sil_c, paths.sil_c.with_suffix(".h")),
+            templates=lambda paths: (
+                template_path(paths.sil_c),
+                template_path(paths.sil_c.with_suffix(".h")),
+            ),
+        ),
+        Generator(
+            name="anomalies_h",
+            models=("anomalies", "parameters"),
+            outputs=lambda paths: (paths.anomalies_h,),
+            templates=lambda paths: (template_path(paths.anomalies_h),),
+        ),
+        Generator(
+            name="anomalies_spreadsheet",
+            models=("anomalies", "parameters"),
+            outputs=lambda paths: (paths.anomalies_spreadsheet,),
+        ),
     )
+}
 
 
-def is_stale(project, paths, skip_sunspec=False):
-    loaded_project = mpm.project.loadp(project, post_load=False)
+def export_sources(project_path, bcu_project_path=None):
+    """
+    Collect the project and model files that generators read from.
 
-    source_paths = (
-        project,
-        *(project.parent / path for path in attr.astuple(loaded_project.paths)),
+    Args:
+        project_path: path to the PM project file
+        bcu_project_path: optional path to the BCU project file
+
+    Returns:
+        dict of source names to paths, BCU sources are prefixed with "bcu "
+    """
+    sources = {}
+
+    for prefix, path in (("", project_path), ("bcu ", bcu_project_path)):
+        if path is None:
+            continue
+
+        path = pathlib.Path(path)
+        loaded_project = mpm.project.loadp(path, post_load=False)
+
+        sources[prefix + "project"] = path
+        for name, model_path in loaded_project.paths.items():
+            if model_path is not None:
+                sources[prefix + name] = path.parent / model_path
+
+    return sources
+
+
+def generator_inputs(generator, sources, paths):
+    prefixes = ["", "bcu "] if generator.uses_bcu else [""]
+
+    inputs = {}
+    for prefix in prefixes:
+        for name in ("project", *generator.models):
+            source = sources.get(prefix + name)
+            if source is not None:
+                inputs[prefix + name] = source
+
+    for template in generator.templates(paths):
+        inputs["template " + template.name] = template
+
+    return inputs
+
+
+def generator_outputs(generator, sources, paths):
+    outputs = generator.outputs(paths)
+
+    if generator.uses_bcu and "bcu project" in sources:
+        outputs = (*outputs, *generator.bcu_outputs(paths))
+
+    return outputs
+
+
+def generator_options(generator, options):
+    return {name: options[name] for name in generator.options}
+
+
+def manifest_version() -> str:
+    """
+    Identify the generating code the manifest records were made by.
+    Development builds all have the placeholder version so the commit is
+    included as well.
+    """
+    return " ".join(
+        str(part)
+        for part in (
+            mpm.__version__,
+            mpm.__sha__,
+            mpm.modelcache.distribution_version("epyqlib"),
+        )
     )
 
-    source_modification_time = max(path.stat().st_mtime for path in source_paths)
 
-    if skip_sunspec:
-        sunspec1_models = []
-        sunspec2_models = []
-    else:
-        sunspec1_models = get_sunspec_models(
-            project.parent / loaded_project.paths.sunspec1,
+def stale_generators(manifest, sources, paths, options):
+    """
+    Find the generators whose inputs, outputs or options changed since the
+    hashes were last recorded in the manifest.
+
+    Args:
+        manifest: build manifest from the previous export
+        sources: result of `export_sources()`
+        paths: import/export dialog paths
+        options: export options by name, such as `skip_output`
+
+    Returns:
+        list of generator names that need to be run
+    """
+    return [
+        name
+        for name, generator in generators.items()
+        if manifest.is_stale(
+            name=name,
+            inputs=generator_inputs(generator, sources, paths),
+            outputs=generator_outputs(generator, sources, paths),
+            options=generator_options(generator, options),
         )
-        sunspec2_models = get_sunspec_models(
-            project.parent / loaded_project.paths.sunspec2,
+    ]
+
+
+def record_generators(manifest, generator_names, sources, paths, options):
+    """
+    Record the present hashes for generators that have just been run.
+    """
+    for name in generator_names:
+        generator = generators[name]
+        manifest.record(
+            name=name,
+            inputs=generator_inputs(generator, sources, paths),
+            outputs=generator_outputs(generator, sources, paths),
+            options=generator_options(generator, options),
         )
 
-    smdx1 = tuple(
-        paths.sunspec_c / f"smdx1_{model:05}.xml" for model in sunspec1_models
-    )
-    smdx2 = tuple(
-        paths.sunspec_c / f"smdx2_{model:05}.xml" for model in sunspec2_models
-    )
 
-    sunspec1_c_h = tuple(
-        paths.sunspec_c / f"sunspec1InterfaceGen{model}.{extension}"
-        for model, extension in itertools.product(sunspec1_models, ("c", "h"))
-    )
-    sunspec2_c_h = tuple(
-        paths.sunspec_c / f"sunspec2InterfaceGen{model}.{extension}"
-        for model, extension in itertools.product(sunspec2_models, ("c", "h"))
-    )
+def run_generator(name, project, bcu_project, paths, options):
+    """
+    Run a single generator from `generators`.
 
-    sil_c_h = (paths.sil_c, paths.sil_c.with_suffix(".h"))
-
-    destination_paths = [
-        paths.can,
-        paths.hierarchy,
-        *paths.smdx,
-        paths.sunspec1_spreadsheet,
-        paths.sunspec2_spreadsheet,
-        paths.sunspec1_spreadsheet_user,
-        paths.sunspec2_spreadsheet_user,
-        *smdx1,
-        *smdx2,
-        *sunspec1_c_h,
-        *sunspec2_c_h,
-        paths.sunspec1_tables_c,
-        paths.sunspec2_tables_c,
-        *sil_c_h,
-    ]
+    Args:
+        name: generator name
+        project: loaded PM project
+        bcu_project: optional loaded BCU project
+        paths: import/export dialog paths
+        options: export options by name, such as `skip_output`
+
+    Returns:
+        paths of the output files whose contents changed
+    """
+    generator = generators[name]
+
+    with mpm.outputs.recording() as changed:
+        if generator.uses_bcu:
+            can_hierarchy_export(
+                project=project,
+                bcu_project=bcu_project,
+                paths=paths,
+                generator_names={name},
+            )
+        else:
+            interface_code_export(
+                project=project,
+                paths=paths,
+                generator_names={name},
+                **generator_options(generator, options),
+            )
+
+    return changed
+
+
+def _load_export(project_path, bcu_project_path, paths, options):
+    return {
+        "project": mpm.project.loadp(project_path, lazy=True, headless=True),
+        "bcu_project": (
+            None
+            if bcu_project_path is None
+            else mpm.project.loadp(bcu_project_path, lazy=True, headless=True)
+        ),
+        "paths": paths,
+        "options": options,
+    }
+
+
+def _load_generator_models(export, generator_names):
+    """
+    Load the models the named generators read from the lazily loaded
+    projects of an export.
+
+    Args:
+        export: projects and settings as from `_load_export()`
+        generator_names: names from `generators`
+    """
+    for name in generator_names:
+        generator = generators[name]
+
+        projects = [export["project"]]
+        if generator.uses_bcu and export["bcu_project"] is not None:
+            projects.append(export["bcu_project"])
+
+        for project in projects:
+            for model_name in generator.models:
+                project.models[model_name]
 
-    destination_modification_time = min(
-        modification_time_or(path=path, alternative=-math.inf)
-        for path in destination_paths
-    )
 
-    destination_newer_by = destination_modification_time - source_modification_time
+# Loaded projects and export settings for the generators run by a pool worker
+_worker_export = None
 
-    return destination_newer_by < 1
+
+def _initialize_worker(project_path, bcu_project_path, paths, options):
+    global _worker_export
+
+    _worker_export = _load_export(project_path, bcu_project_path, paths, options)
+
+
+def _initialize_snapshot_worker(snapshot, paths, options):
+    global _worker_export
+
+    _worker_export = {
+        "project": mpm.project.from_snapshot(snapshot, lazy=True, headless=True),
+        "bcu_project": None,
+        "paths": paths,
+        "options": options,
+    }
+
+
+def _run_in_worker(name):
+    return name, run_generator(name=name, **_worker_export)
+
+
+def run_generators(
+    project_path,
+    bcu_project_path,
+    paths,
+    generator_names,
+    options,
+    jobs=1,
+    done=None,
+):
+    """
+    Load the project and run the named generators, concurrently in a process
+    pool when more than one job is requested.
+
+    The generators only read the models, aside from the undone BCU merge, so
+    they are independent of each other.  Where available the workers are
+    forked after the project and every model the generators read are loaded,
+    so each is only loaded once.  Otherwise each worker loads the project for
+    itself and the models as its generators use them.
+
+    Args:
+        project_path: path to the PM project file
+        bcu_project_path: optional path to the BCU project file
+        paths: import/export dialog paths
+        generator_names: names from `generators` to run
+        options: export options by name, such as `skip_output`
+        jobs: maximum number of generators to run at once
+        done: optional callable passed each generator name and the paths of
+            its changed output files as it completes
+    """
+    global _worker_export
+
+    generator_names = [name for name in generators if name in generator_names]
+    if len(generator_names) == 0:
+        return
+
+    if done is None:
+        done = lambda name, changed: None
+
+    if jobs <= 1 or len(generator_names) == 1:
+        export = _load_export(project_path, bcu_project_path, paths, options)
+
+        for name in generator_names:
+            done(name, run_generator(name=name, **export))
+
+        return
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+        _initialize_worker(project_path, bcu_project_path, paths, options)
+        _load_generator_models(_worker_export, generator_names)
+        initializer = None
+        initargs = ()
+    else:
+        context = multiprocessing.get_context("spawn")
+        initializer = _initialize_worker
+        initargs = (project_path, bcu_project_path, paths, options)
+
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(jobs, len(generator_names)),
+            mp_context=context,
+            initializer=initializer,
+            initargs=initargs,
+        ) as executor:
+            futures = [
+                executor.submit(_run_in_worker, name) for name in generator_names
+            ]
+
+            for future in concurrent.futures.as_completed(futures):
+                done(*future.result())
+    finally:
+        _worker_export = None
+
+
+@attr.s
+class ExportJob:
+    """
+    Generators running in a process pool on a snapshot of a project, leaving
+    the calling thread responsive and the project free to be edited.
+
+    The callbacks are called from a pool thread, or from the thread calling
+    `cancel()` for the generators it cancels.
+    """
+
+    executor = attr.ib()
+    futures = attr.ib()
+
+    @classmethod
+    def start(
+        cls,
+        project,
+        paths,
+        options,
+        generator_names=None,
+        jobs=None,
+        done=None,
+        failed=None,
+        finished=None,
+    ) -> "ExportJob":
+        """
+        Snapshot the project and start running the generators.
+
+        Args:
+            project: loaded PM project
+            paths: import/export dialog paths
+            options: export options by name, such as `skip_output`
+            generator_names: names from `generators` to run, all when None
+            jobs: maximum number of generators to run at once, one per CPU
+                when None
+            done: optional callable passed each generator name and the paths
+                of its changed output files as it completes
+            failed: optional callable passed each generator name and the
+                exception it raised
+            finished: optional callable passed whether any generators were
+                canceled once all are complete
+
+        Returns:
+            the started job
+        """
+        if generator_names is None:
+            generator_names = generators
+        generator_names = [name for name in generators if name in generator_names]
+
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+
+        # Forking a process with a running GUI is not safe
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=max(1, min(jobs, len(generator_names))),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_snapshot_worker,
+            initargs=(mpm.project.snapshot(project), paths, options),
+        )
+        futures = [executor.submit(_run_in_worker, name) for name in generator_names]
+        job = cls(executor=executor, futures=futures)
+
+        lock = threading.Lock()
+        remaining = [len(futures)]
+
+        def completed(future):
+            if not future.cancelled():
+                exception = future.exception()
+                if exception is None:
+                    if done is not None:
+                        done(*future.result())
+                elif failed is not None:
+                    failed(generator_names[futures.index(future)], exception)
+
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+
+            if last:
+                executor.shutdown(wait=False)
+
+                if finished is not None:
+                    finished(any(future.cancelled() for future in futures))
+
+        if len(futures) == 0:
+            executor.shutdown(wait=False)
+
+            if finished is not None:
+                finished(False)
+
+        for future in futures:
+            future.add_done_callback(completed)
+
+        return job
+
+    def cancel(self) -> None:
+        """Cancel the generators not yet started, those running will complete."""
+        for future in self.futures:
+            future.cancel()
 
 
 def generate_docs(
     project: mpm.project.Project,
-    paths: mpm.importexportdialog.ImportPaths,
+    paths: mpm.paths.ImportPaths,
     pmvs_path: pathlib.Path,
     generate_formatted_output: bool,
 ) -> None:
@@ -376,18 +955,18 @@ def generate_docs(
         project: PM project (pmp)
         paths: import/export dialog paths
         pmvs_path: PMVS output path
-        generate_formatted_output: generate formatted output (takes a long time)
+        generate_formatted_output: generate formatted output for the controls manual
 
     Returns:
 
     """
-    mpm.cantoxlsx.export(
-        path=paths.spreadsheet_can,
-        can_model=project.models.can,
-        pmvs_path=pmvs_path,
-    )
-
-    if generate_formatted_output:
-        mpm.cantoxlsx.format_for_manual(
-            input_path=paths.spreadsheet_can,
+    with mpm.profiling.stage(
+        "can xlsx export",
+        nodes=mpm.profiling.node_counter(project.models.can),
+    ):
+        mpm.cantoxlsx.export(
+            path=paths.spreadsheet_can,
+            can_model=project.models.can,
+            pmvs_path=pmvs_path,
+            generate_formatted_output=generate_formatted_output,
         )
@@ -7,23 +7,16 @@ from PyQt5 import QtWidgets
 from functools import partial
 
 import mpm.importexportdialog_ui
+import mpm.paths
 
 
 all_files_filter = ("All Files", ["*"])
 
-
-def path_or_none(s):
-    if isinstance(s, pathlib.Path):
-        return s
-
-    if s is None or len(s) == 0:
-        return None
-
-    return pathlib.Path(s)
-
-
-def paths_or_none(x):
-    return [pathlib.Path(path) for path in x if len(x) > 0]
+# The paths are kept free of Qt in mpm.paths for use without the GUI
+path_or_none = mpm.paths.path_or_none
+paths_or_none = mpm.paths.paths_or_none
+ImportPaths = mpm.paths.ImportPaths
+paths_from_directory = mpm.paths.paths_from_directory
 
 
 def import_dialog():
@@ -88,66 +81,6 @@ def export_dialog():
     return dialog
 
 
-@attr.s
-class ImportPaths:
-    can = attr.ib(converter=path_or_none)
-    hierarchy = attr.ib(converter=path_or_none)
-    tables_c = attr.ib(converter=path_or_none)
-    bitfields_c = attr.ib(converter=path_or_none)
-    staticmodbus_c = attr.ib(converter=path_or_none)
-    sunspec1_interface_gen_c = attr.ib(converter=path_or_none)
-    sunspec2_interface_gen_c = attr.ib(converter=path_or_none)
-    sunspec1_tables_c = attr.ib(converter=path_or_none)
-    sunspec2_tables_c = attr.ib(converter=path_or_none)
-    sunspec1_spreadsheet = attr.ib(converter=path_or_none)
-    sunspec2_spreadsheet = attr.ib(converter=path_or_none)
-    sunspec1_spreadsheet_user = attr.ib(converter=path_or_none)
-    sunspec2_spreadsheet_user = attr.ib(converter=path_or_none)
-    staticmodbus_spreadsheet = attr.ib(converter=path_or_none)
-    smdx = attr.ib(converter=paths_or_none)
-    sunspec_c = attr.ib(converter=path_or_none)
-    sil_c = attr.ib(converter=path_or_none)
-    interface_c = attr.ib(converter=path_or_none)
-    rejected_callback_c = attr.ib(converter=path_or_none)
-    # No UI handling for spreadsheet_can since it is not part of normal import/export
-    spreadsheet_can = attr.ib(converter=path_or_none)
-    anomalies_h = attr.ib(converter=path_or_none)
-    anomalies_spreadsheet = attr.ib(converter=path_or_none)
-
-
-def paths_from_directory(directory):
-    path = pathlib.Path(directory)
-    interface_path = path / "interface"
-    embedded_path = path / "embedded-library"
-    sunspec_path = embedded_path / "system" / "sunspec"
-    devices_path = interface_path / "devices"
-
-    return ImportPaths(
-        can=devices_path / "EPC_ID247.sym",
-        hierarchy=devices_path / "EPC_ID247.hierarchy.json",
-        tables_c=interface_path / "canInterfaceGenTables.c",
-        bitfields_c=interface_path / "interfaceBitfieldsGen.c",
-        staticmodbus_c=interface_path / "staticmodbusInterfaceGen.c",
-        sunspec1_interface_gen_c=sunspec_path / "sunspec1InterfaceGen.c",
-        sunspec2_interface_gen_c=sunspec_path / "sunspec2InterfaceGen.c",
-        sunspec1_tables_c=sunspec_path / "sunspec1InterfaceGenTables.c",
-        sunspec2_tables_c=sunspec_path / "sunspec2InterfaceGenTables.c",
-        sunspec1_spreadsheet=embedded_path / "MODBUS_SunSpec1-EPC.xlsx",
-        sunspec2_spreadsheet=embedded_path / "MODBUS_SunSpec2-EPC.xlsx",
-        sunspec1_spreadsheet_user=embedded_path / "EPCSunspec1.xlsx",
-        sunspec2_spreadsheet_user=embedded_path / "EPCSunspec2.xlsx",
-        staticmodbus_spreadsheet=embedded_path / "MODBUS-EPC.xlsx",
-        smdx=sorted(sunspec_path.glob("smdx_*.xml")),
-        sunspec_c=sunspec_path,
-        sil_c=path / "sil" / "libEpcControlInterfaceGen.c",
-        interface_c=interface_path / "interfaceGen.c",
-        rejected_callback_c=interface_path / "rejectedCallbackHandler.c",
-        spreadsheet_can=interface_path / "EPC-CAN.xlsx",
-        anomalies_h=interface_path / "anomalies_generated.h",
-        anomalies_spreadsheet=interface_path / "anomalies.xlsx",
-    )
-
-
 @attr.s
 class Dialog(QtWidgets.QDialog):
     ui = attr.ib(factory=mpm.importexportdialog_ui.Ui_Dialog)
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'importexportdialog.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.9
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(870, 646)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(Dialog.sizePolicy().hasHeightForWidth())
+        Dialog.setSizePolicy(sizePolicy)
+        self.gridLayout = QtWidgets.QGridLayout(Dialog)
+        self.gridLayout.setObjectName("gridLayout")
+        self.label = QtWidgets.QLabel(Dialog)
+        self.label.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.label.setObjectName("label")
+        self.gridLayout.addWidget(self.label, 0, 0, 1, 1)
+        self.can = QtWidgets.QLineEdit(Dialog)
+        self.can.setObjectName("can")
+        self.gridLayout.addWidget(self.can, 0, 1, 1, 1)
+        self.pick_can = QtWidgets.QPushButton(Dialog)
+        self.pick_can.setObjectName("pick_can")
+        self.gridLayout.addWidget(self.pick_can, 0, 2, 1, 1)
+        self.label_2 = QtWidgets.QLabel(Dialog)
+        self.label_2.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.label_2.setObjectName("label_2")
+        self.gridLayout.addWidget(self.label_2, 1, 0, 1, 1)
+        self.hierarchy = QtWidgets.QLineEdit(Dialog)
+        self.hierarchy.setObjectName("hierarchy")
+        self.gridLayout.addWidget(self.hierarchy, 1, 1, 1, 1)
+        self.pick_hierarchy = QtWidgets.QPushButton(Dialog)
+        self.pick_hierarchy.setObjectName("pick_hierarchy")
+        self.gridLayout.addWidget(self.pick_hierarchy, 1, 2, 1, 1)
+        self.tables_c_label = QtWidgets.QLabel(Dialog)
+        self.tables_c_label.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.tables_c_label.setObjectName("tables_c_label")
+        self.gridLayout.addWidget(self.tables_c_label, 2, 0, 1, 1)
+        self.tables_c = QtWidgets.QLineEdit(Dialog)
+        self.tables_c.setObjectName("tables_c")
+        self.gridLayout.addWidget(self.tables_c, 2, 1, 1, 1)
+        self.pick_tables_c = QtWidgets.QPushButton(Dialog)
+        self.pick_tables_c.setObjectName("pick_tables_c")
+        self.gridLayout.addWidget(self.pick_tables_c, 2, 2, 1, 1)
+        self.staticmodbus_c_label = QtWidgets.QLabel(Dialog)
+        self.staticmodbus_c_label.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.staticmodbus_c_label.setObjectName("staticmodbus_c_label")
+        self.gridLayout.addWidget(self.staticmodbus_c_label, 3, 0, 1, 1)
+        self.staticmodbus_c = QtWidgets.QLineEdit(Dialog)
+        self.staticmodbus_c.setObjectName("staticmodbus_c")
+        self.gridLayout.addWidget(self.staticmodbus_c, 3, 1, 1, 1)
+        self.pick_staticmodbus_c = QtWidgets.QPushButton(Dialog)
+        self.pick_staticmodbus_c.setObjectName("pick_staticmodbus_c")
+        self.gridLayout.addWidget(self.pick_staticmodbus_c, 3, 2, 1, 1)
+        self.bitfields_c_label = QtWidgets.QLabel(Dialog)
+        self.bitfields_c_label.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.bitfields_c_label.setObjectName("bitfields_c_label")
+        self.gridLayout.addWidget(self.bitfields_c_label, 4, 0, 1, 1)
+        self.bitfields_c = QtWidgets.QLineEdit(Dialog)
+        self.bitfields_c.setObjectName("bitfields_c")
+        self.gridLayout.addWidget(self.bitfields_c, 4, 1, 1, 1)
+        self.pick_bitfields_c = QtWidgets.QPushButton(Dialog)
+        self.pick_bitfields_c.setObjectName("pick_bitfields_c")
+        self.gridLayout.addWidget(self.pick_bitfields_c, 4, 2, 1, 1)
+        self.sunspec1_interface_gen_c_label = QtWidgets.QLabel(Dialog)
+        self.sunspec1_interface_gen_c_label.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.sunspec1_interface_gen_c_label.setObjectName("sunspec1_interface_gen_c_label")
+        self.gridLayout.addWidget(self.sunspec1_interface_gen_c_label, 5, 0, 1, 1)
+        self.sunspec1_interface_gen_c = QtWidgets.QLineEdit(Dialog)
+        self.sunspec1_interface_gen_c.setObjectName("sunspec1_interface_gen_c")
+        self.gridLayout.addWidget(self.sunspec1_interface_gen_c, 5, 1, 1, 1)
+        self.pick_sunspec1_interface_gen_c = QtWidgets.QPushButton(Dialog)
+        self.pick_sunspec1_interface_gen_c.setObjectName("pick_sunspec1_interface_gen_c")
+        self.gridLayout.addWidget(self.pick_sunspec1_interface_gen_c, 5, 2, 1, 1)
+        self.sunspec2_interface_gen_c_label = QtWidgets.QLabel(Dialog)
+        self.sunspec2_interface_gen_c_label.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.sunspec2_interface_gen_c_label.setObjectName("sunspec2_interface_gen_c_label")
+        self.gridLayout.addWidget(self.sunspec2_interface_gen_c_label, 6, 0, 1, 1)
+        self.sunspec2_interface_gen_c = QtWidgets.QLineEdit(Dialog)
+        self.sunspec2_interface_gen_c.setObjectName("sunspec2_interface_gen_c")
+        self.gridLayout.addWidget(self.sunspec2_interface_gen_c, 6, 1, 1, 1)
+        self.pick_sunspec2_interface_gen_c = QtWidgets.QPushButton(Dialog)
+        self.pick_sunspec2_interface_gen_c.setObjectName("pick_sunspec2_interface_gen_c")
+        self.gridLayout.addWidget(self.pick_sunspec2_interface_gen_c, 6, 2, 1, 1)
+        self.sunspec1_tables_c_label = QtWidgets.QLabel(Dialog)
+        self.sunspec1_tables_c_label.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.sunspec1_tables_c_label.setObjectName("sunspec1_tables_c_label")
+        self.gridLayout.addWidget(self.sunspec1_tables_c_label, 7, 0, 1, 1)
+        self.sunspec1_tables_c = QtWidgets.QLineEdit(Dialog)
+        self.sunspec1_tables_c.setObjectName("sunspec1_tables_c")
+        self.gridLayout.addWidget(self.sunspec1_tables_c, 7, 1, 1, 1)
+        self.pick_sunspec1_tables_c = QtWidgets.QPushButton(Dialog)
+        self.pick_sunspec1_tables_c.setObjectName("pick_sunspec1_tables_c")
+        self.gridLayout.addWidget(self.pick_sunspec1_tables_c, 7, 2, 1, 1)
+        self.sunspec2_tables_c_label = QtWidgets.QLabel(Dialog)
+        self.sunspec2_tables_c_label.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.sunspec2_tables_c_label.setObjectName("sunspec2_tables_c_label")
+        self.gridLayout.addWidget(self.sunspec2_tables_c_label, 8, 0, 1, 1)
+        self.sunspec2_tables_c = QtWidgets.QLineEdit(Dialog)
+        self.sunspec2_tables_c.setObjectName("sunspec2_tables_c")
+        self.gridLayout.addWidget(self.sunspec2_tables_c, 8, 1, 1, 1)
+        self.pick_sunspec2_tables_c = QtWidgets.QPushButton(Dialog)
+        self.pick_sunspec2_tables_c.setObjectName("pick_sunspec2_tables_c")
+        self.gridLayout.addWidget(self.pick_sunspec2_tables_c, 8, 2, 1, 1)
+        self.sunspec1_spreadsheet_label = QtWidgets.QLabel(Dialog)
+        self.sunspec1_spreadsheet_label.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.sunspec1_spreadsheet_label.setObjectName("sunspec1_spreadsheet_label")
+        self.gridLayout.addWidget(self.sunspec1_spreadsheet_label, 9, 0, 1, 1)
+        self.sunspec1_spreadsheet = QtWidgets.QLineEdit(Dialog)
+        self.sunspec1_spreadsheet.setObjectName("sunspec1_spreadsheet")
+        self.gridLayout.addWidget(self.sunspec1_spreadsheet, 9, 1, 1, 1)
+        self.pick_sunspec1_spreadsheet = QtWidgets.QPushButton(Dialog)
+        self.pick_sunspec1_spreadsheet.setObjectName("pick_sunspec1_spreadsheet")
+        self.gridLayout.addWidget(self.pick_sunspec1_spreadsheet, 9, 2, 1, 1)
+        self.sunspec2_spreadsheet_label = QtWidgets.QLabel(Dialog)
+        self.sunspec2_spreadsheet_label.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.sunspec2_spreadsheet_label.setObjectName("sunspec2_spreadsheet_label")
+        self.gridLayout.addWidget(self.sunspec2_spreadsheet_label, 10, 0, 1, 1)
+        self.sunspec2_spreadsheet = QtWidgets.QLineEdit(Dialog)
+        self.sunspec2_spreadsheet.setObjectName("sunspec2_spreadsheet")
+        self.gridLayout.addWidget(self.sunspec2_spreadsheet, 10, 1, 1, 1)
+        self.pick_sunspec2_spreadsheet = QtWidgets.QPushButton(Dialog)
+        self.pick_sunspec2_spreadsheet.setObjectName("pick_sunspec2_spreadsheet")
+        self.gridLayout.addWidget(self.pick_sunspec2_spreadsheet, 10, 2, 1, 1)
+        self.sunspec1_spreadsheet_user_label = QtWidgets.QLabel(Dialog)
+        self.sunspec1_spreadsheet_user_label.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.sunspec1_spreadsheet_user_label.setObjectName("sunspec1_spreadsheet_user_label")
+        self.gridLayout.addWidget(self.sunspec1_spreadsheet_user_label, 11, 0, 1, 1)
+        self.sunspec1_spreadsheet_user = QtWidgets.QLineEdit(Dialog)
+        self.sunspec1_spreadsheet_user.setText("")
+        self.sunspec1_spreadsheet_user.setObjectName("sunspec1_spreadsheet_user")
+        self.gridLayout.addWidget(self.sunspec1_spreadsheet_user, 11, 1, 1, 1)
+        self.pick_sunspec1_spreadsheet_user = QtWidgets.QPushButton(Dialog)
+        self.pick_sunspec1_spreadsheet_user.setObjectName("pick_sunspec1_spreadsheet_user")
+        self.gridLayout.addWidget(self.pick_sunspec1_spreadsheet_user, 11, 2, 1, 1)
+        self.sunspec2_spreadsheet_user_label = QtWidgets.QLabel(Dialog)
+        self.sunspec2_spreadsheet_user_label.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.sunspec2_spreadsheet_user_label.setObjectName("sunspec2_spreadsheet_user_label")
+        self.gridLayout.addWidget(self.sunspec2_spreadsheet_user_label, 12, 0, 1, 1)
+        self.sunspec2_spreadsheet_user = QtWidgets.QLineEdit(Dialog)
+        self.sunspec2_spreadsheet_user.setText("")
+        self.sunspec2_spreadsheet_user.setObjectName("sunspec2_spreadsheet_user")
+        self.gridLayout.addWidget(self.sunspec2_spreadsheet_user, 12, 1, 1, 1)
+        self.pick_sunspec2_spreadsheet_user = QtWidgets.QPushButton(Dialog)
+        self.pick_sunspec2_spreadsheet_user.setObjectName("pick_sunspec2_spreadsheet_user")
+        self.gridLayout.addWidget(self.pick_sunspec2_spreadsheet_user, 12, 2, 1, 1)
+        self.static_modbus_spreadsheet_label = QtWidgets.QLabel(Dialog)
+        self.static_modbus_spreadsheet_label.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.static_modbus_spreadsheet_label.setObjectName("static_modbus_spreadsheet_label")
+        self.gridLayout.addWidget(self.static_modbus_spreadsheet_label, 13, 0, 1, 1)
+        self.staticmodbus_spreadsheet = QtWidgets.QLineEdit(Dialog)
+        self.staticmodbus_spreadsheet.setObjectName("staticmodbus_spreadsheet")
+        self.gridLayout.addWidget(self.staticmodbus_spreadsheet, 13, 1, 1, 1)
+        self.pick_staticmodbus_spreadsheet = QtWidgets.QPushButton(Dialog)
+        self.pick_staticmodbus_spreadsheet.setObjectName("pick_staticmodbus_spreadsheet")
+        self.gridLayout.addWidget(self.pick_staticmodbus_spreadsheet, 13, 2, 1, 1)
+        self.sunspec_c_label = QtWidgets.QLabel(Dialog)
+        self.sunspec_c_label.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.sunspec_c_label.setObjectName("sunspec_c_label")
+        self.gridLayout.addWidget(self.sunspec_c_label, 14, 0, 1, 1)
+        self.sunspec_c = QtWidgets.QLineEdit(Dialog)
+        self.sunspec_c.setObjectName("sunspec_c")
+        self.gridLayout.addWidget(self.sunspec_c, 14, 1, 1, 1)
+        self.pick_sunspec_c = QtWidgets.QPushButton(Dialog)
+        self.pick_sunspec_c.setObjectName("pick_sunspec_c")
+        self.gridLayout.addWidget(self.pick_sunspec_c, 14, 2, 1, 1)
+        self.sil_c_label = QtWidgets.QLabel(Dialog)
+        self.sil_c_label.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.sil_c_label.setObjectName("sil_c_label")
+        self.gridLayout.addWidget(self.sil_c_label, 15, 0, 1, 1)
+        self.sil_c = QtWidgets.QLineEdit(Dialog)
+        self.sil_c.setObjectName("sil_c")
+        self.gridLayout.addWidget(self.sil_c, 15, 1, 1, 1)
+        self.pick_sil_c = QtWidgets.QPushButton(Dialog)
+        self.pick_sil_c.setObjectName("pick_sil_c")
+        self.gridLayout.addWidget(self.pick_sil_c, 15, 2, 1, 1)
+        self.interface_c_label = QtWidgets.QLabel(Dialog)
+        self.interface_c_label.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.interface_c_label.setObjectName("interface_c_label")
+        self.gridLayout.addWidget(self.interface_c_label, 16, 0, 1, 1)
+        self.interface_c = QtWidgets.QLineEdit(Dialog)
+        self.interface_c.setObjectName("interface_c")
+        self.gridLayout.addWidget(self.interface_c, 16, 1, 1, 1)
+        self.pick_interface_c = QtWidgets.QPushButton(Dialog)
+        self.pick_interface_c.setObjectName("pick_interface_c")
+        self.gridLayout.addWidget(self.pick_interface_c, 16, 2, 1, 1)
+        self.rejected_callback_c_label = QtWidgets.QLabel(Dialog)
+        self.rejected_callback_c_label.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.rejected_callback_c_label.setObjectName("rejected_callback_c_label")
+        self.gridLayout.addWidget(self.rejected_callback_c_label, 17, 0, 1, 1)
+        self.rejected_callback_c = QtWidgets.QLineEdit(Dialog)
+        self.rejected_callback_c.setObjectName("rejected_callback_c")
+        self.gridLayout.addWidget(self.rejected_callback_c, 17, 1, 1, 1)
+        self.pick_rejected_callback_c = QtWidgets.QPushButton(Dialog)
+        self.pick_rejected_callback_c.setObjectName("pick_rejected_callback_c")
+        self.gridLayout.addWidget(self.pick_rejected_callback_c, 17, 2, 1, 1)
+        self.smdx_label = QtWidgets.QLabel(Dialog)
+        self.smdx_label.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.smdx_label.setObjectName("smdx_label")
+        self.gridLayout.addWidget(self.smdx_label, 18, 0, 1, 1)
+        self.smdx_list = QtWidgets.QListWidget(Dialog)
+        self.smdx_list.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.smdx_list.setObjectName("smdx_list")
+        self.gridLayout.addWidget(self.smdx_list, 18, 1, 2, 1)
+        self.pick_smdx = QtWidgets.QPushButton(Dialog)
+        self.pick_smdx.setObjectName("pick_smdx")
+        self.gridLayout.addWidget(self.pick_smdx, 18, 2, 1, 1)
+        self.remove_smdx = QtWidgets.QPushButton(Dialog)
+        self.remove_smdx.setObjectName("remove_smdx")
+        self.gridLayout.addWidget(self.remove_smdx, 19, 2, 1, 1)
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.from_directory = QtWidgets.QPushButton(Dialog)
+        self.from_directory.setObjectName("from_directory")
+        self.horizontalLayout.addWidget(self.from_directory)
+        self.buttons = QtWidgets.QDialogButtonBox(Dialog)
+        self.buttons.setStandardButtons(QtWidgets.QDialogButtonBox.Cancel|QtWidgets.QDialogButtonBox.Ok)
+        self.buttons.setObjectName("buttons")
+        self.horizontalLayout.addWidget(self.buttons)
+        self.gridLayout.addLayout(self.horizontalLayout, 20, 0, 1, 2)
+
+        self.retranslateUi(Dialog)
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def retranslateUi(self, Dialog):
+        _translate = QtCore.QCoreApplication.translate
+        Dialog.setWindowTitle(_translate("Dialog", "Dialog"))
+        self.label.setText(_translate("Dialog", "CAN:"))
+        self.pick_can.setText(_translate("Dialog", "..."))
+        self.label_2.setText(_translate("Dialog", "Hierarchy:"))
+        self.pick_hierarchy.setText(_translate("Dialog", "..."))
+        self.tables_c_label.setText(_translate("Dialog", "Tables C:"))
+        self.pick_tables_c.setText(_translate("Dialog", "..."))
+        self.staticmodbus_c_label.setText(_translate("Dialog", "Static Modbus C:"))
+        self.pick_staticmodbus_c.setText(_translate("Dialog", "..."))
+        self.bitfields_c_label.setText(_translate("Dialog", "Bitfields C:"))
+        self.pick_bitfields_c.setText(_translate("Dialog", "..."))
+        self.sunspec1_interface_gen_c_label.setText(_translate("Dialog", "SunSpec1 Interface Gen C:"))
+        self.pick_sunspec1_interface_gen_c.setText(_translate("Dialog", "..."))
+        self.sunspec2_interface_gen_c_label.setText(_translate("Dialog", "SunSpec2 Interface Gen C:"))
+        self.pick_sunspec2_interface_gen_c.setText(_translate("Dialog", "..."))
+        self.sunspec1_tables_c_label.setText(_translate("Dialog", "SunSpec1 Tables C:"))
+        self.pick_sunspec1_tables_c.setText(_translate("Dialog", "..."))
+        self.sunspec2_tables_c_label.setText(_translate("Dialog", "SunSpec2 Tables C:"))
+        self.pick_sunspec2_tables_c.setText(_translate("Dialog", "..."))
+        self.sunspec1_spreadsheet_label.setText(_translate("Dialog", "SunSpec1 Spreadsheet:"))
+        self.pick_sunspec1_spreadsheet.setText(_translate("Dialog", "..."))
+        self.sunspec2_spreadsheet_label.setText(_translate("Dialog", "SunSpec2 Spreadsheet:"))
+        self.pick_sunspec2_spreadsheet.setText(_translate("Dialog", "..."))
+        self.sunspec1_spreadsheet_user_label.setText(_translate("Dialog", "SunSpec1 User Spreadsheet:"))
+        self.pick_sunspec1_spreadsheet_user.setText(_translate("Dialog", "..."))
+        self.sunspec2_spreadsheet_user_label.setText(_translate("Dialog", "SunSpec2 User Spreadsheet:"))
+        self.pick_sunspec2_spreadsheet_user.setText(_translate("Dialog", "..."))
+        self.static_modbus_spreadsheet_label.setText(_translate("Dialog", "Static Modbus Spreadsheet:"))
+        self.pick_staticmodbus_spreadsheet.setText(_translate("Dialog", "..."))
+        self.sunspec_c_label.setText(_translate("Dialog", "SunSpec C:"))
+        self.pick_sunspec_c.setText(_translate("Dialog", "..."))
+        self.sil_c_label.setText(_translate("Dialog", "SIL C:"))
+        self.pick_sil_c.setText(_translate("Dialog", "..."))
+        self.interface_c_label.setText(_translate("Dialog", "Interface C:"))
+        self.pick_interface_c.setText(_translate("Dialog", "..."))
+        self.rejected_callback_c_label.setText(_translate("Dialog", "Rejected Callback C:"))
+        self.pick_rejected_callback_c.setText(_translate("Dialog", "..."))
+        self.smdx_label.setText(_translate("Dialog", "SunSpec SMDX:"))
+        self.pick_smdx.setText(_translate("Dialog", "..."))
+        self.remove_smdx.setText(_translate("Dialog", "Remove"))
+        self.from_directory.setText(_translate("Dialog", "From directory..."))
@@ -1,10 +1,12 @@
 import collections
+import concurrent.futures
 import contextlib
 import functools
 import io
 import logging
 import os
 import pathlib
+import time
 
 import attr
 import pycparser.c_ast
@@ -20,6 +22,7 @@ import epyqlib.utils.qt
 
 import mpm.canmodel
 import mpm.cantosym
+import mpm.checker
 import mpm.importexport
 import mpm.importexportdialog
 import mpm.parameterstoc
@@ -51,6 +54,20 @@ class ModelView:
     selection = attr.ib(default=None)
 
 
+class ExportSignals(QtCore.QObject):
+    """Carries export job progress from the pool threads to the GUI thread."""
+
+    done = QtCore.pyqtSignal(str, int)
+    failed = QtCore.pyqtSignal(str, str)
+    finished = QtCore.pyqtSignal(bool)
+
+
+class SaveSignals(QtCore.QObject):
+    """Reports project file write failures from the writer thread."""
+
+    failed = QtCore.pyqtSignal(str)
+
+
 class Window:
     def __init__(self, title, icon_path):
         logging.debug("Working directory: {}".format(os.getcwd()))
@@ -124,6 +141,14 @@ class Window:
 
         self.view_models = {}
 
+        self.export_job = None
+        self.export_signals = None
+
+        # A single thread so that consecutive saves are written in order
+        self.save_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.save_signals = SaveSignals()
+        self.save_signals.failed.connect(self.save_failed)
+
         self.uuid_notifiers = {
             "can": mpm.canmodel.ReferencedUuidNotifier(),
             "staticmodbus": mpm.staticmodbusmodel.ReferencedUuidNotifier(),
@@ -143,6 +168,13 @@ class Window:
         self.value_set = None
         self.check_result = None
 
+        self.checker = None
+        self.pending_checks = []
+        # Checks run a slice at a time between GUI events
+        self.check_timer = QtCore.QTimer()
+        self.check_timer.setInterval(0)
+        self.check_timer.timeout.connect(self.check_some)
+
         self.set_title()
 
         search_boxes = (
@@ -324,25 +356,86 @@ class Window:
         return self._full_export(first_time=True)
 
     def _full_export(self, first_time):
+        if self.export_job is not None:
+            QtWidgets.QMessageBox.information(
+                self.main_window,
+                "Export Running",
+                "An export is already running.",
+            )
+            return
+
         dialog = mpm.importexportdialog.export_dialog()
         if dialog.exec() != QtWidgets.QDialog.DialogCode.Accepted:
             return
 
         paths = dialog.paths_result
+        generator_names = list(mpm.importexport.generators)
+
+        progress = QtWidgets.QProgressDialog(
+            "Exporting...",
+            "Cancel",
+            0,
+            len(generator_names),
+            self.main_window,
+        )
+        progress.setWindowTitle("Export")
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+        progress.setMinimumDuration(0)
+        progress.setValue(0)
+
+        failures = []
+
+        def done(name, changed):
+            progress.setValue(progress.value() + 1)
+            progress.setLabelText(f"{name} export done, {changed} files changed")
 
-        mpm.importexport.full_export(
+        def failed(name, message):
+            progress.setValue(progress.value() + 1)
+            failures.append(f"{name}: {message}")
+
+        def finished(canceled):
+            self.export_job = None
+            self.export_signals = None
+            progress.close()
+
+            if len(failures) > 0:
+                QtWidgets.QMessageBox.warning(
+                    self.main_window,
+                    "Export Failed",
+                    "\n".join(["Export failed:", *failures]),
+                )
+            elif canceled:
+                QtWidgets.QMessageBox.information(
+                    self.main_window,
+                    "Export Canceled",
+                    "Export canceled.",
+                )
+            else:
+                QtWidgets.QMessageBox.information(
+                    self.main_window,
+                    "Export Complete",
+                    "Export complete.",
+                )
+
+        # Hold a reference while the job runs so the signals stay connected
+        self.export_signals = ExportSignals()
+        self.export_signals.done.connect(done)
+        self.export_signals.failed.connect(failed)
+        self.export_signals.finished.connect(finished)
+
+        signals = self.export_signals
+        self.export_job = mpm.importexport.ExportJob.start(
             project=self.project,
             paths=paths,
-            target_directory=dialog.directory,
-            first_time=first_time,
-            include_uuid_in_item=True,
+            options={"skip_output": False, "include_uuid_in_item": True},
+            generator_names=generator_names,
+            done=lambda name, changed: signals.done.emit(name, len(changed)),
+            failed=lambda name, exception: signals.failed.emit(name, str(exception)),
+            finished=signals.finished.emit,
         )
 
-        QtWidgets.QMessageBox.information(
-            self.main_window,
-            "Export Complete",
-            "Export complete.",
-        )
+        progress.canceled.connect(self.export_job.cancel)
 
     def open_project(self, filename=None, project=None):
         if project is not None:
@@ -437,7 +530,7 @@ class Window:
         return
 
     def save_project(self):
-        self.project.save(parent=self.main_window)
+        self._save(project=self.project)
 
     def save_as_project(self):
         project = attr.evolve(self.project)
@@ -446,9 +539,26 @@ class Window:
         #       original project is referencing
         project.paths.set_all(None)
 
-        project.save(parent=self.main_window)
+        self._save(project=project)
         self.project = project
 
+    def _save(self, project):
+        future = project.save(parent=self.main_window, executor=self.save_executor)
+
+        def done(future):
+            exception = future.exception()
+            if exception is not None:
+                self.save_signals.failed.emit(str(exception))
+
+        future.add_done_callback(done)
+
+    def save_failed(self, message):
+        QtWidgets.QMessageBox.warning(
+            self.main_window,
+            "Save Failed",
+            f"Failed to write the project files:\n{message}",
+        )
+
     def new_value_set(self):
         parameters = self.view_models.get("parameters")
         if parameters is not None:
@@ -557,42 +667,39 @@ class Window:
         self.value_set = value_set
 
     def check(self):
-        root = epyqlib.checkresultmodel.Root()
-
-        for name, model in self.project.models.items():
-            node = epyqlib.checkresultmodel.Node.build(
-                name=name,
-                node=model.root,
-            )
-            model.root.check_and_append(
-                parent=node,
-                models=self.project.models,
+        if self.checker is None or self.checker.project is not self.project:
+            self.checker = mpm.checker.Checker(project=self.project)
+
+            models = self.project.models
+            self.set_active_check_result(
+                epyqlib.attrsmodel.Model(
+                    root=self.checker.root,
+                    columns=epyqlib.checkresultmodel.columns,
+                    drop_sources=[
+                        models.parameters,
+                        models.can,
+                        models.sunspec1,
+                        models.sunspec2,
+                    ],
+                )
             )
-            root.append_child(node)
 
-        # self.check_view = QtWidgets.QTreeView()
-        # self.check_model = epyqlib.attrsmodel.Model(
-        #     root=root,
-        #     columns=epyqlib.checkresultmodel.columns,
-        # )
+        self.pending_checks = self.checker.pending()
+        self.check_timer.start()
 
-        # self.check_view.setModel(self.check_model.model)
+    def check_some(self, seconds=0.05):
+        """
+        Check nodes for a slice of time, their results are placed in the
+        shown results as they are checked.
+        """
+        end = time.monotonic() + seconds
 
-        # self.check_view.show()
+        while len(self.pending_checks) > 0 and time.monotonic() < end:
+            name, node = self.pending_checks.pop(0)
+            self.checker.check(name=name, node=node)
 
-        drop_source_model_names = [
-            "parameters",
-            "can",
-            "sunspec",
-        ]
-
-        model = epyqlib.attrsmodel.Model(
-            root=root,
-            columns=epyqlib.checkresultmodel.columns,
-            drop_sources=[
-                self.view_models[name].model for name in drop_source_model_names
-            ],
-        )
+        if len(self.pending_checks) == 0:
+            self.check_timer.stop()
 
     def set_active_check_result(self, check_result):
         self.check_result = check_result
@@ -700,6 +807,9 @@ class Window:
                     QApplication.clipboard().setText(str(node.uuid))
             elif action is check_duplicates:
                 duplicates = node.check_duplicate_ids()
+                duplicates.extend(
+                    self.project.index.can_identifiers().conflicts_with(node)
+                )
                 if len(duplicates) == 0:
                     message = "No duplicate IDs found."
                 else:
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'mainwindow.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.9
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(1200, 900)
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.gridLayout_5 = QtWidgets.QGridLayout(self.centralwidget)
+        self.gridLayout_5.setObjectName("gridLayout_5")
+        self.splitter = QtWidgets.QSplitter(self.centralwidget)
+        self.splitter.setOrientation(QtCore.Qt.Horizontal)
+        self.splitter.setObjectName("splitter")
+        self.layoutWidget = QtWidgets.QWidget(self.splitter)
+        self.layoutWidget.setObjectName("layoutWidget")
+        self.gridLayout = QtWidgets.QGridLayout(self.layoutWidget)
+        self.gridLayout.setContentsMargins(0, 0, 0, 0)
+        self.gridLayout.setObjectName("gridLayout")
+        self.parameter_view = QtWidgets.QTreeView(self.layoutWidget)
+        self.parameter_view.setAlternatingRowColors(True)
+        self.parameter_view.setObjectName("parameter_view")
+        self.gridLayout.addWidget(self.parameter_view, 2, 0, 1, 1)
+        self.parameter_search_box = SearchBox(self.layoutWidget)
+        self.parameter_search_box.setObjectName("parameter_search_box")
+        self.gridLayout.addWidget(self.parameter_search_box, 0, 0, 1, 1)
+        self.tabWidget = QtWidgets.QTabWidget(self.splitter)
+        self.tabWidget.setAcceptDrops(True)
+        self.tabWidget.setObjectName("tabWidget")
+        self.tab_2 = QtWidgets.QWidget()
+        self.tab_2.setObjectName("tab_2")
+        self.horizontalLayout_2 = QtWidgets.QHBoxLayout(self.tab_2)
+        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
+        self.gridLayout_2 = QtWidgets.QGridLayout()
+        self.gridLayout_2.setObjectName("gridLayout_2")
+        self.can_search_box = SearchBox(self.tab_2)
+        self.can_search_box.setObjectName("can_search_box")
+        self.gridLayout_2.addWidget(self.can_search_box, 0, 0, 1, 1)
+        self.can_view = QtWidgets.QTreeView(self.tab_2)
+        self.can_view.setAlternatingRowColors(True)
+        self.can_view.setObjectName("can_view")
+        self.gridLayout_2.addWidget(self.can_view, 1, 0, 1, 1)
+        self.horizontalLayout_2.addLayout(self.gridLayout_2)
+        self.tabWidget.addTab(self.tab_2, "")
+        self.tab_4 = QtWidgets.QWidget()
+        self.tab_4.setObjectName("tab_4")
+        self.horizontalLayout = QtWidgets.QHBoxLayout(self.tab_4)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.gridLayout_4 = QtWidgets.QGridLayout()
+        self.gridLayout_4.setObjectName("gridLayout_4")
+        self.value_set_view = QtWidgets.QTreeView(self.tab_4)
+        self.value_set_view.setObjectName("value_set_view")
+        self.gridLayout_4.addWidget(self.value_set_view, 1, 0, 1, 1)
+        self.value_set_search_box = SearchBox(self.tab_4)
+        self.value_set_search_box.setObjectName("value_set_search_box")
+        self.gridLayout_4.addWidget(self.value_set_search_box, 0, 0, 1, 1)
+        self.horizontalLayout.addLayout(self.gridLayout_4)
+        self.tabWidget.addTab(self.tab_4, "")
+        self.tab_8 = QtWidgets.QWidget()
+        self.tab_8.setObjectName("tab_8")
+        self.horizontalLayout_3 = QtWidgets.QHBoxLayout(self.tab_8)
+        self.horizontalLayout_3.setObjectName("horizontalLayout_3")
+        self.gridLayout_3 = QtWidgets.QGridLayout()
+        self.gridLayout_3.setObjectName("gridLayout_3")
+        self.anomalies_view = QtWidgets.QTreeView(self.tab_8)
+        self.anomalies_view.setObjectName("anomalies_view")
+        self.gridLayout_3.addWidget(self.anomalies_view, 1, 0, 1, 1)
+        self.anomalies_search_box = SearchBox(self.tab_8)
+        self.anomalies_search_box.setObjectName("anomalies_search_box")
+        self.gridLayout_3.addWidget(self.anomalies_search_box, 0, 0, 1, 1)
+        self.horizontalLayout_3.addLayout(self.gridLayout_3)
+        self.tabWidget.addTab(self.tab_8, "")
+        self.tabWidget_2 = QtWidgets.QTabWidget(self.splitter)
+        self.tabWidget_2.setAcceptDrops(True)
+        self.tabWidget_2.setObjectName("tabWidget_2")
+        self.staticmodbus = QtWidgets.QWidget()
+        self.staticmodbus.setObjectName("staticmodbus")
+        self.horizontalLayout_5 = QtWidgets.QHBoxLayout(self.staticmodbus)
+        self.horizontalLayout_5.setObjectName("horizontalLayout_5")
+        self.gridLayout_8 = QtWidgets.QGridLayout()
+        self.gridLayout_8.setObjectName("gridLayout_8")
+        self.static_modbus_view = QtWidgets.QTreeView(self.staticmodbus)
+        self.static_modbus_view.setAlternatingRowColors(True)
+        self.static_modbus_view.setObjectName("static_modbus_view")
+        self.gridLayout_8.addWidget(self.static_modbus_view, 1, 0, 1, 1)
+        self.static_modbus_search_box = SearchBox(self.staticmodbus)
+        self.static_modbus_search_box.setObjectName("static_modbus_search_box")
+        self.gridLayout_8.addWidget(self.static_modbus_search_box, 0, 0, 1, 1)
+        self.horizontalLayout_5.addLayout(self.gridLayout_8)
+        self.tabWidget_2.addTab(self.staticmodbus, "")
+        self.sunspec1 = QtWidgets.QWidget()
+        self.sunspec1.setObjectName("sunspec1")
+        self.horizontalLayout_6 = QtWidgets.QHBoxLayout(self.sunspec1)
+        self.horizontalLayout_6.setObjectName("horizontalLayout_6")
+        self.gridLayout_10 = QtWidgets.QGridLayout()
+        self.gridLayout_10.setObjectName("gridLayout_10")
+        self.sunspec1_view = QtWidgets.QTreeView(self.sunspec1)
+        self.sunspec1_view.setObjectName("sunspec1_view")
+        self.gridLayout_10.addWidget(self.sunspec1_view, 1, 0, 1, 1)
+        self.sunspec1_search_box = SearchBox(self.sunspec1)
+        self.sunspec1_search_box.setObjectName("sunspec1_search_box")
+        self.gridLayout_10.addWidget(self.sunspec1_search_box, 0, 0, 1, 1)
+        self.horizontalLayout_6.addLayout(self.gridLayout_10)
+        self.tabWidget_2.addTab(self.sunspec1, "")
+        self.sunspec2 = QtWidgets.QWidget()
+        self.sunspec2.setObjectName("sunspec2")
+        self.horizontalLayout_7 = QtWidgets.QHBoxLayout(self.sunspec2)
+        self.horizontalLayout_7.setObjectName("horizontalLayout_7")
+        self.gridLayout_11 = QtWidgets.QGridLayout()
+        self.gridLayout_11.setObjectName("gridLayout_11")
+        self.sunspec2_view = QtWidgets.QTreeView(self.sunspec2)
+        self.sunspec2_view.setObjectName("sunspec2_view")
+        self.gridLayout_11.addWidget(self.sunspec2_view, 1, 0, 1, 1)
+        self.sunspec2_search_box = SearchBox(self.sunspec2)
+        self.sunspec2_search_box.setObjectName("sunspec2_search_box")
+        self.gridLayout_11.addWidget(self.sunspec2_search_box, 0, 0, 1, 1)
+        self.horizontalLayout_7.addLayout(self.gridLayout_11)
+        self.tabWidget_2.addTab(self.sunspec2, "")
+        self.gridLayout_5.addWidget(self.splitter, 0, 0, 1, 1)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.menubar = QtWidgets.QMenuBar(MainWindow)
+        self.menubar.setGeometry(QtCore.QRect(0, 0, 1200, 20))
+        self.menubar.setObjectName("menubar")
+        self.menu_File = QtWidgets.QMenu(self.menubar)
+        self.menu_File.setObjectName("menu_File")
+        self.action_new_value_set_2 = QtWidgets.QMenu(self.menu_File)
+        self.action_new_value_set_2.setObjectName("action_new_value_set_2")
+        self.menu_Project = QtWidgets.QMenu(self.menu_File)
+        self.menu_Project.setObjectName("menu_Project")
+        self.menuHelp = QtWidgets.QMenu(self.menubar)
+        self.menuHelp.setObjectName("menuHelp")
+        self.menuTools = QtWidgets.QMenu(self.menubar)
+        self.menuTools.setObjectName("menuTools")
+        MainWindow.setMenuBar(self.menubar)
+        self.statusbar = QtWidgets.QStatusBar(MainWindow)
+        self.statusbar.setObjectName("statusbar")
+        MainWindow.setStatusBar(self.statusbar)
+        self.action_open_project = QtWidgets.QAction(MainWindow)
+        self.action_open_project.setObjectName("action_open_project")
+        self.action_save_as_project = QtWidgets.QAction(MainWindow)
+        self.action_save_as_project.setObjectName("action_save_as_project")
+        self.action_save_project = QtWidgets.QAction(MainWindow)
+        self.action_save_project.setObjectName("action_save_project")
+        self.action_new_project = QtWidgets.QAction(MainWindow)
+        self.action_new_project.setObjectName("action_new_project")
+        self.action_about = QtWidgets.QAction(MainWindow)
+        self.action_about.setObjectName("action_about")
+        self.action_import_sym = QtWidgets.QAction(MainWindow)
+        self.action_import_sym.setObjectName("action_import_sym")
+        self.action_export_sym = QtWidgets.QAction(MainWindow)
+        self.action_export_sym.setObjectName("action_export_sym")
+        self.action_Project = QtWidgets.QAction(MainWindow)
+        self.action_Project.setObjectName("action_Project")
+        self.action_new_value_set = QtWidgets.QAction(MainWindow)
+        self.action_new_value_set.setObjectName("action_new_value_set")
+        self.action_Value_Set = QtWidgets.QAction(MainWindow)
+        self.action_Value_Set.setObjectName("action_Value_Set")
+        self.action_save_value_set = QtWidgets.QAction(MainWindow)
+        self.action_save_value_set.setObjectName("action_save_value_set")
+        self.action_save_as_value_set = QtWidgets.QAction(MainWindow)
+        self.action_save_as_value_set.setObjectName("action_save_as_value_set")
+        self.action_open_value_set = QtWidgets.QAction(MainWindow)
+        self.action_open_value_set.setObjectName("action_open_value_set")
+        self.action_import_smdx = QtWidgets.QAction(MainWindow)
+        self.action_import_smdx.setObjectName("action_import_smdx")
+        self.action_full_import = QtWidgets.QAction(MainWindow)
+        self.action_full_import.setObjectName("action_full_import")
+        self.action_full_export = QtWidgets.QAction(MainWindow)
+        self.action_full_export.setObjectName("action_full_export")
+        self.action_full_export_first_time = QtWidgets.QAction(MainWindow)
+        self.action_full_export_first_time.setObjectName("action_full_export_first_time")
+        self.action_check = QtWidgets.QAction(MainWindow)
+        self.action_check.setObjectName("action_check")
+        self.action_new_value_set_2.addAction(self.action_new_value_set)
+        self.action_new_value_set_2.addAction(self.action_open_value_set)
+        self.action_new_value_set_2.addAction(self.action_save_value_set)
+        self.action_new_value_set_2.addAction(self.action_save_as_value_set)
+        self.menu_Project.addAction(self.action_new_project)
+        self.menu_Project.addAction(self.action_open_project)
+        self.menu_Project.addAction(self.action_save_project)
+        self.menu_Project.addAction(self.action_save_as_project)
+        self.menu_File.addAction(self.menu_Project.menuAction())
+        self.menu_File.addAction(self.action_new_value_set_2.menuAction())
+        self.menu_File.addSeparator()
+        self.menu_File.addAction(self.action_import_smdx)
+        self.menu_File.addAction(self.action_full_export)
+        self.menuHelp.addAction(self.action_about)
+        self.menuTools.addAction(self.action_check)
+        self.menubar.addAction(self.menu_File.menuAction())
+        self.menubar.addAction(self.menuTools.menuAction())
+        self.menubar.addAction(self.menuHelp.menuAction())
+
+        self.retranslateUi(MainWindow)
+        self.tabWidget.setCurrentIndex(0)
+        self.tabWidget_2.setCurrentIndex(0)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "MainWindow"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_2), _translate("MainWindow", "CAN"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_4), _translate("MainWindow", "Value Set"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_8), _translate("MainWindow", "Anomalies"))
+        self.tabWidget_2.setTabText(self.tabWidget_2.indexOf(self.staticmodbus), _translate("MainWindow", "Static modbus"))
+        self.tabWidget_2.setTabText(self.tabWidget_2.indexOf(self.sunspec1), _translate("MainWindow", "Sunspec 1"))
+        self.tabWidget_2.setTabText(self.tabWidget_2.indexOf(self.sunspec2), _translate("MainWindow", "Sunspec 2"))
+        self.menu_File.setTitle(_translate("MainWindow", "&File"))
+        self.action_new_value_set_2.setTitle(_translate("MainWindow", "&Value Set"))
+        self.menu_Project.setTitle(_translate("MainWindow", "&Project"))
+        self.menuHelp.setTitle(_translate("MainWindow", "&Help"))
+        self.menuTools.setTitle(_translate("MainWindow", "&Tools"))
+        self.action_open_project.setText(_translate("MainWindow", "&Open..."))
+        self.action_save_as_project.setText(_translate("MainWindow", "Save &As..."))
+        self.action_save_project.setText(_translate("MainWindow", "&Save"))
+        self.action_save_project.setShortcut(_translate("MainWindow", "Ctrl+S"))
+        self.action_new_project.setText(_translate("MainWindow", "&New"))
+        self.action_about.setText(_translate("MainWindow", "&About..."))
+        self.action_import_sym.setText(_translate("MainWindow", "&Import .sym..."))
+        self.action_export_sym.setText(_translate("MainWindow", "&Export .sym..."))
+        self.action_Project.setText(_translate("MainWindow", "&Project"))
+        self.action_new_value_set.setText(_translate("MainWindow", "&New"))
+        self.action_Value_Set.setText(_translate("MainWindow", "&Value Set..."))
+        self.action_save_value_set.setText(_translate("MainWindow", "&Save"))
+        self.action_save_as_value_set.setText(_translate("MainWindow", "Save &As..."))
+        self.action_open_value_set.setText(_translate("MainWindow", "&Open..."))
+        self.action_import_smdx.setText(_translate("MainWindow", "Import &SMDX..."))
+        self.action_full_import.setText(_translate("MainWindow", "Full import..."))
+        self.action_full_export.setText(_translate("MainWindow", "&Full Export..."))
+        self.action_full_export_first_time.setText(_translate("MainWindow", "Full Export (First Time)..."))
+        self.action_check.setText(_translate("MainWindow", "&Check"))
+from epyqlib.searchbox import SearchBox
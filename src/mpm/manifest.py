@@ -0,0 +1,186 @@
+"""Content hash build manifest used to regenerate only out of date outputs."""
+
+import hashlib
+import json
+import os
+import pathlib
+import typing
+
+import attr
+
+format_version = 1
+file_name = ".mpm-build-manifest.json"
+
+
+def hash_path(path: pathlib.Path) -> typing.Optional[str]:
+    """
+    Hash the contents of a file.
+
+    Args:
+        path: file to hash
+
+    Returns:
+        hex SHA-256 digest of the file contents, None if the file does not exist
+    """
+    try:
+        data = pathlib.Path(path).read_bytes()
+    except FileNotFoundError:
+        return None
+
+    return hashlib.sha256(data).hexdigest()
+
+
+@attr.s
+class Record:
+    """Hashes recorded for a single generator after it last ran."""
+
+    inputs = attr.ib(factory=dict)
+    outputs = attr.ib(factory=dict)
+    options = attr.ib(factory=dict)
+
+
+@attr.s
+class Manifest:
+    """
+    Input and output content hashes for each generator of a build.
+
+    Inputs are keyed by a role name chosen by the caller (such as a model
+    name) while outputs are keyed by their path relative to the manifest.
+    """
+
+    path = attr.ib(converter=pathlib.Path)
+    version = attr.ib(default=None)
+    records = attr.ib(factory=dict)
+    _hashes = attr.ib(factory=dict, init=False, repr=False)
+
+    @classmethod
+    def load(cls, path: pathlib.Path, version: str) -> "Manifest":
+        """
+        Load a manifest, discarding any records made by a different version.
+
+        Args:
+            path: manifest file location
+            version: version of the generating code
+
+        Returns:
+            the loaded manifest, empty if missing, unreadable or out of date
+        """
+        manifest = cls(path=path, version=version)
+
+        try:
+            raw = json.loads(manifest.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return manifest
+
+        if raw.get("format") != format_version or raw.get("version") != version:
+            return manifest
+
+        manifest.records = {
+            name: Record(
+                inputs=record.get("inputs", {}),
+                outputs=record.get("outputs", {}),
+                options=record.get("options", {}),
+            )
+            for name, record in raw.get("generators", {}).items()
+        }
+
+        return manifest
+
+    def save(self) -> None:
+        raw = {
+            "format": format_version,
+            "version": self.version,
+            "generators": {
+                name: attr.asdict(record)
+                for name, record in sorted(self.records.items())
+            },
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("w", encoding="utf-8", newline="\n") as f:
+            json.dump(raw, f, indent=4, sort_keys=True)
+            f.write("\n")
+
+    def input_hash(self, path: pathlib.Path) -> typing.Optional[str]:
+        """
+        Hash an input file, reusing the result for inputs shared by generators.
+        """
+        key = os.fspath(path)
+
+        if key not in self._hashes:
+            self._hashes[key] = hash_path(path)
+
+        return self._hashes[key]
+
+    def output_key(self, path: pathlib.Path) -> str:
+        path = pathlib.Path(path)
+
+        try:
+            relative = os.path.relpath(path, self.path.parent)
+        except ValueError:
+            # different drive on Windows
+            relative = os.fspath(path)
+
+        return pathlib.PurePath(relative).as_posix()
+
+    def input_hashes(
+        self, inputs: typing.Mapping[str, pathlib.Path]
+    ) -> typing.Dict[str, typing.Optional[str]]:
+        return {name: self.input_hash(path) for name, path in inputs.items()}
+
+    def output_hashes(
+        self, outputs: typing.Iterable[pathlib.Path]
+    ) -> typing.Dict[str, typing.Optional[str]]:
+        return {self.output_key(path): hash_path(path) for path in outputs}
+
+    def is_stale(
+        self,
+        name: str,
+        inputs: typing.Mapping[str, pathlib.Path],
+        outputs: typing.Iterable[pathlib.Path],
+        options: typing.Mapping[str, typing.Any] = {},
+    ) -> bool:
+        """
+        Check whether a generator needs to be run again.
+
+        Args:
+            name: generator name
+            inputs: input role names mapped to the files they are read from
+            outputs: files written by the generator
+            options: generator options which affect the output
+
+        Returns:
+            True if any input, output or option differs from the last record
+        """
+        record = self.records.get(name)
+
+        if record is None:
+            return True
+
+        if record.options != dict(options):
+            return True
+
+        if record.inputs != self.input_hashes(inputs):
+            return True
+
+        output_hashes = self.output_hashes(outputs)
+        if None in output_hashes.values():
+            return True
+
+        return record.outputs != output_hashes
+
+    def record(
+        self,
+        name: str,
+        inputs: typing.Mapping[str, pathlib.Path],
+        outputs: typing.Iterable[pathlib.Path],
+        options: typing.Mapping[str, typing.Any] = {},
+    ) -> None:
+        """
+        Record the current hashes after a generator has run.
+        """
+        self.records[name] = Record(
+            inputs=self.input_hashes(inputs),
+            outputs=self.output_hashes(outputs),
+            options=dict(options),
+        )
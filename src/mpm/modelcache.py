@@ -0,0 +1,254 @@
+"""Persistent cache of deserialized model trees.
+
+Loading a model through graham means marshmallow deserializes every field of
+every node.  The cache instead stores each node as the name of its type in the
+model's `epyqlib.attrsmodel.Types`, its deserialized field values and its
+children so that a tree can be rebuilt by calling the node classes directly.
+The Qt backed nodes themselves, and the node classes created by factories such
+as `epyqlib.attrsmodel.Root()`, can't be pickled so they are always
+constructed fresh.
+
+Caching is opt-in, `MPM_CACHE` names the directory holding the mpm caches.
+
+Equal strings and UUIDs, such as the type and parameter UUIDs referenced by
+many nodes, are stored once so the nodes rebuilt from an entry share them.
+"""
+
+import hashlib
+import importlib.metadata
+import os
+import pathlib
+import pickle
+import sys
+import typing
+import uuid
+
+import attr
+import graham.core
+
+import mpm
+
+
+format_version = 2
+
+# Immutable field values which are shared between nodes
+shared_types = (str, uuid.UUID)
+
+
+class UncacheableError(Exception):
+    pass
+
+
+def cache_directory() -> typing.Optional[pathlib.Path]:
+    """
+    Get the directory holding the mpm caches, from `MPM_CACHE`.
+
+    Returns:
+        the directory, None when caching is disabled
+    """
+    directory = os.environ.get("MPM_CACHE", "")
+    if directory == "":
+        return None
+
+    return pathlib.Path(directory).expanduser()
+
+
+def default_directory() -> typing.Optional[pathlib.Path]:
+    """Get the model cache directory, None when caching is disabled."""
+    directory = cache_directory()
+    if directory is None:
+        return None
+
+    return directory / "models"
+
+
+def distribution_version(name: str) -> typing.Optional[str]:
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def default_version() -> tuple:
+    """
+    Identify the code the cached trees were built with.  Development builds
+    all have the placeholder version so the commit is included as well.
+    """
+    return mpm.__version__, mpm.__sha__, distribution_version("epyqlib")
+
+
+def serialized_fields(cls):
+    """Names of the fields graham (de)serializes, excluding `children`."""
+    return tuple(
+        field.name
+        for field in attr.fields(cls)
+        if field.name != "children"
+        and field.metadata.get(graham.core.metadata_key) is not None
+    )
+
+
+def has_serialized_children(cls):
+    field = getattr(attr.fields(cls), "children", None)
+
+    return field is not None and field.metadata.get(graham.core.metadata_key)
+
+
+def share(value, shared: dict):
+    """Get the first seen value equal to the passed one, if it can be shared."""
+    if isinstance(value, shared_types):
+        return shared.setdefault(value, value)
+
+    return value
+
+
+def flatten(node, names: dict, shared: dict = None):
+    """
+    Convert a freshly deserialized tree to nested `(type name, fields,
+    children)` tuples.  References must not have been resolved yet.
+
+    Args:
+        node: root of the tree
+        names: type name by node class, see `type_names()`
+        shared: values already seen, used to share equal values across nodes
+
+    Raises:
+        UncacheableError: when the tree holds a node of an unnamed type
+    """
+    if shared is None:
+        shared = {}
+
+    cls = type(node)
+    name = names.get(cls)
+    if name is None:
+        raise UncacheableError(f"{cls.__qualname__} is not a type of the model")
+
+    fields = {
+        field_name: share(
+            flattened_value(getattr(node, field_name), names=names),
+            shared=shared,
+        )
+        for field_name in serialized_fields(cls)
+    }
+
+    if has_serialized_children(cls):
+        children = [
+            flatten(child, names=names, shared=shared) for child in node.children
+        ]
+    else:
+        children = None
+
+    return name, fields, children
+
+
+def flattened_value(value, names: dict):
+    # References resolved by the post init of the parent, such as for array
+    # elements, are stored as the referenced UUID like graham serializes them.
+    if type(value) in names:
+        return value.uuid
+
+    return value
+
+
+def type_names(types) -> dict:
+    """Map the classes of an `epyqlib.attrsmodel.Types` to their names."""
+    return {cls: name for name, cls in types.types.items()}
+
+
+def build(flattened, types):
+    """Rebuild a tree from the result of `flatten()`."""
+    name, fields, children = flattened
+
+    if children is not None:
+        fields = dict(
+            fields,
+            children=[build(child, types=types) for child in children],
+        )
+
+    return types.types[name](**fields)
+
+
+@attr.s
+class ModelCache:
+    directory = attr.ib()
+    version = attr.ib(factory=default_version)
+
+    def path_for(self, source: pathlib.Path) -> pathlib.Path:
+        # One entry per source file so old entries are overwritten.
+        source = os.path.normcase(os.path.abspath(source))
+        name = hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+        return self.directory / f"{name}.pickle"
+
+    def key_for(self, raw: str, types) -> tuple:
+        return (
+            format_version,
+            self.version,
+            tuple(types.types),
+            hashlib.sha256(raw.encode("utf-8")).hexdigest(),
+        )
+
+    def load(self, source: pathlib.Path, raw: str, types):
+        """
+        Get the cached root for the source file contents.
+
+        Args:
+            source: path of the model file
+            raw: contents of the model file
+            types: the `epyqlib.attrsmodel.Types` of the model
+
+        Returns:
+            the rebuilt root, None if not cached or the cache entry is stale
+        """
+        if self.directory is None:
+            return None
+
+        try:
+            with open(self.path_for(source), "rb") as f:
+                key, flattened = pickle.load(f)
+
+            if key != self.key_for(raw=raw, types=types):
+                return None
+
+            return build(flattened, types=types)
+        except Exception:
+            # Any unreadable or incompatible entry just means a JSON load
+            return None
+
+    def store(self, source: pathlib.Path, raw: str, types, root) -> None:
+        """
+        Cache a root which has just been deserialized from raw.
+
+        Args:
+            source: path of the model file
+            raw: contents of the model file
+            types: the `epyqlib.attrsmodel.Types` of the model
+            root: the deserialized root
+
+        Raises:
+            UncacheableError: when the tree holds a node of an unnamed type
+        """
+        if self.directory is None:
+            return
+
+        data = pickle.dumps(
+            (
+                self.key_for(raw=raw, types=types),
+                flatten(root, names=type_names(types)),
+            ),
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+
+        path = self.path_for(source)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temporary.write_bytes(data)
+            os.replace(temporary, path)
+        except OSError:
+            # Caching is only an optimization, a read only or full cache
+            # directory should not prevent loading.
+            try:
+                temporary.unlink()
+            except OSError:
+                pass
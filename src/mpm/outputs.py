@@ -0,0 +1,143 @@
+"""Generated output files which are only replaced when their contents change.
+
+Leaving unchanged files untouched keeps their modification times so that
+builds using the generated sources only recompile what actually changed.
+"""
+
+import contextlib
+import hashlib
+import locale
+import os
+import pathlib
+import typing
+
+import mpm.manifest
+
+
+_recorders = []
+
+
+@contextlib.contextmanager
+def recording() -> typing.Iterator[typing.List[pathlib.Path]]:
+    """
+    Collect the paths of the files changed by the writes within the context.
+
+    Returns:
+        list which is extended with each changed path
+    """
+    changed = []
+    _recorders.append(changed)
+
+    try:
+        yield changed
+    finally:
+        _recorders[:] = [recorder for recorder in _recorders if recorder is not changed]
+
+
+def is_unchanged(path: pathlib.Path, data: bytes) -> bool:
+    """
+    Check whether a file already has the passed contents.
+
+    Args:
+        path: file to check
+        data: new contents
+
+    Returns:
+        True if the file exists with identical contents
+    """
+    try:
+        size = os.stat(path).st_size
+    except FileNotFoundError:
+        return False
+
+    if size != len(data):
+        return False
+
+    return mpm.manifest.hash_path(path) == hashlib.sha256(data).hexdigest()
+
+
+def write_bytes(path: pathlib.Path, data: bytes) -> bool:
+    """
+    Atomically replace a file when its contents differ.
+
+    Args:
+        path: file to write
+        data: new contents
+
+    Returns:
+        True if the file was written, False if it was unchanged
+    """
+    path = pathlib.Path(path)
+
+    if is_unchanged(path=path, data=data):
+        return False
+
+    return write_chunks(path=path, chunks=[data])
+
+
+def write_chunks(path: pathlib.Path, chunks: typing.Iterable[bytes]) -> bool:
+    """
+    Atomically replace a file when its contents differ, writing the contents
+    as they are produced rather than holding them all in memory.
+
+    Args:
+        path: file to write
+        chunks: new contents
+
+    Returns:
+        True if the file was written, False if it was unchanged
+    """
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    digest = hashlib.sha256()
+
+    try:
+        with open(temporary, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                digest.update(chunk)
+
+        if mpm.manifest.hash_path(path) == digest.hexdigest():
+            os.remove(temporary)
+
+            return False
+
+        os.replace(temporary, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temporary)
+
+        raise
+
+    for recorder in _recorders:
+        recorder.append(path)
+
+    return True
+
+
+def write_text(
+    path: pathlib.Path,
+    text: str,
+    encoding: str = None,
+    newline: str = "\n",
+) -> bool:
+    """
+    Atomically replace a text file when its contents differ.
+
+    Args:
+        path: file to write
+        text: new contents
+        encoding: as for `open()`, the locale encoding when None
+        newline: line ending replacing each `\\n`
+
+    Returns:
+        True if the file was written, False if it was unchanged
+    """
+    if encoding is None:
+        encoding = locale.getpreferredencoding(False)
+
+    if newline != "\n":
+        text = text.replace("\n", newline)
+
+    return write_bytes(path=path, data=text.encode(encoding))
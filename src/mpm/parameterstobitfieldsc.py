@@ -5,6 +5,7 @@ import typing
 import mpm.c
 import mpm.parameterstointerface
 import mpm.mpm_helper
+import mpm.outputs
 import mpm.staticmodbusmodel
 import mpm.sunspecmodel
 import epyqlib.attrsmodel
@@ -328,11 +329,15 @@ class Root:
         h_lines.append("#endif")
 
         # Output the .c & .h files
-        with self.c_path.open("w", newline="\n") as f:
-            f.write(mpm.c.format_nested_lists(c_lines).strip() + "\n")
+        mpm.outputs.write_text(
+            path=self.c_path,
+            text=mpm.c.format_nested_lists(c_lines).strip() + "\n",
+        )
 
-        with self.h_path.open("w", newline="\n") as f:
-            f.write(mpm.c.format_nested_lists(h_lines).strip() + "\n")
+        mpm.outputs.write_text(
+            path=self.h_path,
+            text=mpm.c.format_nested_lists(h_lines).strip() + "\n",
+        )
 
 
 @builders(mpm.staticmodbusmodel.FunctionDataBitfield)
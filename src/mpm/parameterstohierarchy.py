@@ -6,6 +6,8 @@ import epyqlib.pm.parametermodel
 import epyqlib.utils.general
 
 import mpm.cantosym
+import mpm.outputs
+import mpm.project
 
 builders = epyqlib.utils.general.TypeMap()
 
@@ -13,15 +15,19 @@ builders = epyqlib.utils.general.TypeMap()
 dehumanize_name = mpm.cantosym.dehumanize_name
 
 
-def export(path, can_model, parameters_model):
+def export(path, can_model, parameters_model, project_index=None):
+    if project_index is None:
+        can_index = mpm.project.ModelIndex.build(root=can_model.root)
+    else:
+        can_index = project_index["can"]
+
     builder = mpm.parameterstohierarchy.builders.wrap(
         wrapped=parameters_model.root,
         can_root=can_model.root,
+        can_index=can_index,
     )
 
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", newline="\n") as f:
-        f.write(builder.gen(indent=4))
+    mpm.outputs.write_text(path=path, text=builder.gen(indent=4))
 
 
 @builders(epyqlib.pm.parametermodel.Root)
@@ -29,6 +35,7 @@ def export(path, can_model, parameters_model):
 class Root:
     wrapped = attr.ib()
     can_root = attr.ib()
+    can_index = attr.ib(default=None)
 
     def gen(self, json_output=True, **kwargs):
         parameters = next(
@@ -54,9 +61,15 @@ class Root:
 
             return True
 
-        can_nodes_with_parameter_uuid = self.can_root.nodes_by_filter(
-            filter=can_node_wanted,
-        )
+        can_index = self.can_index
+        if can_index is None:
+            can_index = mpm.project.ModelIndex.build(root=self.can_root)
+
+        can_nodes_with_parameter_uuid = [
+            node
+            for node in can_index.nodes_with_parameter_uuid()
+            if can_node_wanted(node)
+        ]
 
         parameter_uuid_to_can_node = {
             node.parameter_uuid: node for node in can_nodes_with_parameter_uuid
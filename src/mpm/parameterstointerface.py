@@ -15,6 +15,7 @@ import epyqlib.utils.general
 
 import mpm.cantosym
 import mpm.mpm_helper
+import mpm.project
 import mpm.sunspecmodel
 import mpm.staticmodbusmodel
 
@@ -99,7 +100,19 @@ def export(
     staticmodbus_model,
     skip_output=False,
     include_uuid_in_item=False,
+    project_index=None,
 ):
+    if project_index is None:
+        project_index = mpm.project.ProjectIndex(
+            models=mpm.project.Models(
+                parameters=parameters_model,
+                can=can_model,
+                sunspec1=sunspec1_model,
+                sunspec2=sunspec2_model,
+                staticmodbus=staticmodbus_model,
+            ),
+        )
+
     if skip_output:
         sunspec1_root = None
         sunspec2_root = None
@@ -116,6 +129,10 @@ def export(
         sunspec2_root=sunspec2_root,
         staticmodbus_root=staticmodbus_root,
         include_uuid_in_item=include_uuid_in_item,
+        can_index=project_index["can"],
+        sunspec1_index=None if skip_output else project_index["sunspec1"],
+        sunspec2_index=None if skip_output else project_index["sunspec2"],
+        staticmodbus_index=None if skip_output else project_index["staticmodbus"],
     )
 
     c_path.parent.mkdir(parents=True, exist_ok=True)
@@ -174,6 +191,16 @@ class Root:
     sunspec2_root = attr.ib()
     staticmodbus_root = attr.ib()
     include_uuid_in_item = attr.ib()
+    can_index = attr.ib(default=None)
+    sunspec1_index = attr.ib(default=None)
+    sunspec2_index = attr.ib(default=None)
+    staticmodbus_index = attr.ib(default=None)
+
+    def index_for(self, index, root):
+        if index is None:
+            index = mpm.project.ModelIndex.build(root=root)
+
+        return index
 
     def gen(self):
         def can_node_wanted(node):
@@ -190,9 +217,12 @@ class Root:
             ]
             return not any(ancestor.uuid in uuids for ancestor in node.ancestors())
 
-        can_nodes_with_parameter_uuid = self.can_root.nodes_by_filter(
-            filter=can_node_wanted,
-        )
+        can_index = self.index_for(index=self.can_index, root=self.can_root)
+        can_nodes_with_parameter_uuid = [
+            node
+            for node in can_index.nodes_with_parameter_uuid()
+            if can_node_wanted(node)
+        ]
 
         parameter_uuid_to_can_node = {
             node.parameter_uuid: node for node in can_nodes_with_parameter_uuid
@@ -214,9 +244,15 @@ class Root:
         if self.sunspec1_root is None:
             parameter_uuid_to_sunspec1_node = {}
         else:
-            sunspec_nodes_with_parameter_uuid = self.sunspec1_root.nodes_by_filter(
-                filter=sunspec_node_wanted,
+            sunspec1_index = self.index_for(
+                index=self.sunspec1_index,
+                root=self.sunspec1_root,
             )
+            sunspec_nodes_with_parameter_uuid = [
+                node
+                for node in sunspec1_index.nodes_with_parameter_uuid()
+                if sunspec_node_wanted(node)
+            ]
 
             parameter_uuid_to_sunspec1_node = {
                 node.parameter_uuid: node for node in sunspec_nodes_with_parameter_uuid
@@ -225,9 +261,15 @@ class Root:
         if self.sunspec2_root is None:
             parameter_uuid_to_sunspec2_node = {}
         else:
-            sunspec_nodes_with_parameter_uuid = self.sunspec2_root.nodes_by_filter(
-                filter=sunspec_node_wanted,
+            sunspec2_index = self.index_for(
+                index=self.sunspec2_index,
+                root=self.sunspec2_root,
             )
+            sunspec_nodes_with_parameter_uuid = [
+                node
+                for node in sunspec2_index.nodes_with_parameter_uuid()
+                if sunspec_node_wanted(node)
+            ]
 
             parameter_uuid_to_sunspec2_node = {
                 node.parameter_uuid: node for node in sunspec_nodes_with_parameter_uuid
@@ -249,11 +291,15 @@ class Root:
         if self.staticmodbus_root is None:
             parameter_uuid_to_staticmodbus_node = {}
         else:
-            staticmodbus_nodes_with_parameter_uuid = (
-                self.staticmodbus_root.nodes_by_filter(
-                    filter=staticmodbus_node_wanted,
-                )
+            staticmodbus_index = self.index_for(
+                index=self.staticmodbus_index,
+                root=self.staticmodbus_root,
             )
+            staticmodbus_nodes_with_parameter_uuid = [
+                node
+                for node in staticmodbus_index.nodes_with_parameter_uuid()
+                if staticmodbus_node_wanted(node)
+            ]
 
             parameter_uuid_to_staticmodbus_node = {
                 node.parameter_uuid: node
@@ -956,6 +1002,80 @@ class CommonTableData:
     include_uuid_in_item = attr.ib()
 
 
+# TODO: CAMPid 3078980986754174316996743174316967431
+@attr.s
+class TableRepeatingBlockReferences:
+    """
+    Lookups from table elements to the SunSpec repeating block references.
+
+    Built with a single traversal of the SunSpec tree so resolving each table
+    element does not search the whole tree and scan the repeating blocks.
+    """
+
+    # parameter UUID -> repeating blocks containing a point for the parameter
+    point_parameter_uuid_to_blocks = attr.ib(factory=dict)
+    # (repeating block, parameter UUID) -> data point reference
+    point_references = attr.ib(factory=dict)
+
+    @classmethod
+    def build(cls, root):
+        references = cls()
+
+        if root is None:
+            return references
+
+        def visit(node, payload):
+            if isinstance(node, mpm.sunspecmodel.TableRepeatingBlock):
+                for child in node.children:
+                    blocks = references.point_parameter_uuid_to_blocks.setdefault(
+                        child.parameter_uuid,
+                        [],
+                    )
+                    if not any(block is node for block in blocks):
+                        blocks.append(node)
+            elif isinstance(node, mpm.sunspecmodel.TableRepeatingBlockReference):
+                for child in node.children:
+                    if isinstance(
+                        child,
+                        mpm.sunspecmodel.TableRepeatingBlockReferenceDataPointReference,
+                    ):
+                        references.point_references.setdefault(
+                            (node.original, child.parameter_uuid),
+                            child,
+                        )
+
+        root.traverse(call_this=visit, payload=None, internal_nodes=True)
+
+        return references
+
+    def point_from_table_element(self, sunspec_point, table_element):
+        """
+        Find the data point reference for a table element in the repeating
+        block containing the passed SunSpec point.
+
+        Args:
+            sunspec_point: SunSpec point for the table element parameter
+            table_element: table element from parameter tree
+
+        Returns:
+            the data point reference, None if not found
+        """
+        value = table_element.original
+
+        if isinstance(value, epyqlib.pm.parametermodel.ArrayParameterElement):
+            value = value.original
+
+        for block in self.point_parameter_uuid_to_blocks.get(
+            sunspec_point.parameter_uuid,
+            (),
+        ):
+            node_in_model = self.point_references.get((block, value.uuid))
+            if node_in_model is not None:
+                return node_in_model
+
+        return None
+
+
 @attr.s
 class TableBaseStructures:
     """Methods for interface generation of table parameters."""
@@ -967,6 +1087,7 @@ class TableBaseStructures:
     parameter_uuid_to_staticmodbus_node = attr.ib()
     parameter_uuid_finder = attr.ib()
     include_uuid_in_item = attr.ib()
+    sunspec1_references = attr.ib(factory=TableRepeatingBlockReferences)
     common_structure_names = attr.ib(factory=dict)
     common_initializers_dict = attr.ib(factory=dict)
 
@@ -1259,7 +1380,7 @@ class TableBaseStructures:
                 sunspec_type,
             ]
 
-            node_in_model = get_sunspec_point_from_table_element(
+            node_in_model = self.sunspec1_references.point_from_table_element(
                 sunspec_point=sunspec1_point,
                 table_element=table_element,
             )
@@ -1452,79 +1573,6 @@ class TableBaseStructures:
         return sunspec_scale_factor
 
 
-# TODO: CAMPid 3078980986754174316996743174316967431
-def get_sunspec_point_from_table_element(sunspec_point, table_element):
-    value = table_element.original
-
-    if isinstance(value, epyqlib.pm.parametermodel.ArrayParameterElement):
-        value = value.original
-
-    value = value.uuid
-
-    nodes_in_model = [
-        node
-        for node in sunspec_point.find_root().nodes_by_attribute(
-            attribute_value=value,
-            attribute_name="parameter_uuid",
-            raise_=False,
-        )
-        if isinstance(
-            node,
-            mpm.sunspecmodel.TableRepeatingBlockReferenceDataPointReference,
-        )
-    ]
-
-    for node in nodes_in_model:
-        for child in node.tree_parent.original.children:
-            if child.parameter_uuid == sunspec_point.parameter_uuid:
-                node_in_model = node
-                break
-        else:
-            continue
-
-        break
-    else:
-        node_in_model = None
-    return node_in_model
-
-
-# TODO: CAMPid 3078980986754174316996743174316967431
-def get_sunspec_model_from_table_group_element(sunspec_point, table_element):
-    nodes_in_model = [
-        node
-        for node in sunspec_point.find_root().nodes_by_attribute(
-            attribute_value=table_element.uuid,
-            attribute_name="parameter_uuid",
-            raise_=False,
-        )
-        if isinstance(node, mpm.sunspecmodel.DataPoint)
-    ]
-
-    for node in nodes_in_model:
-        for child in node.tree_parent.children:
-            if child.parameter_uuid == table_element.uuid:
-                node_in_model = node
-                break
-        else:
-            continue
-
-        break
-    else:
-        return None
-
-    (model_repeating_block,) = [
-        node
-        for node in sunspec_point.find_root().nodes_by_attribute(
-            attribute_value=node_in_model.tree_parent,
-            attribute_name="original",
-            raise_=False,
-        )
-        if isinstance(node, mpm.sunspecmodel.TableRepeatingBlockReference)
-    ]
-
-    return model_repeating_block.tree_parent
-
-
 @builders(epyqlib.pm.parametermodel.Table)
 @attr.s
 class Table:
@@ -1605,6 +1653,9 @@ class Table:
             ),
             parameter_uuid_finder=self.parameter_uuid_finder,
             include_uuid_in_item=self.include_uuid_in_item,
+            sunspec1_references=TableRepeatingBlockReferences.build(
+                root=self.sunspec1_root,
+            ),
         )
 
         (
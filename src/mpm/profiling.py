@@ -0,0 +1,232 @@
+"""Time and memory used by each stage of loading and exporting a project.
+
+Stages are marked with `stage()` where the work is done and are only measured
+while a `Profiler` is active, otherwise they cost nothing.
+"""
+
+import contextlib
+import cProfile
+import ctypes
+import json
+import pathlib
+import re
+import sys
+import time
+import typing
+
+import attr
+
+
+_profilers = []
+
+
+def peak_rss() -> typing.Optional[int]:
+    """
+    Get the peak resident set size of this process.
+
+    Returns:
+        bytes, None when not available on this platform
+    """
+    if sys.platform == "win32":
+        return _windows_peak_rss()
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if sys.platform == "darwin":
+        return peak
+
+    # kibibytes elsewhere
+    return peak * 1024
+
+
+class _ProcessMemoryCounters(ctypes.Structure):
+    _fields_ = [
+        ("cb", ctypes.c_ulong),
+        ("PageFaultCount", ctypes.c_ulong),
+        ("PeakWorkingSetSize", ctypes.c_size_t),
+        ("WorkingSetSize", ctypes.c_size_t),
+        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+        ("PagefileUsage", ctypes.c_size_t),
+        ("PeakPagefileUsage", ctypes.c_size_t),
+    ]
+
+
+def _windows_peak_rss():
+    counters = _ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+
+    succeeded = ctypes.windll.psapi.GetProcessMemoryInfo(
+        ctypes.windll.kernel32.GetCurrentProcess(),
+        ctypes.byref(counters),
+        counters.cb,
+    )
+
+    if not succeeded:
+        return None
+
+    return counters.PeakWorkingSetSize
+
+
+def count_nodes(*roots) -> int:
+    """Count the nodes in the trees below and including the passed roots."""
+    count = 0
+    stack = [root for root in roots if root is not None]
+
+    while len(stack) > 0:
+        node = stack.pop()
+        count += 1
+        stack.extend(getattr(node, "children", ()))
+
+    return count
+
+
+def node_counter(*models) -> typing.Callable[[], int]:
+    """Create a callable counting the nodes of the passed attrs models."""
+    return lambda: count_nodes(*(model.root for model in models if model is not None))
+
+
+@attr.s(frozen=True)
+class Stage:
+    """Measurements of one stage, times are in seconds and memory in bytes."""
+
+    name = attr.ib()
+    depth = attr.ib()
+    wall_time = attr.ib()
+    cpu_time = attr.ib()
+    peak_rss = attr.ib()
+    nodes = attr.ib(default=None)
+
+
+def file_name_for(index: int, name: str) -> str:
+    slug = re.sub(r"[^0-9a-zA-Z]+", "_", name).strip("_")
+
+    return f"{index:02}_{slug}.prof"
+
+
+@attr.s
+class Profiler:
+    """
+    Collects the stages run while it is active.  When `dump_directory` is set
+    a cProfile dump is written there for each outermost stage.
+    """
+
+    dump_directory = attr.ib(default=None)
+    stages = attr.ib(factory=list)
+    _depth = attr.ib(default=0)
+
+    @contextlib.contextmanager
+    def stage(self, name: str, nodes: typing.Callable[[], int] = None):
+        depth = self._depth
+        index = len(self.stages)
+        # Reserve the position so outer stages are listed before inner ones
+        self.stages.append(None)
+
+        profile = None
+        if self.dump_directory is not None and depth == 0:
+            profile = cProfile.Profile()
+
+        self._depth += 1
+        completed = False
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+
+        if profile is not None:
+            profile.enable()
+
+        try:
+            yield
+            completed = True
+        finally:
+            if profile is not None:
+                profile.disable()
+
+            wall_time = time.perf_counter() - wall_start
+            cpu_time = time.process_time() - cpu_start
+            self._depth -= 1
+
+            self.stages[index] = Stage(
+                name=name,
+                depth=depth,
+                wall_time=wall_time,
+                cpu_time=cpu_time,
+                peak_rss=peak_rss(),
+                nodes=nodes() if completed and nodes is not None else None,
+            )
+
+            if profile is not None:
+                directory = pathlib.Path(self.dump_directory)
+                directory.mkdir(parents=True, exist_ok=True)
+                profile.dump_stats(directory / file_name_for(index, name))
+
+    def report(self) -> str:
+        lines = [
+            f"{'stage':<40} {'wall s':>9} {'cpu s':>9} {'peak MiB':>9} {'nodes':>8}",
+        ]
+
+        for stage in self.stages:
+            if stage is None:
+                continue
+
+            if stage.peak_rss is None:
+                peak = "-"
+            else:
+                peak = f"{stage.peak_rss / 2**20:.1f}"
+
+            nodes = "-" if stage.nodes is None else str(stage.nodes)
+            name = "  " * stage.depth + stage.name
+
+            lines.append(
+                f"{name:<40} {stage.wall_time:>9.3f} {stage.cpu_time:>9.3f}"
+                f" {peak:>9} {nodes:>8}"
+            )
+
+        return "\n".join(lines)
+
+    def save(self, path: pathlib.Path) -> None:
+        raw = {
+            "stages": [
+                attr.asdict(stage) for stage in self.stages if stage is not None
+            ],
+        }
+
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8", newline="\n") as f:
+            json.dump(raw, f, indent=4)
+            f.write("\n")
+
+
+@contextlib.contextmanager
+def profiling(profiler: Profiler):
+    """Measure the stages run within the context with the passed profiler."""
+    _profilers.append(profiler)
+
+    try:
+        yield profiler
+    finally:
+        _profilers[:] = [active for active in _profilers if active is not profiler]
+
+
+@contextlib.contextmanager
+def stage(name: str, nodes: typing.Callable[[], int] = None):
+    """
+    Mark a stage of work to be measured by the active profiler, if any.
+
+    Args:
+        name: stage name shown in the report
+        nodes: called after the stage to count the nodes it worked on
+    """
+    if len(_profilers) == 0:
+        yield
+        return
+
+    with _profilers[-1].stage(name=name, nodes=nodes):
+        yield
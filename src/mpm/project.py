@@ -1,4 +1,9 @@
+import functools
+import itertools
+import logging
+import os
 import pathlib
+import uuid
 
 import attr
 import graham
@@ -7,16 +12,32 @@ import marshmallow
 import epyqlib.pm.parametermodel
 import epyqlib.utils.qt
 
+import mpm
 import mpm.canmodel
+import mpm.headless
+import mpm.modelcache
+import mpm.outputs
+import mpm.profiling
+import mpm.serialization
 import mpm.sunspecmodel
 import mpm.staticmodbusmodel
 import mpm.anomalymodel
 
 
+logger = logging.getLogger(__name__)
+
+
 class ProjectSaveCanceled(Exception):
     pass
 
 
+# Set to None to always deserialize models from their JSON.  Disabled unless
+# `MPM_CACHE` names a cache directory.
+model_cache = mpm.modelcache.ModelCache(
+    directory=mpm.modelcache.default_directory(),
+)
+
+
 # class ProjectLoadCanceled(Exception):
 #     pass
 
@@ -28,137 +49,241 @@ def create_blank():
     return project
 
 
-def loads(s, project_path=None, post_load=True):
-    project = graham.schema(Project).loads(s).data
+def loads(s, project_path=None, post_load=True, lazy=False, headless=False):
+    def nodes():
+        return mpm.profiling.count_nodes(
+            *(model.root for model in project.models.loaded().values())
+        )
+
+    with mpm.profiling.stage("project load", nodes=nodes):
+        project = mpm.serialization.loads(s, Project)
+        project.headless = headless
 
-    if project_path is not None:
-        project.filename = pathlib.Path(project_path).absolute()
+        if project_path is not None:
+            project.filename = pathlib.Path(project_path).absolute()
 
-    if post_load:
-        _post_load(project)
+        if post_load:
+            with mpm.profiling.stage("post load", nodes=nodes):
+                _post_load(project, lazy=lazy)
 
     return project
 
 
-def load(f, post_load=True):
-    project = loads(f.read(), project_path=f.name, post_load=post_load)
+def load(f, post_load=True, lazy=False, headless=False):
+    project = loads(
+        f.read(),
+        project_path=f.name,
+        post_load=post_load,
+        lazy=lazy,
+        headless=headless,
+    )
 
     return project
 
 
-def loadp(path, post_load=True):
+def loadp(path, post_load=True, lazy=False, headless=False):
     with open(path) as f:
-        return load(f, post_load=post_load)
+        return load(f, post_load=post_load, lazy=lazy, headless=headless)
 
 
-def _post_load(project):
+def _post_load(project, lazy=False):
+    """
+    Create the project models, loading those with a path from their files.
+
+    Args:
+        project: project with its paths set
+        lazy: defer loading each model until it is first accessed
+    """
     models = project.models
 
-    if models.parameters is None:
-        if project.paths.parameters is None:
-            models.parameters = epyqlib.attrsmodel.Model(
-                root=epyqlib.pm.parametermodel.Root(),
-                columns=epyqlib.pm.parametermodel.columns,
-            )
-        else:
-            models.parameters = load_model(
-                project=project,
-                path=project.paths.parameters,
-                root_type=epyqlib.pm.parametermodel.Root,
-                columns=epyqlib.pm.parametermodel.columns,
-            )
+    preset = list(models.loaded())
 
-    if models.can is None:
-        if project.paths.can is None:
-            models.can = epyqlib.attrsmodel.Model(
-                root=mpm.canmodel.Root(),
-                columns=mpm.canmodel.columns,
-            )
-        else:
-            models.can = load_model(
-                project=project,
-                path=project.paths.can,
-                root_type=mpm.canmodel.Root,
-                columns=mpm.canmodel.columns,
-            )
+    for name in models.unset():
+        models[name] = DeferredModel(
+            load=functools.partial(create_model, project=project, name=name),
+        )
 
-    if models.sunspec1 is None:
-        if project.paths.sunspec1 is None:
-            models.sunspec1 = epyqlib.attrsmodel.Model(
-                root=mpm.sunspecmodel.Root(),
-                columns=mpm.sunspecmodel.columns,
-            )
-        else:
-            models.sunspec1 = load_model(
-                project=project,
-                path=project.paths.sunspec1,
-                root_type=mpm.sunspecmodel.Root,
-                columns=mpm.sunspecmodel.columns,
-                drop_sources=(models.parameters,),
-            )
+    for name in preset:
+        models.connect(name)
 
-    if models.sunspec2 is None:
-        if project.paths.sunspec2 is None:
-            models.sunspec2 = epyqlib.attrsmodel.Model(
-                root=mpm.sunspecmodel.Root(),
-                columns=mpm.sunspecmodel.columns,
-            )
-        else:
-            models.sunspec2 = load_model(
-                project=project,
-                path=project.paths.sunspec2,
-                root_type=mpm.sunspecmodel.Root,
-                columns=mpm.sunspecmodel.columns,
-                drop_sources=(models.parameters,),
-            )
+    if not lazy:
+        for name in models:
+            getattr(models, name)
 
-    if models.staticmodbus is None:
-        if project.paths.staticmodbus is None or len(project.paths.staticmodbus) == 0:
-            models.staticmodbus = epyqlib.attrsmodel.Model(
-                root=mpm.staticmodbusmodel.Root(),
-                columns=mpm.staticmodbusmodel.columns,
-                drop_sources=(models.parameters, models.can),
-            )
-        else:
-            models.staticmodbus = load_model(
-                project=project,
-                path=project.paths.staticmodbus,
-                root_type=mpm.staticmodbusmodel.Root,
-                columns=mpm.staticmodbusmodel.columns,
-                drop_sources=(models.parameters, models.can),
-            )
 
-    if models.anomalies is None:
-        if project.paths.anomalies is None or len(project.paths.anomalies) == 0:
-            models.anomalies = epyqlib.attrsmodel.Model(
-                root=mpm.anomalymodel.Root(),
-                columns=mpm.anomalymodel.columns,
-                drop_sources=(models.parameters,),
+@attr.s(frozen=True)
+class ModelKind:
+    """
+    How one of the project models is created and connected to the others.
+
+    `drop_sources` and `droppable_from` name the models nodes may be dragged
+    from and `selection_roots` the enumeration roots the model selects from.
+    """
+
+    root_type = attr.ib()
+    columns = attr.ib()
+    types = attr.ib()
+    drop_sources = attr.ib(default=())
+    droppable_from = attr.ib(default=())
+    selection_roots = attr.ib(default=())
+
+
+model_kinds = {
+    "parameters": ModelKind(
+        root_type=epyqlib.pm.parametermodel.Root,
+        columns=epyqlib.pm.parametermodel.columns,
+        types=epyqlib.pm.parametermodel.types,
+        droppable_from=("parameters",),
+        selection_roots=("enumerations", "access level", "visibility", "sunspec types"),
+    ),
+    "can": ModelKind(
+        root_type=mpm.canmodel.Root,
+        columns=mpm.canmodel.columns,
+        types=mpm.canmodel.types,
+        droppable_from=("parameters", "can"),
+        selection_roots=("enumerations",),
+    ),
+    "sunspec1": ModelKind(
+        root_type=mpm.sunspecmodel.Root,
+        columns=mpm.sunspecmodel.columns,
+        types=mpm.sunspecmodel.types,
+        drop_sources=("parameters",),
+        droppable_from=("parameters", "sunspec1"),
+        selection_roots=("sunspec types", "enumerations", "aggregation"),
+    ),
+    "sunspec2": ModelKind(
+        root_type=mpm.sunspecmodel.Root,
+        columns=mpm.sunspecmodel.columns,
+        types=mpm.sunspecmodel.types,
+        drop_sources=("parameters",),
+        droppable_from=("parameters", "sunspec2"),
+        selection_roots=("sunspec types", "enumerations", "aggregation"),
+    ),
+    "staticmodbus": ModelKind(
+        root_type=mpm.staticmodbusmodel.Root,
+        columns=mpm.staticmodbusmodel.columns,
+        types=mpm.staticmodbusmodel.types,
+        drop_sources=("parameters", "can"),
+        droppable_from=("parameters", "can"),
+        selection_roots=("staticmodbus types", "enumerations", "aggregation"),
+    ),
+    "anomalies": ModelKind(
+        root_type=mpm.anomalymodel.Root,
+        columns=mpm.anomalymodel.columns,
+        types=mpm.anomalymodel.types,
+        drop_sources=("parameters",),
+        selection_roots=(
+            "anomaly_codes",
+            "anomaly_response_levels",
+            "anomaly_trigger_types",
+        ),
+    ),
+}
+
+
+def create_model(project, name, raw=None):
+    """
+    Create one of the project models, loading it from its file when the
+    project has a path for it.
+
+    Args:
+        project: project the model belongs to
+        name: name of the model, a key of `model_kinds`
+        raw: serialized root to load instead of the file
+
+    Returns:
+        the attrs model, not yet connected to the other models
+    """
+    kind = model_kinds[name]
+    drop_sources = tuple(project.models[source] for source in kind.drop_sources)
+    path = project.paths[name]
+
+    with mpm.profiling.stage(f"load {name}"):
+        if raw is not None:
+            root = mpm.serialization.loads(raw, kind.root_type)
+            resolve_references(root)
+
+            return model_class(project)(
+                root=root,
+                columns=kind.columns,
+                drop_sources=drop_sources,
             )
-        else:
-            models.anomalies = load_model(
-                project=project,
-                path=project.paths.anomalies,
-                root_type=mpm.anomalymodel.Root,
-                columns=mpm.anomalymodel.columns,
-                drop_sources=(models.parameters,),
+
+        if path is None or len(path) == 0:
+            return model_class(project)(
+                root=kind.root_type(),
+                columns=kind.columns,
+                drop_sources=drop_sources,
             )
 
-    models.parameters.droppable_from.add(models.parameters)
+        model = load_model(
+            project=project,
+            path=path,
+            root_type=kind.root_type,
+            columns=kind.columns,
+            types=kind.types,
+            drop_sources=drop_sources,
+        )
+
+    project.changes.record(name=name, model=model, path=project.resolve(path))
+
+    return model
 
-    models.can.droppable_from.add(models.parameters)
-    models.can.droppable_from.add(models.can)
 
-    models.sunspec1.droppable_from.add(models.parameters)
-    models.sunspec1.droppable_from.add(models.sunspec1)
+def model_class(project):
+    """Get the attrs model class the project models are loaded as."""
+    if project.headless:
+        return mpm.headless.Model
 
-    models.sunspec2.droppable_from.add(models.parameters)
-    models.sunspec2.droppable_from.add(models.sunspec2)
+    return epyqlib.attrsmodel.Model
 
-    models.staticmodbus.droppable_from.add(models.parameters)
-    models.staticmodbus.droppable_from.add(models.can)
 
-    models.update_enumeration_roots()
+def snapshot(project):
+    """
+    Serialize the project models so that a copy can be loaded elsewhere, such
+    as in another process, while the project continues to be edited.
+
+    Args:
+        project: project to snapshot
+
+    Returns:
+        dict of model names to serialized roots
+    """
+    return {
+        name: mpm.serialization.dumps(model.root)
+        for name, model in project.models.items()
+    }
+
+
+def from_snapshot(snapshot, lazy=False, headless=False):
+    """
+    Load a copy of a project from the result of `snapshot()`.
+
+    Args:
+        snapshot: dict of model names to serialized roots
+        lazy: defer loading each model until it is first accessed
+        headless: load the models for use without views
+
+    Returns:
+        the project copy
+    """
+    project = Project(headless=headless)
+
+    for name, raw in snapshot.items():
+        project.models[name] = DeferredModel(
+            load=functools.partial(create_model, project=project, name=name, raw=raw),
+        )
+
+    _post_load(project, lazy=lazy)
+
+    return project
+
+
+@attr.s(frozen=True)
+class DeferredModel:
+    """Placeholder in `Models` for a model loaded on first access."""
+
+    load = attr.ib()
 
 
 def update_anomaly_enums(
@@ -207,6 +332,62 @@ def update_anomaly_enums(
     anomaly_enumeration.children = anoms
 
 
+def enumeration_roots(parameters_root):
+    """
+    Find the enumerations the models select from.
+
+    Args:
+        parameters_root: root of the parameters model
+
+    Returns:
+        dict of list selection root names to nodes, None where not present
+    """
+    enumerations_root = [
+        child for child in parameters_root.children if child.name == "Enumerations"
+    ]
+    if len(enumerations_root) == 0:
+        enumerations_root = None
+    else:
+        (enumerations_root,) = enumerations_root
+
+    roots = {
+        "enumerations": enumerations_root,
+        "access level": None,
+        "anomaly_codes": None,
+        "anomaly_response_levels": None,
+        "anomaly_trigger_types": None,
+        "visibility": None,
+        "sunspec types": None,
+        "staticmodbus types": None,
+        "aggregation": None,
+    }
+
+    if enumerations_root is None:
+        return roots
+
+    children = enumerations_root.children
+
+    def single(name):
+        found = [child for child in children if child.name == name]
+        return found[0] if len(found) == 1 else None
+
+    (roots["access level"],) = (
+        child for child in children if child.name == "AccessLevel"
+    )
+    (roots["visibility"],) = (
+        child for child in children if child.name == "CmmControlsVariant"
+    )
+
+    roots["anomaly_codes"] = single("AnomalyCode")
+    roots["anomaly_response_levels"] = single("AnomalyResponseLevel")
+    roots["anomaly_trigger_types"] = single("AnomalyTriggerType")
+    roots["sunspec types"] = single("SunSpecTypes")
+    roots["staticmodbus types"] = single("StaticModbusTypes")
+    roots["aggregation"] = single("ModbusAggregation")
+
+    return roots
+
+
 @graham.schemify(tag="models")
 @attr.s
 class Models:
@@ -253,11 +434,21 @@ class Models:
     def values(self):
         return attr.asdict(self, recurse=False).values()
 
+    def __getattribute__(self, name):
+        value = object.__getattribute__(self, name)
+
+        if isinstance(value, DeferredModel):
+            value = value.load()
+            setattr(self, name, value)
+            self.connect(name)
+
+        return value
+
     def __getitem__(self, item):
         if isinstance(item, str):
-            return attr.asdict(self, recurse=False)[item]
+            return getattr(self, item)
 
-        return attr.astuple(self, recurse=False)[item]
+        return getattr(self, attr.fields(type(self))[item].name)
 
     def __setitem__(self, item, value):
         if isinstance(item, str):
@@ -266,136 +457,305 @@ class Models:
 
         setattr(self, attr.fields(type(self))[item].name, value)
 
-    def update_enumeration_roots(self):
-        enumerations_root = [
-            child
-            for child in self.parameters.root.children
-            if child.name == "Enumerations"
+    def loaded(self):
+        """
+        Get the models which are set, without loading any deferred models.
+
+        Returns:
+            dict of model names to models
+        """
+        values = ((name, object.__getattribute__(self, name)) for name in self)
+
+        return {
+            name: value
+            for name, value in values
+            if value is not None and not isinstance(value, DeferredModel)
+        }
+
+    def unset(self):
+        """
+        Get the names of the models which are neither set nor deferred.
+
+        Returns:
+            list of model names
+        """
+        return [name for name in self if object.__getattribute__(self, name) is None]
+
+    def connect(self, name):
+        """
+        Connect a model to the models it accepts drops from and to the
+        enumerations it selects from.  Other models are loaded as needed.
+
+        Args:
+            name: name of the model, a key of `model_kinds`
+        """
+        model = getattr(self, name)
+
+        for source in model_kinds[name].droppable_from:
+            model.droppable_from.add(getattr(self, source))
+
+        self.update_enumeration_roots(names=[name])
+
+    def update_enumeration_roots(self, names=None):
+        """
+        Point the list selections of the models at the parameter enumerations
+        and update their nodes.
+
+        Args:
+            names: models to update, all loaded models when None
+        """
+        if names is None:
+            names = list(self.loaded())
+
+        if len(names) == 0:
+            return
+
+        # Any loading of the parameters is measured by its own stage
+        parameters = self.parameters
+
+        with mpm.profiling.stage("update enumeration roots"):
+            roots = enumeration_roots(parameters.root)
+
+            for name in names:
+                model = getattr(self, name)
+                for key in model_kinds[name].selection_roots:
+                    model.list_selection_roots[key] = roots[key]
+
+            for name in names:
+                getattr(self, name).update_nodes()
+
+
+@attr.s
+class ModelIndex:
+    """Lookups of the nodes in a model tree, built with a single traversal."""
+
+    uuid_to_node = attr.ib(factory=dict)
+    parameter_uuid_to_nodes = attr.ib(factory=dict)
+    type_to_nodes = attr.ib(factory=dict)
+    original_to_references = attr.ib(factory=dict)
+
+    @classmethod
+    def build(cls, root):
+        index = cls()
+
+        if root is None:
+            return index
+
+        nodes = [root]
+        while len(nodes) > 0:
+            node = nodes.pop()
+
+            index.uuid_to_node[node.uuid] = node
+            index.type_to_nodes.setdefault(type(node), []).append(node)
+
+            parameter_uuid = getattr(node, "parameter_uuid", None)
+            if parameter_uuid is not None:
+                index.parameter_uuid_to_nodes.setdefault(parameter_uuid, []).append(
+                    node
+                )
+
+            original = getattr(node, "original", None)
+            if original is not None and not isinstance(original, uuid.UUID):
+                index.original_to_references.setdefault(original, []).append(node)
+
+            nodes.extend(reversed(node.children))
+
+        return index
+
+    def node_from_uuid(self, uuid_):
+        return self.uuid_to_node.get(uuid_)
+
+    def nodes_of_types(self, types):
+        """
+        Get the nodes which are instances of the passed types.
+
+        Args:
+            types: type or tuple of types, as for `isinstance()`
+
+        Returns:
+            list of nodes
+        """
+        return [
+            node
+            for type_, nodes in self.type_to_nodes.items()
+            if issubclass(type_, types)
+            for node in nodes
         ]
-        if len(enumerations_root) == 0:
-            enumerations_root = None
-        else:
-            (enumerations_root,) = enumerations_root
-        self.parameters.list_selection_roots["enumerations"] = enumerations_root
 
-        if enumerations_root is None:
-            access_level_root = None
-        else:
-            (access_level_root,) = (
-                child
-                for child in enumerations_root.children
-                if child.name == "AccessLevel"
-            )
-        self.parameters.list_selection_roots["access level"] = access_level_root
+    def nodes_with_parameter_uuid(self):
+        """Get all nodes which have a parameter UUID set."""
+        return list(
+            itertools.chain.from_iterable(self.parameter_uuid_to_nodes.values())
+        )
 
-        # Save location of anomaly code enumeration
-        if enumerations_root is None:
-            anomaly_enumeration_root = None
-        else:
-            enum = [
-                child
-                for child in enumerations_root.children
-                if child.name == "AnomalyCode"
-            ]
-            anomaly_enumeration_root = enum[0] if len(enum) == 1 else None
-        self.anomalies.list_selection_roots["anomaly_codes"] = anomaly_enumeration_root
-
-        # Save location of anomaly response level enumeration
-        if enumerations_root is None:
-            anomaly_resp_level_root = None
-        else:
-            enum = [
-                child
-                for child in enumerations_root.children
-                if child.name == "AnomalyResponseLevel"
-            ]
-            anomaly_resp_level_root = enum[0] if len(enum) == 1 else None
-        self.anomalies.list_selection_roots[
-            "anomaly_response_levels"
-        ] = anomaly_resp_level_root
-
-        # Save location of anomaly trigger type enumeration
-        if enumerations_root is None:
-            anomaly_trig_type_root = None
-        else:
-            enum = [
-                child
-                for child in enumerations_root.children
-                if child.name == "AnomalyTriggerType"
-            ]
-            anomaly_trig_type_root = enum[0] if len(enum) == 1 else None
-        self.anomalies.list_selection_roots[
-            "anomaly_trigger_types"
-        ] = anomaly_trig_type_root
-
-        if enumerations_root is None:
-            visibility_root = None
+    def nodes_by_parameter_uuid(self, parameter_uuid, types=object):
+        return [
+            node
+            for node in self.parameter_uuid_to_nodes.get(parameter_uuid, ())
+            if isinstance(node, types)
+        ]
+
+    def references_to(self, original, types=object):
+        return [
+            node
+            for node in self.original_to_references.get(original, ())
+            if isinstance(node, types)
+        ]
+
+
+@attr.s
+class ProjectIndex:
+    """
+    Lazily built `ModelIndex` for each of the project models.
+
+    An index is dropped when its model reports a structural or data change
+    so exporters can share the lookups rather than each walking the trees.
+    Changes to fields without a column, such as references, are not
+    reported by the models.
+    """
+
+    models = attr.ib()
+    _indexes = attr.ib(factory=dict, init=False)
+    _connected = attr.ib(factory=list, init=False)
+    _can_identifiers = attr.ib(default=None, init=False)
+
+    def __getitem__(self, name):
+        model = self.models[name]
+        cached = self._indexes.get(name)
+
+        if cached is not None and cached[0] is model:
+            return cached[1]
+
+        if model is None:
+            index = ModelIndex.build(root=None)
         else:
-            (visibility_root,) = (
-                child
-                for child in enumerations_root.children
-                if child.name == "CmmControlsVariant"
-            )
-        self.parameters.list_selection_roots["visibility"] = visibility_root
+            self._connect(name=name, model=model)
+            index = ModelIndex.build(root=model.root)
+
+        self._indexes[name] = (model, index)
 
-        if enumerations_root is None:
-            sunspec_types_root = None
-            staticmodbus_types_root = None
-            aggregation = None
+        return index
+
+    def invalidate(self, name=None):
+        if name is None:
+            self._indexes.clear()
         else:
-            sunspec_types_root = [
-                child
-                for child in enumerations_root.children
-                if child.name == "SunSpecTypes"
-            ]
-            if len(sunspec_types_root) == 1:
-                (sunspec_types_root,) = sunspec_types_root
-            else:
-                sunspec_types_root = None
-
-            staticmodbus_types_root = [
-                child
-                for child in enumerations_root.children
-                if child.name == "StaticModbusTypes"
-            ]
-            if len(staticmodbus_types_root) == 1:
-                (staticmodbus_types_root,) = staticmodbus_types_root
-            else:
-                staticmodbus_types_root = None
-
-            aggregation = [
-                child
-                for child in enumerations_root.children
-                if child.name == "ModbusAggregation"
-            ]
-            if len(aggregation) == 1:
-                aggregation = aggregation[0]
-            else:
-                aggregation = None
+            self._indexes.pop(name, None)
 
-        self.parameters.list_selection_roots["sunspec types"] = sunspec_types_root
-        self.sunspec1.list_selection_roots["sunspec types"] = sunspec_types_root
-        self.sunspec1.list_selection_roots["enumerations"] = enumerations_root
-        self.sunspec2.list_selection_roots["sunspec types"] = sunspec_types_root
-        self.sunspec2.list_selection_roots["enumerations"] = enumerations_root
+    def can_identifiers(self):
+        """
+        Get the index of the CAN arbitration and multiplexer IDs.  Unlike the
+        other indexes it is updated as the CAN model changes rather than
+        dropped.
 
-        self.staticmodbus.list_selection_roots[
-            "staticmodbus types"
-        ] = staticmodbus_types_root
-        self.staticmodbus.list_selection_roots["enumerations"] = enumerations_root
+        Returns:
+            the `mpm.canmodel.IdentifierIndex`
+        """
+        model = self.models.can
 
-        self.can.list_selection_roots["enumerations"] = enumerations_root
+        if self._can_identifiers is None or self._can_identifiers[0] is not model:
+            index = mpm.canmodel.IdentifierIndex.build(root=model.root)
+            index.connect(model)
+            self._can_identifiers = (model, index)
+
+        return self._can_identifiers[1]
+
+    def _connect(self, name, model):
+        if any(connected is model for connected in self._connected):
+            return
 
-        self.staticmodbus.list_selection_roots["aggregation"] = aggregation
-        self.sunspec1.list_selection_roots["aggregation"] = aggregation
-        self.sunspec2.list_selection_roots["aggregation"] = aggregation
+        self._connected.append(model)
 
-        self.parameters.update_nodes()
-        self.can.update_nodes()
-        self.sunspec1.update_nodes()
-        self.sunspec2.update_nodes()
-        self.staticmodbus.update_nodes()
-        self.anomalies.update_nodes()
+        def invalidate(*args, name=name):
+            self.invalidate(name=name)
+
+        item_model = model.model
+        for signal in (
+            item_model.dataChanged,
+            item_model.rowsInserted,
+            item_model.rowsRemoved,
+            item_model.rowsMoved,
+            item_model.layoutChanged,
+            item_model.modelReset,
+        ):
+            signal.connect(invalidate)
+
+
+@attr.s
+class ChangeTracker:
+    """
+    Which project models have changed since they were loaded or last saved.
+
+    A model is unchanged while it is the same model last recorded for the
+    same path and it has not reported a change since.  As with
+    `ProjectIndex`, changes to fields without a column are not reported by
+    the models and need a `mark()`.
+    """
+
+    _recorded = attr.ib(factory=dict, init=False)
+    _dirty = attr.ib(factory=set, init=False)
+    _connected = attr.ib(factory=list, init=False)
+
+    def mark(self, name):
+        """Mark the named model as changed."""
+        self._dirty.add(name)
+
+    def record(self, name, model, path):
+        """
+        Record that a model matches its file, as when just loaded or saved.
+
+        Args:
+            name: name of the model
+            model: the attrs model
+            path: file the model was loaded from or saved to
+        """
+        self._connect(name=name, model=model)
+        self._recorded[name] = (model, os.path.abspath(path))
+        self._dirty.discard(name)
+
+    def is_changed(self, name, model, path):
+        """
+        Check whether a model needs to be written to save it to the path.
+
+        Args:
+            name: name of the model
+            model: the attrs model
+            path: file the model is to be saved to
+
+        Returns:
+            True unless the model has been recorded for the path and has not
+            changed since
+        """
+        recorded = self._recorded.get(name)
+
+        return (
+            recorded is None
+            or recorded[0] is not model
+            or recorded[1] != os.path.abspath(path)
+            or name in self._dirty
+        )
+
+    def _connect(self, name, model):
+        if any(connected is model for connected in self._connected):
+            return
+
+        self._connected.append(model)
+
+        def mark(*args, name=name, model=model):
+            recorded = self._recorded.get(name)
+            if recorded is not None and recorded[0] is model:
+                self.mark(name=name)
+
+        item_model = model.model
+        for signal in (
+            item_model.dataChanged,
+            item_model.rowsInserted,
+            item_model.rowsRemoved,
+            item_model.rowsMoved,
+            item_model.layoutChanged,
+            item_model.modelReset,
+        ):
+            signal.connect(mark)
 
 
 @graham.schemify(tag="project")
@@ -411,14 +771,57 @@ class Project:
     models = attr.ib(default=attr.Factory(Models))
     filters = attr.ib(default=(("Parameter Project", ["pmp"]), ("All Files", ["*"])))
     data_filters = attr.ib(default=(("Dataset", ["json"]), ("All Files", ["*"])))
+    # Load the models as `mpm.headless.Model`, for use without views
+    headless = attr.ib(default=False)
+    index = attr.ib(
+        default=attr.Factory(
+            lambda self: ProjectIndex(models=self.models),
+            takes_self=True,
+        ),
+        init=False,
+        eq=False,
+        repr=False,
+    )
+    changes = attr.ib(
+        default=attr.Factory(ChangeTracker),
+        init=False,
+        eq=False,
+        repr=False,
+    )
 
-    def save(self, parent=None):
+    def resolve(self, path):
+        """Get a model path relative to the project file's directory."""
+        if self.filename is None:
+            return pathlib.Path(path)
+
+        return self.filename.parents[0] / path
+
+    def save(self, parent=None, executor=None):
+        """
+        Save the project file along with the models which have changed since
+        they were loaded or last saved.  The models are serialized before
+        returning so they may be edited while the files are written.
+
+        Args:
+            parent: parent widget of the dialogs asking for missing paths
+            executor: `concurrent.futures.Executor` to write the files with,
+                written before returning when None
+
+        Returns:
+            future of the list of the paths written when an executor is
+            passed, otherwise the list itself
+        """
 
         # Update anomaly code enumrations before saving
-        update_anomaly_enums(
-            self.models.anomalies,
-            self.models.anomalies.list_selection_roots["anomaly_codes"],
-        )
+        anomaly_codes = self.models.anomalies.list_selection_roots["anomaly_codes"]
+        anomaly_enumerators = list(getattr(anomaly_codes, "children", ()))
+        update_anomaly_enums(self.models.anomalies, anomaly_codes)
+        if anomaly_codes is not None and not all_identical(
+            anomaly_enumerators,
+            anomaly_codes.children,
+        ):
+            # The enumerators are replaced without the model reporting it
+            self.changes.mark("parameters")
 
         if self.filename is None:
             project_path = epyqlib.utils.qt.file_dialog(
@@ -455,57 +858,155 @@ class Project:
 
         self.paths = paths
 
-        with open(self.filename, "w", newline="\n") as f:
-            s = graham.dumps(self, indent=4).data
-            f.write(s)
+        writes = {self.filename: mpm.serialization.dumps(self, indent=4)}
+        names = []
 
-            if not s.endswith("\n"):
-                f.write("\n")
+        for name, model in self.models.items():
+            path = project_directory / paths[name]
 
-        for path, model in zip(paths.values(), self.models.values()):
-            s = graham.dumps(model.root, indent=4).data
+            if self.changes.is_changed(name=name, model=model, path=path):
+                with mpm.profiling.stage(f"dump {name}"):
+                    writes[path] = mpm.serialization.dumps(model.root, indent=4)
 
-            with open(project_directory / path, "w", newline="\n") as f:
-                f.write(s)
+                self.changes.record(name=name, model=model, path=path)
+                names.append(name)
 
-                if not s.endswith("\n"):
-                    f.write("\n")
+        if executor is None:
+            return write_files(writes=writes)
 
+        future = executor.submit(write_files, writes=writes)
 
-def load_model(project, path, root_type, columns, drop_sources=()):
-    resolved_path = path
-    if project.filename is not None:
-        resolved_path = project.filename.parents[0] / resolved_path
+        def done(future):
+            if future.exception() is not None:
+                # Write them again on the next save
+                for name in names:
+                    self.changes.mark(name)
 
-    with open(resolved_path) as f:
-        raw = f.read()
+        future.add_done_callback(done)
 
-    root_schema = graham.schema(root_type)
-    root = root_schema.loads(raw).data
+        return future
 
-    def collect(node, payload):
-        payload[node.uuid] = node
 
-    uuid_to_node = {}
-    root.traverse(call_this=collect, payload=uuid_to_node, internal_nodes=True)
+def all_identical(a, b):
+    return len(a) == len(b) and all(x is y for x, y in zip(a, b))
 
-    def update(node, payload):
-        for field in attr.fields(type(node)):
-            if field.metadata.get(graham.core.metadata_key) is None or not isinstance(
-                field.metadata.get(graham.core.metadata_key).field,
-                epyqlib.attrsmodel.Reference,
-            ):
-                continue
 
-            value = getattr(node, field.name)
-            original = payload.get(value)
-            if original is not None:
-                setattr(node, field.name, original)
+def write_files(writes):
+    """
+    Atomically write the serialized project files, skipping those which are
+    unchanged.
+
+    Args:
+        writes: dict of paths to serialized contents
+
+    Returns:
+        list of the paths written
+    """
+    written = []
+
+    for path, s in writes.items():
+        if not s.endswith("\n"):
+            s += "\n"
+
+        if mpm.outputs.write_text(path=path, text=s):
+            written.append(path)
+
+    return written
+
+
+def load_model(project, path, root_type, columns, types, drop_sources=()):
+    resolved_path = project.resolve(path)
+
+    with open(resolved_path) as f:
+        raw = f.read()
+
+    root = None
+    if model_cache is not None:
+        root = model_cache.load(source=resolved_path, raw=raw, types=types)
+
+    if root is None:
+        root = mpm.serialization.loads(raw, root_type)
+
+        if model_cache is not None:
+            try:
+                model_cache.store(
+                    source=resolved_path,
+                    raw=raw,
+                    types=types,
+                    root=root,
+                )
+            except Exception:
+                # The model loaded fine, failing to cache it only costs the
+                # next load some time.
+                logger.warning("Unable to cache %s", resolved_path, exc_info=True)
 
-    root.traverse(call_this=update, payload=uuid_to_node, internal_nodes=True)
+    resolve_references(root)
 
-    return epyqlib.attrsmodel.Model(
+    return model_class(project)(
         root=root,
         columns=columns,
         drop_sources=drop_sources,
     )
+
+
+@functools.lru_cache(maxsize=None)
+def reference_fields(cls):
+    """
+    Get the names of the fields serialized as references to other nodes.
+
+    Args:
+        cls: node type
+
+    Returns:
+        tuple of field names
+    """
+    names = []
+
+    for field in attr.fields(cls):
+        metadata = field.metadata.get(graham.core.metadata_key)
+        if metadata is not None and isinstance(
+            metadata.field,
+            epyqlib.attrsmodel.Reference,
+        ):
+            names.append(field.name)
+
+    return tuple(names)
+
+
+def resolve_references(*roots, uuid_to_node=None):
+    """
+    Replace the UUIDs held in reference fields with the referenced nodes.
+
+    The trees are walked once to both index the nodes and collect the
+    reference fields, only the collected fields are then revisited.
+
+    Args:
+        roots: roots of the trees to resolve references in
+        uuid_to_node: optional index of nodes by UUID to add to and resolve
+                      from, share it between calls to resolve references
+                      across models
+
+    Returns:
+        the index of nodes by UUID
+    """
+    if uuid_to_node is None:
+        uuid_to_node = {}
+
+    references = []
+
+    nodes = list(reversed(roots))
+    while len(nodes) > 0:
+        node = nodes.pop()
+
+        uuid_to_node[node.uuid] = node
+        for name in reference_fields(type(node)):
+            references.append((node, name))
+
+        nodes.extend(reversed(node.children))
+
+    for node, name in references:
+        original = uuid_to_node.get(getattr(node, name))
+        if original is not None:
+            setattr(node, name, original)
+
+    return uuid_to_node
@@ -0,0 +1,473 @@
+"""Fast JSON serialization of the graham schemified model nodes.
+
+`graham` dumps and loads each node through its marshmallow schema, which
+dispatches every field through the marshalling machinery.  Here each schema
+is instead compiled once into a plan of per field converters which build the
+same dicts, and the same attrs instances, directly.  Values without a fast
+path are converted by their marshmallow field and schemas the plans can't
+express are left to marshmallow, so the results match graham.  Should a fast
+conversion fail, such as for invalid input, the whole document is handled by
+graham again so that the same errors are raised.
+
+Equal string and UUID values loaded for the fields of a document, such as the
+type and parameter UUIDs many nodes refer to, are shared between the nodes
+rather than each holding its own copy.
+"""
+
+import decimal
+import functools
+import json
+import typing
+import uuid
+
+import attr
+import graham
+import graham.core
+import graham.fields
+import marshmallow
+import marshmallow.decorators
+
+missing = marshmallow.missing
+type_key = graham.core.type_attribute_name
+
+
+class UnsupportedSchemaError(Exception):
+    pass
+
+
+@attr.s(frozen=True)
+class Plan:
+    """
+    Converters for the fields of one schema.
+
+    `dumpers` hold the key and a callable getting the serialized value from
+    a node, `loaders` hold a callable adding the deserialized value of a
+    field to the keyword arguments of the node being loaded.  The loaders
+    also take the values already loaded for the document, to share them.
+    """
+
+    schema = attr.ib()
+    dumpers = attr.ib()
+    loaders = attr.ib()
+
+
+def dumps(instance, **kwargs) -> str:
+    """
+    Serialize a node to JSON, as `graham.dumps(instance, **kwargs).data`.
+
+    Args:
+        instance: graham schemified node
+        kwargs: passed to `json.dumps()`
+
+    Returns:
+        the JSON
+    """
+    try:
+        data = dump(instance)
+    except Exception:
+        return graham.dumps(instance, **kwargs).data
+
+    return json.dumps(data, **kwargs)
+
+
+def loads(s: str, cls: type):
+    """
+    Deserialize a node from JSON, as `graham.schema(cls).loads(s).data`.
+
+    Args:
+        s: the JSON
+        cls: graham schemified type of the node
+
+    Returns:
+        the node
+    """
+    try:
+        return load(json.loads(s), cls)
+    except Exception:
+        return graham.schema(cls).loads(s).data
+
+
+def dump(instance) -> typing.Dict[str, typing.Any]:
+    """Serialize a node to JSON compatible data, as `graham.dump()`."""
+    return dump_with(graham.schema(instance), instance)
+
+
+def load(data: typing.Dict[str, typing.Any], cls: type):
+    """Deserialize a node from JSON compatible data, as a graham schema."""
+    return load_with(graham.schema(cls), data, shared={})
+
+
+def dump_with(schema, instance):
+    plan = plan_for(schema)
+
+    if plan is None:
+        return schema.dump(instance).data
+
+    return {key: value for key, value in _dumped(plan.dumpers, instance)}
+
+
+def _dumped(dumpers, instance):
+    for key, dumper in dumpers:
+        value = dumper(instance)
+
+        if value is not missing:
+            yield key, value
+
+
+def load_with(schema, data, shared):
+    plan = plan_for(schema)
+
+    if plan is None:
+        return schema.load(data).data
+
+    if type(data) is not dict:
+        raise TypeError(f"Expected a dict, got {type(data).__name__}")
+
+    kwargs = {}
+    for loader in plan.loaders:
+        loader(data, kwargs, shared)
+
+    # graham's post load hook removes the tags and creates the node
+    return schema.deserialize(kwargs)
+
+
+@functools.lru_cache(maxsize=None)
+def plan_for(schema) -> typing.Optional[Plan]:
+    """
+    Compile the plan for a schema.
+
+    Args:
+        schema: graham schema instance
+
+    Returns:
+        the plan, None when the schema has to be handled by marshmallow
+    """
+    try:
+        check_schema(schema)
+    except UnsupportedSchemaError:
+        return None
+
+    dumpers = []
+    loaders = []
+
+    for name, field in schema.fields.items():
+        try:
+            dumper = create_dumper(schema=schema, name=name, field=field)
+            loader = create_loader(name=name, field=field)
+        except UnsupportedSchemaError:
+            return None
+
+        if dumper is not None:
+            dumpers.append(dumper)
+
+        if loader is not None:
+            loaders.append(loader)
+
+    return Plan(schema=schema, dumpers=tuple(dumpers), loaders=tuple(loaders))
+
+
+def check_schema(schema):
+    """Raise `UnsupportedSchemaError` unless a plan can express the schema."""
+    if (
+        schema.many
+        or schema.only is not None
+        or len(schema.exclude) > 0
+        or schema.prefix != ""
+        or schema.extra is not None
+        or len(schema.load_only) > 0
+        or len(schema.dump_only) > 0
+        or not schema.ordered
+    ):
+        raise UnsupportedSchemaError("Unsupported schema options")
+
+    processors = {
+        tag: names for tag, names in type(schema).__processors__.items() if names
+    }
+    expected = {(marshmallow.decorators.POST_LOAD, False): ["deserialize"]}
+
+    if processors != expected:
+        raise UnsupportedSchemaError("Only graham's post load hook is supported")
+
+    data_class = getattr(schema, "data_class", None)
+
+    if data_class is None or hasattr(data_class, "__getitem__"):
+        # marshmallow would get the values by key rather than attribute
+        raise UnsupportedSchemaError("Values must be attributes")
+
+
+def create_dumper(schema, name, field):
+    if field.load_only:
+        return None
+
+    attribute = name if field.attribute is None else field.attribute
+    key = field.dump_to or name
+
+    if not field._CHECK_ATTRIBUTE or "." in attribute:
+        return key, functools.partial(
+            field.serialize,
+            name,
+            accessor=schema.get_attribute,
+        )
+
+    serialize = value_serializer(name=name, field=field)
+    default = getattr(field, "default", missing)
+
+    def dumper(instance):
+        value = getattr(instance, attribute, missing)
+
+        if value is missing:
+            return default() if callable(default) else default
+
+        if callable(value):
+            value = value()
+
+        return serialize(value, instance)
+
+    return key, dumper
+
+
+def value_serializer(name, field):
+    """
+    Create a callable serializing a value as `field._serialize()` does.
+
+    Args:
+        name: name of the field in its schema
+        field: bound marshmallow field
+
+    Returns:
+        callable taking the value and the node it is from
+    """
+
+    def generic(value, instance):
+        return field._serialize(value, name, instance)
+
+    field_type = type(field)
+
+    if field_type is marshmallow.fields.String:
+
+        def serialize(value, instance):
+            if type(value) is str:
+                return value
+
+            return generic(value, instance)
+
+    elif field_type is marshmallow.fields.UUID:
+
+        def serialize(value, instance):
+            if type(value) is uuid.UUID:
+                return str(value)
+
+            return generic(value, instance)
+
+    elif field_type is marshmallow.fields.Integer and not field.as_string:
+
+        def serialize(value, instance):
+            if type(value) is int:
+                return value
+
+            return generic(value, instance)
+
+    elif field_type is marshmallow.fields.Boolean:
+
+        def serialize(value, instance):
+            if value is True or value is False:
+                return value
+
+            return generic(value, instance)
+
+    elif (
+        field_type is marshmallow.fields.Decimal
+        and field.as_string
+        and field.places is None
+    ):
+
+        def serialize(value, instance):
+            if type(value) is decimal.Decimal and value.is_finite():
+                return format(value, "f")
+
+            return generic(value, instance)
+
+    elif (
+        field_type in (marshmallow.fields.List, graham.fields.Tuple)
+        and field.container.attribute is None
+    ):
+        serialize_each = value_serializer(name=name, field=field.container)
+
+        def serialize(value, instance):
+            if type(value) is list or type(value) is tuple:
+                return [serialize_each(each, instance) for each in value]
+
+            return generic(value, instance)
+
+    elif (
+        field_type is marshmallow.fields.Nested
+        and not field.many
+        and field.only is None
+        and len(field.exclude) == 0
+    ):
+
+        def serialize(value, instance):
+            if value is None:
+                return None
+
+            return dump_with(field.schema, value)
+
+    elif field_type is graham.fields.MixedList:
+        exclude = field.exclude
+
+        def serialize(value, instance):
+            return [
+                dump_with(graham.schema(each), each)
+                for each in value
+                if not isinstance(each, exclude)
+            ]
+
+    else:
+        serialize = generic
+
+    return serialize
+
+
+def create_loader(name, field):
+    if field.dump_only:
+        return None
+
+    attribute = name if field.attribute is None else field.attribute
+
+    if "." in attribute:
+        raise UnsupportedSchemaError("Nested attributes are not supported")
+
+    load_from = field.load_from
+    deserialize = value_deserializer(name=load_from or name, field=field)
+
+    def loader(data, kwargs, shared):
+        value = data.get(name, missing)
+
+        if value is missing and load_from:
+            value = data.get(load_from, missing)
+
+        if value is missing:
+            value = field.missing() if callable(field.missing) else field.missing
+
+            if value is missing and not field.required:
+                return
+
+        value = deserialize(value, data, shared)
+
+        if value is not missing:
+            kwargs[attribute] = value
+
+    return loader
+
+
+def value_deserializer(name, field):
+    """
+    Create a callable deserializing a value as `field.deserialize()` does.
+
+    Args:
+        name: key of the field in the data
+        field: bound marshmallow field
+
+    Returns:
+        callable taking the value, the data it is from and the values shared
+        within the document
+    """
+
+    def generic(value, data, shared):
+        return field.deserialize(value, name, data)
+
+    if len(field.validators) > 0:
+        return generic
+
+    field_type = type(field)
+
+    if field_type is marshmallow.fields.String:
+
+        def deserialize(value, data, shared):
+            if type(value) is str:
+                return shared.setdefault(value, value)
+
+            return generic(value, data, shared)
+
+    elif field_type is marshmallow.fields.UUID:
+
+        def deserialize(value, data, shared):
+            if type(value) is str:
+                # Keyed apart from the equal string values
+                key = (uuid.UUID, value)
+                result = shared.get(key)
+
+                if result is None:
+                    result = shared[key] = uuid.UUID(value)
+
+                return result
+
+            return generic(value, data, shared)
+
+    elif field_type is marshmallow.fields.Integer:
+
+        def deserialize(value, data, shared):
+            if type(value) is int:
+                return value
+
+            return generic(value, data, shared)
+
+    elif field_type is marshmallow.fields.Boolean:
+
+        def deserialize(value, data, shared):
+            if value is True or value is False:
+                return value
+
+            return generic(value, data, shared)
+
+    elif field_type is marshmallow.fields.Decimal and field.places is None:
+
+        def deserialize(value, data, shared):
+            if type(value) is str:
+                result = decimal.Decimal(value)
+
+                if result.is_finite():
+                    return result
+
+            return generic(value, data, shared)
+
+    elif field_type in (marshmallow.fields.List, graham.fields.Tuple):
+        deserialize_each = value_deserializer(name=name, field=field.container)
+        result_type = tuple if field_type is graham.fields.Tuple else list
+
+        def deserialize(value, data, shared):
+            if type(value) is list:
+                return result_type(
+                    deserialize_each(each, value, shared) for each in value
+                )
+
+            return generic(value, data, shared)
+
+    elif (
+        field_type is marshmallow.fields.Nested
+        and not field.many
+        and field.only is None
+        and len(field.exclude) == 0
+    ):
+
+        def deserialize(value, data, shared):
+            if type(value) is dict:
+                return load_with(field.schema, value, shared)
+
+            return generic(value, data, shared)
+
+    elif field_type is graham.fields.MixedList:
+
+        def deserialize(value, data, shared):
+            if type(value) is list:
+                return [
+                    load_with(field.get_cls_or_instance(each[type_key]), each, shared)
+                    for each in value
+                ]
+
+            return generic(value, data, shared)
+
+    else:
+        deserialize = generic
+
+    return deserialize
@@ -1,3 +1,8 @@
+import concurrent.futures
+import hashlib
+import json
+import os
+import pathlib
 import re
 
 import attr
@@ -5,6 +10,12 @@ import lxml.etree
 import xmldiff.diff
 import xmldiff.main
 
+import mpm
+import mpm.modelcache
+
+
+format_version = 1
+
 
 @attr.s(frozen=True)
 class ErrorLogEntry:
@@ -169,6 +180,15 @@ def remove_elements_by_name(tree, names):
     return tree
 
 
+def canonical_hash(tree):
+    """Hash the canonical (C14N) form of an element tree."""
+    return hashlib.sha256(lxml.etree.tostring(tree, method="c14n")).hexdigest()
+
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
 def compare_to_reference(subject, reference):
     trimmed_subject, trimmed_reference = (
         remove_elements_by_name(tree=tree, names=("description", "notes"))
@@ -178,6 +198,9 @@ def compare_to_reference(subject, reference):
     for element in vendor_specific_elements(trimmed_subject):
         remove_element(element=element)
 
+    if canonical_hash(trimmed_subject) == canonical_hash(trimmed_reference):
+        return ()
+
     diff = xmldiff.main.diff_trees(trimmed_reference, trimmed_subject)
 
     return tuple(
@@ -226,3 +249,210 @@ class PairedPaths:
             only_left=only_left,
             only_right=only_right,
         )
+
+
+def load_schema(path):
+    schema = lxml.etree.fromstring(pathlib.Path(path).read_bytes())
+
+    return lxml.etree.XMLSchema(schema, attribute_defaults=True)
+
+
+@attr.s(frozen=True)
+class Validation:
+    """An SMDX file to validate, against a reference file when one is set."""
+
+    subject = attr.ib()
+    reference = attr.ib(default=None)
+
+    def cache_key(self, schema_hash):
+        if self.reference is None:
+            reference_hash = None
+        else:
+            reference_hash = hash_bytes(self.reference.read_bytes())
+
+        return [schema_hash, reference_hash, hash_bytes(self.subject.read_bytes())]
+
+    def run(self, schema):
+        if self.reference is None:
+            return validate_against_schema(subject=self.subject, schema=schema)
+
+        return validate_against_reference(
+            subject=lxml.etree.fromstring(self.subject.read_bytes()),
+            schema=schema,
+            reference=lxml.etree.fromstring(self.reference.read_bytes()),
+        )
+
+
+# Schema parsed once by each validation pool worker, lxml schemas can not be
+# pickled and keep the error log of their last validation.
+_worker_schema = None
+
+
+def _initialize_worker(schema_path):
+    global _worker_schema
+
+    _worker_schema = load_schema(schema_path)
+
+
+def _validate_in_worker(validation):
+    return validation.run(schema=_worker_schema)
+
+
+def default_cache_directory():
+    """
+    Get the validation result cache directory, beside the model cache and
+    disabled along with it.
+    """
+    directory = mpm.modelcache.cache_directory()
+    if directory is None:
+        return None
+
+    return directory / "smdx"
+
+
+def default_version():
+    """
+    Identify the code producing validation results, development builds of mpm
+    are all version 0.0.0 so the commit is included.
+
+    Returns:
+        JSON compatible list
+    """
+    return [
+        mpm.__version__,
+        mpm.__sha__,
+        mpm.modelcache.distribution_version("pysunspec"),
+    ]
+
+
+@attr.s
+class ValidationCache:
+    """
+    Persistent validation results keyed by the hashes of the schema,
+    reference and subject files.
+    """
+
+    directory = attr.ib()
+    version = attr.ib(factory=default_version)
+
+    def full_key(self, key):
+        return [format_version, self.version, *key]
+
+    def path_for(self, key):
+        name = hash_bytes(json.dumps(self.full_key(key)).encode("utf-8"))
+
+        return pathlib.Path(self.directory) / f"{name}.json"
+
+    def load(self, key):
+        """
+        Get the cached result for the key.
+
+        Returns:
+            `ValidationResult`, None if not cached
+        """
+        if self.directory is None:
+            return None
+
+        try:
+            raw = json.loads(self.path_for(key).read_text(encoding="utf-8"))
+
+            if raw["key"] != self.full_key(key):
+                return None
+
+            return ValidationResult(failed=raw["failed"], notes=raw["notes"])
+        except Exception:
+            # Any unreadable or incompatible entry just means validating again
+            return None
+
+    def store(self, key, result):
+        if self.directory is None:
+            return
+
+        path = self.path_for(key)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+        raw = {
+            "key": self.full_key(key),
+            "failed": result.failed,
+            "notes": result.notes,
+        }
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temporary.write_text(json.dumps(raw), encoding="utf-8")
+            os.replace(temporary, path)
+        except OSError:
+            # Caching is only an optimization
+            try:
+                temporary.unlink()
+            except OSError:
+                pass
+
+
+def validate_all(validations, schema_path, jobs=1, cache=None):
+    """
+    Run the validations, in a process pool when more than one job is
+    requested.
+
+    Args:
+        validations: `Validation` instances to run
+        schema_path: path to the SMDX XSD
+        jobs: maximum number of validations to run at once
+        cache: optional `ValidationCache` to reuse and record results in
+
+    Returns:
+        iterable of each validation with its `ValidationResult`, in the order
+        the validations were passed and as they complete
+    """
+    validations = list(validations)
+
+    if cache is None:
+        yield from _run_validations(
+            validations=validations,
+            schema_path=schema_path,
+            jobs=jobs,
+        )
+        return
+
+    schema_hash = hash_bytes(pathlib.Path(schema_path).read_bytes())
+    keys = [validation.cache_key(schema_hash=schema_hash) for validation in validations]
+    cached = [cache.load(key) for key in keys]
+
+    results = _run_validations(
+        validations=[
+            validation
+            for validation, result in zip(validations, cached)
+            if result is None
+        ],
+        schema_path=schema_path,
+        jobs=jobs,
+    )
+
+    for validation, key, result in zip(validations, keys, cached):
+        if result is None:
+            _, result = next(results)
+            cache.store(key, result)
+
+        yield validation, result
+
+
+def _run_validations(validations, schema_path, jobs):
+    if len(validations) == 0:
+        return
+
+    if jobs <= 1 or len(validations) <= 1:
+        schema = load_schema(schema_path)
+
+        for validation in validations:
+            yield validation, validation.run(schema=schema)
+
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=min(jobs, len(validations)),
+        initializer=_initialize_worker,
+        initargs=(schema_path,),
+    ) as executor:
+        results = executor.map(_validate_in_worker, validations)
+
+        yield from zip(validations, results)
@@ -12,8 +12,7 @@ import epyqlib.utils
 import epyqlib.utils.qt
 
 import mpm.canmodel
-
-from PyQt5 import QtWidgets
+import mpm.headless
 
 
 class ConsistencyError(Exception):
@@ -188,60 +187,23 @@ def find_can_signals(root) -> list:
     return results
 
 
-class ScaleFactorDelegate(QtWidgets.QStyledItemDelegate):
-    def __init__(self, text_column_name, root, parent):
-        super().__init__(parent)
-
-        self.root = root
-
-    def createEditor(self, parent, option, index):
-        return QtWidgets.QListWidget(parent=parent)
-
-    def setEditorData(self, editor, index):
-        model_index = epyqlib.attrsmodel.to_source_model(index)
-        model = model_index.model()
-
-        item = model.itemFromIndex(model_index)
-        attrs_model = item.data(epyqlib.utils.qt.UserRoles.attrs_model)
-
-        raw = model.data(model_index, epyqlib.utils.qt.UserRoles.raw)
+def ScaleFactorDelegate(text_column_name, root, parent):
+    # Qt widgets are only imported once a view needs an editor
+    import mpm.delegates
 
-        points = []
-        for pt in self.root.children:
-            if hasattr(pt, "type_uuid"):
-                type_node = attrs_model.node_from_uuid(pt.type_uuid)
-                if type_node.name == "staticmodbussf":
-                    points.append(pt)
-
-        it = QtWidgets.QListWidgetItem(editor)
-        it.setText("")
-        it.setData(epyqlib.utils.qt.UserRoles.raw, "")
-        it.setSelected(True)
-        for p in points:
-            it = QtWidgets.QListWidgetItem(editor)
-            param = attrs_model.node_from_uuid(p.parameter_uuid)
-            it.setText(param.abbreviation)
-            it.setData(epyqlib.utils.qt.UserRoles.raw, p.uuid)
-            if p.uuid == raw:
-                it.setSelected(True)
-
-        editor.setMinimumHeight(editor.sizeHint().height())
-        editor.itemClicked.connect(
-            lambda: epyqlib.attrsmodel.hide_popup(editor),
-        )
-        editor.show()
-
-    def setModelData(self, editor, model, index):
-        selected_item = editor.currentItem()
-        datum = str(selected_item.data(epyqlib.utils.qt.UserRoles.raw))
-        model.setData(index, datum)
+    return mpm.delegates.ScaleFactorDelegate(
+        type_name="staticmodbussf",
+        text_column_name=text_column_name,
+        root=root,
+        parent=parent,
+    )
 
 
 @graham.schemify(tag="function_data", register=True)
 @epyqlib.attrsmodel.ify()
-@epyqlib.utils.qt.pyqtify()
+@mpm.headless.pyqtify()
 @attr.s(hash=False)
-class FunctionData(epyqlib.treenode.TreeNode):
+class FunctionData(mpm.headless.TreeNode):
     factor_uuid = create_factor_uuid_attribute()
     parameter_uuid = create_parameter_uuid_attribute()
 
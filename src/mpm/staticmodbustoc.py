@@ -2,6 +2,7 @@ import attr
 import pathlib
 import typing
 import mpm.mpm_helper
+import mpm.outputs
 import mpm.staticmodbusmodel
 import epyqlib.attrsmodel
 import epyqlib.utils.general
@@ -89,9 +90,10 @@ class Root:
             "};",
         ]
 
-        with self.c_path.open("w", newline="\n") as c_file:
-            c_file.write(mpm.c.format_nested_lists(c_lines).strip())
-            c_file.write("\n")
+        mpm.outputs.write_text(
+            path=self.c_path,
+            text=mpm.c.format_nested_lists(c_lines).strip() + "\n",
+        )
 
         h_lines = [
             "#ifndef __STATICMODBUS_INTERFACE_GEN_H__",
@@ -125,9 +127,10 @@ class Root:
             "#endif //__STATICMODBUS_INTERFACE_GEN_H__",
         ]
 
-        with self.h_path.open("w", newline="\n") as h_file:
-            h_file.write(mpm.c.format_nested_lists(h_lines).strip())
-            h_file.write("\n")
+        mpm.outputs.write_text(
+            path=self.h_path,
+            text=mpm.c.format_nested_lists(h_lines).strip() + "\n",
+        )
 
 
 @builders(mpm.staticmodbusmodel.FunctionData)
@@ -2,18 +2,17 @@ from __future__ import (
     annotations,
 )  # See PEP 563, check to remove in future Python version higher than 3.7
 import attr
-import openpyxl
 import pathlib
 import typing
 
 import mpm
 import mpm.mpm_helper
 import mpm.staticmodbusmodel
+import mpm.xlsx
 import epyqlib.attrsmodel
 import epyqlib.pm.parametermodel
 import epyqlib.utils.general
 
-
 builders = epyqlib.utils.general.TypeMap()
 
 
@@ -89,7 +88,6 @@ def export(
 
     workbook = builder.gen()
 
-    path.parent.mkdir(parents=True, exist_ok=True)
     workbook.save(path)
 
 
@@ -103,42 +101,64 @@ class Root:
     parameter_uuid_finder = attr.ib(default=None, type=typing.Callable)
     parameter_model = attr.ib(default=None, type=epyqlib.attrsmodel.Model)
 
-    def gen(self) -> openpyxl.workbook.workbook.Workbook:
+    def gen(self) -> mpm.xlsx.Workbook:
         """
         Excel spreadsheet generator for the static modbus root class.
         Returns:
             workbook: generated Excel workbook
         """
-        workbook = openpyxl.Workbook()
-        workbook.remove(workbook.active)
-        modbus_worksheet = workbook.create_sheet("Static Modbus Data")
-        enumeration_worksheet = workbook.create_sheet("Enumerations")
-        modbus_worksheet.append(field_names.as_filtered_tuple(self.column_filter))
-        enumeration_worksheet.append(["Enumerator", "Name", "Value"])
-
-        scale_factor_from_uuid = mpm.mpm_helper.build_uuid_scale_factor_dict(
-            points=self.wrapped.children,
-            parameter_uuid_finder=self.parameter_uuid_finder,
-        )
         enumerations = self.collect_enumerations()
-        enumerators_from_uuid = {}
-        for enumeration in enumerations:
-            enumerators_from_uuid[enumeration.uuid] = enumeration
 
-        # Collects the cell coordinates of each new enumerator as they're appended
+        # Collects the cell coordinates of the first enumerator of each enumeration
+        enumeration_rows = [["Enumerator", "Name", "Value"]]
         enumeration_cell_coordinates = {}
         ENUMERATION_ENUMERATOR_COLUMN = "#Enumerations!A"
         for enumeration in enumerations:
             for child in enumeration.children:
-                enumeration_worksheet.append(
-                    [enumeration.name, child.name, child.value]
-                )
+                enumeration_rows.append([enumeration.name, child.name, child.value])
                 if enumeration.name not in enumeration_cell_coordinates.keys():
                     enumeration_cell_coordinates[enumeration.name] = (
-                        ENUMERATION_ENUMERATOR_COLUMN
-                        + f"{enumeration_worksheet.max_row}"
+                        ENUMERATION_ENUMERATOR_COLUMN + f"{len(enumeration_rows)}"
                     )
 
+        # Cell hyperlinks are dropped by write only worksheets and the sheets
+        # are small
+        workbook = mpm.xlsx.Workbook(write_only=False)
+        workbook.create_sheet(
+            "Static Modbus Data",
+            rows=self.gen_rows(
+                enumerations=enumerations,
+                enumeration_cell_coordinates=enumeration_cell_coordinates,
+            ),
+        )
+        workbook.create_sheet("Enumerations", rows=enumeration_rows)
+
+        return workbook
+
+    def gen_rows(
+        self,
+        enumerations: list,
+        enumeration_cell_coordinates: typing.Dict[str, str],
+    ) -> typing.Iterator[typing.Tuple]:
+        """
+        Generate the static modbus data worksheet rows, starting with the header.
+        Enumerators are linked to their rows in the Enumerations worksheet.
+        Args:
+            enumerations: enumerations from the parameter model
+            enumeration_cell_coordinates: enumeration name to enumerator cell
+        Returns:
+            iterator of row values
+        """
+        yield field_names.as_filtered_tuple(self.column_filter)
+
+        scale_factor_from_uuid = mpm.mpm_helper.build_uuid_scale_factor_dict(
+            points=self.wrapped.children,
+            parameter_uuid_finder=self.parameter_uuid_finder,
+        )
+        enumerators_from_uuid = {}
+        for enumeration in enumerations:
+            enumerators_from_uuid[enumeration.uuid] = enumeration
+
         for member in self.wrapped.children:
             builder = builders.wrap(
                 wrapped=member,
@@ -148,20 +168,17 @@ class Root:
             )
             rows = builder.gen()
 
-            # Appends the rows of static modbus data
-            MODBUS_ENUMERATOR_COLUMN = "O"
             for row in rows:
-                modbus_worksheet.append(row.as_filtered_tuple(self.column_filter))
                 # Checks if there's an enumerator and hyperlinks it to the right row in
                 # the Enumerations worksheet
-                if row.enumerator is not None:
-                    max_row = modbus_worksheet.max_row
-                    if row.enumerator in enumeration_cell_coordinates.keys():
-                        modbus_worksheet[
-                            MODBUS_ENUMERATOR_COLUMN + f"{max_row}"
-                        ].hyperlink = enumeration_cell_coordinates[row.enumerator]
+                location = enumeration_cell_coordinates.get(row.enumerator)
+                if location is not None:
+                    row.enumerator = mpm.xlsx.Link(
+                        text=row.enumerator,
+                        location=location,
+                    )
 
-        return workbook
+                yield row.as_filtered_tuple(self.column_filter)
 
     def collect_enumerations(self) -> list:
         """
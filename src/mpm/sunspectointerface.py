@@ -6,6 +6,7 @@ import typing
 from collections.abc import Iterable
 
 import mpm.mpm_helper
+import mpm.outputs
 import mpm.sunspecmodel
 import epyqlib.utils.general
 
@@ -219,14 +220,10 @@ class Root:
         )
 
         # Output the overall .c file.
-        with self.c_path.open("w", newline="\n") as f:
-            for c_line in c_lines:
-                f.write(c_line)
+        mpm.outputs.write_text(path=self.c_path, text="".join(c_lines))
 
         # Output the overall .h file.
-        with self.h_path.open("w", newline="\n") as f:
-            for h_line in h_lines:
-                f.write(h_line)
+        mpm.outputs.write_text(path=self.h_path, text="".join(h_lines))
 
     def _pre_calculate_model_values(
         self, model_points: typing.List[typing.List[OutputPoint]]
@@ -1218,13 +1215,8 @@ class SpecificModel:
 
         h_lines.extend([f"\n#endif //{include_guard}\n"])
 
-        with c_file_path.open("w", newline="\n") as f:
-            for c_line in c_lines:
-                f.write(c_line)
-
-        with h_file_path.open("w", newline="\n") as f:
-            for h_line in h_lines:
-                f.write(h_line)
+        mpm.outputs.write_text(path=c_file_path, text="".join(c_lines))
+        mpm.outputs.write_text(path=h_file_path, text="".join(h_lines))
 
 
 @specific_builders(mpm.sunspecmodel.TableRepeatingBlock)
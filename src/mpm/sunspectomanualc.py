@@ -1,6 +1,7 @@
 import attr
 
 import mpm.c
+import mpm.outputs
 import mpm.sunspecmodel
 import mpm.sunspectoxlsx
 import epyqlib.utils.general
@@ -64,8 +65,10 @@ class Root:
                 "",
             ]
             lines.extend(builder.gen())
-            with path.open("w", newline="\n") as f:
-                f.write(mpm.c.format_nested_lists(lines).strip() + "\n")
+            mpm.outputs.write_text(
+                path=path,
+                text=mpm.c.format_nested_lists(lines).strip() + "\n",
+            )
 
 
 @builders(mpm.sunspecmodel.Model)
@@ -2,6 +2,7 @@ import attr
 
 import mpm.c
 import mpm.mpm_helper
+import mpm.outputs
 import mpm.sunspecmodel
 import mpm.sunspectoxlsx
 import epyqlib.utils.general
@@ -59,8 +60,10 @@ class Root:
                 f"#endif //{inc_guard}",
             ]
 
-            with path.open("w", newline="\n") as f:
-                f.write(mpm.c.format_nested_lists(lines).strip() + "\n")
+            mpm.outputs.write_text(
+                path=path,
+                text=mpm.c.format_nested_lists(lines).strip() + "\n",
+            )
 
 
 @builders(mpm.sunspecmodel.Model)
@@ -4,6 +4,7 @@ import epyqlib.utils.general
 import epyqlib.pm.parametermodel
 
 import mpm.mpm_helper
+import mpm.outputs
 import mpm.sunspecmodel
 
 
@@ -40,13 +41,8 @@ def export(c_path, h_path, sunspec_model, sunspec_id, skip_sunspec=False):
     h_lines = [auto_gen_line]
     h_lines.extend(h_content)
 
-    with c_path.open("w", newline="\n") as f:
-        for c_line in c_lines:
-            f.write(c_line)
-
-    with h_path.open("w", newline="\n") as f:
-        for h_line in h_lines:
-            f.write(h_line)
+    mpm.outputs.write_text(path=c_path, text="".join(c_lines))
+    mpm.outputs.write_text(path=h_path, text="".join(h_lines))
 
 
 # TODO: CAMPid 079549750417808543178043180
@@ -5,7 +5,6 @@ import itertools
 import math
 
 import attr
-import openpyxl
 import typing
 import uuid
 
@@ -16,6 +15,7 @@ import mpm.c
 import mpm.mpm_helper
 import mpm.sunspecmodel
 import mpm.sunspectointerface
+import mpm.xlsx
 
 from enum import Enum
 
@@ -136,7 +136,6 @@ def export(
 
     workbook = builder.gen()
 
-    path.parent.mkdir(parents=True, exist_ok=True)
     workbook.save(path)
 
 
@@ -153,8 +152,7 @@ class Root:
     output_dummy_models = attr.ib(default=True)
 
     def gen(self):
-        workbook = openpyxl.Workbook()
-        workbook.remove(workbook.active)
+        workbook = mpm.xlsx.Workbook()
 
         workbook.create_sheet("License Agreement")
         workbook.create_sheet("Summary")
@@ -214,7 +212,6 @@ class Model:
 
     def gen(self):
         self.worksheet.title = str(self.wrapped.id)
-        self.worksheet.append(field_names.as_filtered_tuple(self.column_filter))
 
         self.wrapped.children[0].check_offsets_and_length()
 
@@ -279,21 +276,34 @@ class Model:
             elif i == 1:
                 row.value = non_header_length
 
-            self.worksheet.append(row.as_filtered_tuple(self.column_filter))
+        self.worksheet.rows = self.gen_rows(rows=rows)
+
+        return overall_length
+
+    def gen_rows(self, rows):
+        """
+        Generate the worksheet rows, the enumerations are only built as the
+        sheet is written.
+
+        Args:
+            rows: point rows of the model blocks
+
+        Returns:
+            iterator of row values
+        """
+        yield field_names.as_filtered_tuple(self.column_filter)
+
+        for row in rows:
+            yield row.as_filtered_tuple(self.column_filter)
 
         for block in self.wrapped.children:
             builder = enumeration_builders.wrap(
                 wrapped=block,
                 parameter_uuid_finder=self.parameter_uuid_finder,
             )
-            rows = builder.gen()
 
-            for row in rows:
-                self.worksheet.append(
-                    row.as_filtered_tuple(self.column_filter),
-                )
-
-        return overall_length
+            for row in builder.gen():
+                yield row.as_filtered_tuple(self.column_filter)
 
 
 @builders(mpm.sunspecmodel.Table)
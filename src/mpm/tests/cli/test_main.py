@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+import click.testing
+
+import mpm.canmodel
+import mpm.cli.main
+import mpm.project
+
+
+def test_cli_does_not_import_gui():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, mpm.cli.main; print('\\n'.join(sorted(sys.modules)))",
+        ],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    modules = set(result.stdout.split())
+
+    assert "mpm.cli.main" in modules
+    assert {"mpm.__main__", "mpm.mainwindow", "mpm.importexportdialog"}.isdisjoint(
+        modules
+    )
+    assert "mpm.delegates" not in modules
+
+
+def test_validate_can_ids(tmp_path):
+    project = mpm.project.create_blank()
+    project.filename = tmp_path / "project.pmp"
+    for name in project.paths:
+        project.paths[name] = f"{name}.json"
+
+    root = project.models.can.root
+    root.append_child(mpm.canmodel.Message(name="First", identifier=0x100))
+    root.append_child(mpm.canmodel.Message(name="Second", identifier=0x100))
+    root.append_child(mpm.canmodel.Message(name="New"))
+    root.append_child(mpm.canmodel.Message(name="AlsoNew"))
+
+    message = mpm.canmodel.MultiplexedMessage(name="Multiplexed", identifier=0x200)
+    message.append_child(mpm.canmodel.Multiplexer(name="Unassigned"))
+    message.append_child(mpm.canmodel.Multiplexer(name="AlsoUnassigned"))
+    root.append_child(message)
+
+    project.save()
+
+    runner = click.testing.CliRunner()
+    result = runner.invoke(
+        mpm.cli.main.main,
+        ["validate", "can-ids", "--project", str(project.filename)],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 1
+    assert result.output == "Arbitration ID 0x00000100 (extended): First, Second\n"
@@ -77,7 +77,11 @@ def test_anomalies_to_spreadsheet():
     # Check names of the sheets
     assert workbook.sheetnames == ["Anomalies", "Response levels", "Trigger types"]
 
-    ws = workbook["Anomalies"]
+    # Save and test that loading works to detect illegal formatting, etc.
+    workbook.save(filename)
+    new_file = openpyxl.load_workbook(filename)
+
+    ws = new_file["Anomalies"]
 
     # Check dimensions of the anomalies sheet
     assert ws.min_row == 1
@@ -94,8 +98,7 @@ def test_anomalies_to_spreadsheet():
     assert "Anomaly 3" in names
     assert all(code in codes for code in [10, 20, 30])
 
-    # Save and test that loading works to detect illegal formatting, etc.
-    workbook.save(filename)
-    workbook.close()
-    new_file = openpyxl.load_workbook(filename)
+    assert ws["A1"].font.bold
+    assert ws["A2"].alignment.wrap_text
+
     new_file.close()
@@ -0,0 +1,91 @@
+import epyqlib.pm.parametermodel
+
+import mpm.benchmarks.suite
+import mpm.benchmarks.synthetic
+import mpm.project
+import mpm.sunspecmodel
+
+
+def test_results_roundtrip_and_compare(tmp_path):
+    baseline = mpm.benchmarks.suite.Results(
+        scale={"parameters": 10},
+        timings={
+            "fast": mpm.benchmarks.suite.Timing.from_durations([1.0, 2.0, 3.0]),
+            "slow": mpm.benchmarks.suite.Timing.from_durations([1.0]),
+        },
+    )
+    path = tmp_path / "baseline.json"
+    baseline.save(path)
+
+    loaded = mpm.benchmarks.suite.Results.load(path)
+    assert loaded == baseline
+
+    current = mpm.benchmarks.suite.Results(
+        scale={"parameters": 10},
+        timings={
+            "fast": mpm.benchmarks.suite.Timing.from_durations([0.5]),
+            "slow": mpm.benchmarks.suite.Timing.from_durations([1.5]),
+            "new": mpm.benchmarks.suite.Timing.from_durations([1.0]),
+        },
+    )
+
+    comparisons = mpm.benchmarks.suite.compare(
+        baseline=loaded,
+        current=current,
+        tolerance=0.2,
+    )
+
+    assert [(c.name, c.ratio, c.regressed) for c in comparisons] == [
+        ("fast", 0.5, False),
+        ("slow", 1.5, True),
+        ("new", None, False),
+    ]
+
+
+def test_synthetic_project(tmp_path):
+    scale = mpm.benchmarks.synthetic.Scale(
+        parameters=20,
+        multiplexers=5,
+        sunspec_models=2,
+        points_per_model=4,
+        tables=2,
+    )
+
+    project_path = mpm.benchmarks.synthetic.generate(directory=tmp_path, scale=scale)
+    project = mpm.project.loadp(project_path)
+
+    parameter_tables = [
+        node
+        for node in project.models.parameters.root.nodes_by_filter(
+            filter=lambda node: isinstance(node, epyqlib.pm.parametermodel.Table),
+        )
+    ]
+    assert len(parameter_tables) == scale.tables
+
+    (parameters_group,) = (
+        child
+        for child in project.models.parameters.root.children
+        if child.name == "Parameters"
+    )
+    assert parameters_group.children[0].name == "Synthetic Group 0"
+
+    sunspec_models = [
+        model
+        for model in project.models.sunspec1.root.children
+        if isinstance(model, mpm.sunspecmodel.Model)
+    ]
+    assert len(sunspec_models) == scale.sunspec_models
+
+    context = mpm.benchmarks.suite.Context(
+        project_path=project_path,
+        paths=mpm.benchmarks.synthetic.target_paths(tmp_path),
+        pmvs_path=tmp_path,
+    )
+
+    for benchmark in mpm.benchmarks.suite.benchmarks:
+        timing = mpm.benchmarks.suite.time_benchmark(
+            benchmark=benchmark,
+            context=context,
+            repeat=1,
+        )
+        assert timing.runs == 1
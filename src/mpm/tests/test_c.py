@@ -33,3 +33,54 @@ def test_format_nested_lists():
     }
     """
     )
+
+
+def test_render(tmp_path, monkeypatch):
+    monkeypatch.setenv("MPM_CACHE", str(tmp_path / "cache"))
+    source = tmp_path / "out.c_pm"
+    source.write_text(
+        "int {{ name }};\n{% for x in values %}\n{{ x }}\n{% endfor %}\n \n"
+    )
+    destination = tmp_path / "out.c"
+
+    assert mpm.c.render(
+        source=source,
+        destination=destination,
+        context={"name": "x", "values": ["a", "b  "]},
+        newline="\r\n",
+    )
+    assert destination.read_bytes() == b"int x;\r\na\r\nb\r\n"
+    assert [path.parent for path in tmp_path.rglob("*.cache")] == [
+        tmp_path / "cache" / "templates"
+    ]
+
+    assert not mpm.c.render(
+        source=source,
+        destination=destination,
+        context={"name": "x", "values": ["a", "b  "]},
+        newline="\r\n",
+    )
+
+
+def test_bytecode_cache_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.delenv("MPM_CACHE", raising=False)
+    source = tmp_path / "out.c_pm"
+    source.write_text("int x;\n")
+
+    mpm.c.render(source=source, destination=tmp_path / "out.c", context={})
+
+    assert mpm.c.environment(tmp_path).bytecode_cache is None
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["out.c", "out.c_pm"]
+
+
+def test_format_nested_lists_deep():
+    depth = 2000
+    example = ["x"]
+    for _ in range(depth):
+        example = ["{", example, "}"]
+
+    result = mpm.c.format_nested_lists(it=example).splitlines()
+
+    assert len(result) == 2 * depth + 1
+    assert result[depth] == "    " * depth + "x"
+    assert result[-1] == "}"
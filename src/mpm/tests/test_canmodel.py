@@ -235,3 +235,38 @@ TestAttrsModel = epyqlib.attrsmodel.build_tests(
     root_type=mpm.canmodel.Root,
     columns=mpm.canmodel.columns,
 )
+
+
+def test_identifier_index_tracks_changes():
+    sample_model = SampleModel.build()
+    sample_model.fill()
+    message = sample_model.parameters_message
+    first = sample_model.parameters_multiplexer
+    message.identifier = 0x100
+    first.identifier = 1
+
+    index = mpm.canmodel.IdentifierIndex.build(sample_model.root)
+    index.connect(sample_model.model)
+
+    second = mpm.canmodel.Multiplexer(identifier=1)
+    message.append_child(second)
+
+    assert index.conflicts_with(first) == [second]
+    assert index.free_multiplexer_id(message=message, start=1) == 2
+
+    second.identifier = 2
+
+    assert index.conflicts_with(first) == []
+    assert index.nodes_with_multiplexer_id(message=message, identifier=2) == [second]
+
+    other = mpm.canmodel.Message(identifier=0x100, extended=message.extended)
+    sample_model.root.append_child(other)
+
+    [conflict] = index.conflicts()
+    assert conflict.identifier == 0x100
+    assert conflict.nodes == (message, other)
+    assert index.free_arbitration_id(extended=message.extended, start=0x100) == 0x101
+
+    sample_model.root.remove_child(child=other)
+
+    assert index.conflicts() == []
@@ -0,0 +1,95 @@
+import decimal
+import json
+import uuid
+
+import openpyxl
+
+import mpm.cantoxlsx
+
+
+def create_row(name, path, access_level="Service_Tech", defaults=("1", "1")):
+    return mpm.cantoxlsx.Fields(
+        parameter_name=name,
+        description=f"{name} description",
+        access_level=access_level,
+        units="V",
+        parameter_path=path,
+        epyq_can_parameter_name=f"Group:{name}",
+        minimum=decimal.Decimal("0"),
+        maximum=decimal.Decimal("10"),
+        defaults=[decimal.Decimal(default) for default in defaults],
+    )
+
+
+def test_filter_for_manual():
+    rows = [
+        create_row(name="A", path="Parameters -> 1. Group"),
+        create_row(name="B", path="Other -> 1. Group"),
+        create_row(name="C", path="Parameters -> 2. DC -> Limits"),
+        create_row(name="D", path="Parameters -> 1. Group", access_level="Admin"),
+        create_row(name="E", path="Parameters -> 1. Group", access_level="Service_Eng"),
+    ]
+
+    filtered = list(mpm.cantoxlsx.filter_for_manual(rows))
+
+    assert [row.parameter_name for row in filtered] == ["A", "E"]
+
+
+def test_format_for_manual(tmp_path):
+    output_path = tmp_path / "can_for_manual.xlsx"
+    rows = [
+        create_row(name="A", path="Parameters -> 1. Group"),
+        create_row(name="B", path="Parameters -> 1. Group", defaults=("1", "2")),
+    ]
+
+    mpm.cantoxlsx.format_for_manual(rows=rows, output_path=output_path)
+
+    worksheet = openpyxl.load_workbook(output_path)["Parameters"]
+    values = [[cell.value for cell in row] for row in worksheet.rows]
+
+    assert values[0][0] == "1. Group"
+    assert values[1][:2] == ["Group:A", "A description"]
+    assert values[3][1:5] == ["Service_Tech", "0 V", "10 V", "1 V"]
+    assert values[4][:2] == ["Group:B", "B description"]
+    assert values[8][1:3] == ["1 V", "2 V"]
+
+    merged = {str(cell_range) for cell_range in worksheet.merged_cells.ranges}
+    assert {"A1:E1", "A2:A4", "B2:E2", "A5:A9", "B5:E5"} <= merged
+
+    assert worksheet["A2"].alignment.vertical == "top"
+    assert worksheet["B2"].alignment.wrap_text
+    assert worksheet["B3"].border.top.style == "thin"
+
+
+def test_pmvs_values(tmp_path):
+    parameter_uuids = [uuid.uuid4() for _ in range(3)]
+
+    def write(name, values):
+        children = [
+            {
+                "_type": "parameter",
+                "name": f"Parameter {index}",
+                "value": value,
+                "parameter_uuid": str(parameter_uuid),
+            }
+            for index, (parameter_uuid, value) in enumerate(
+                zip(parameter_uuids, values)
+            )
+        ]
+        raw = {"_type": "root", "name": "Root", "children": children}
+        (tmp_path / f"{name}.pmvs").write_text(json.dumps(raw))
+
+    write(name="b", values=["1.5", None, "3"])
+    write(name="a", values=["2", "4", None])
+    (tmp_path / "ignored.json").write_text("{}")
+
+    pmvs_values = mpm.cantoxlsx.PmvsValues.load(tmp_path)
+
+    assert pmvs_values.names == ["a", "b"]
+    assert pmvs_values.uuid_to_value_list == [
+        dict(zip(parameter_uuids, [decimal.Decimal("2"), decimal.Decimal("4"), None])),
+        dict(
+            zip(parameter_uuids, [decimal.Decimal("1.5"), None, decimal.Decimal("3")])
+        ),
+    ]
+    assert mpm.cantoxlsx.field_names.defaults == []
@@ -0,0 +1,144 @@
+import pathlib
+
+import epyqlib.pm.parametermodel
+
+import mpm.canmodel
+import mpm.checker
+import mpm.project
+
+
+def load_example():
+    return mpm.project.loadp(pathlib.Path(__file__).with_name("example_project.pmp"))
+
+
+def result_tree(node):
+    return (
+        getattr(node, "name", None),
+        getattr(node, "message", None),
+        node.node,
+        [result_tree(child) for child in node.children],
+    )
+
+
+def test_check_all_matches_full_check():
+    project = load_example()
+    checker = mpm.checker.Checker(project=project)
+
+    collected = checker.check_all()
+
+    for name, node in zip(project.models, collected.children):
+        model = project.models[name]
+        expected = model.root.check_and_append(
+            models=mpm.checker.CheckModels(checker=checker),
+        )
+
+        assert node.name == name
+        assert [result_tree(child) for child in node.children] == [
+            result_tree(child) for child in expected.children
+        ]
+
+
+def test_only_changed_nodes_are_checked_again():
+    project = load_example()
+    checker = mpm.checker.Checker(project=project)
+
+    checker.check_all()
+    assert checker.pending() == []
+
+    message = next(
+        child
+        for child in project.models.can.root.children
+        if isinstance(child, mpm.canmodel.Message)
+    )
+    signal = mpm.canmodel.Signal(name="New")
+    message.append_child(signal)
+
+    pending = checker.pending()
+    assert [(name, node is signal) for name, node in pending] == [("can", True)]
+
+    checker.check_all()
+    assert checker.pending() == []
+
+    added = mpm.canmodel.Message(name="Added")
+    added.append_child(mpm.canmodel.Signal(name="Added"))
+    project.models.can.root.append_child(added)
+
+    pending = checker.pending()
+    assert [(name, node is added.children[0]) for name, node in pending] == [
+        ("can", True)
+    ]
+
+
+def test_results_are_updated_in_place():
+    project = load_example()
+    checker = mpm.checker.Checker(project=project)
+
+    root = checker.check_all()
+
+    parameter = next(
+        iter(
+            project.models.parameters.root.nodes_by_filter(
+                filter=lambda node: isinstance(
+                    node, epyqlib.pm.parametermodel.Parameter
+                ),
+            )
+        )
+    )
+    parameter.name = "Renamed"
+
+    assert [
+        (name, node) for name, node in checker.pending() if name == "parameters"
+    ] == [("parameters", parameter)]
+
+    message = next(
+        child
+        for child in project.models.can.root.children
+        if isinstance(child, mpm.canmodel.Message) and len(child.children) > 0
+    )
+    project.models.can.root.remove_child(child=message)
+
+    assert checker.check_all() is root
+
+    for name, node in zip(project.models, root.children):
+        expected = project.models[name].root.check_and_append(
+            models=mpm.checker.CheckModels(checker=checker),
+        )
+
+        assert [result_tree(child) for child in node.children] == [
+            result_tree(child) for child in expected.children
+        ]
+
+
+def test_dependents_are_updated_in_place():
+    project = load_example()
+    checker = mpm.checker.Checker(project=project)
+
+    checker.check_all()
+    dependents = checker.dependents("can")
+
+    parameter = next(
+        node
+        for node in project.models.parameters.root.nodes_by_filter(
+            filter=lambda node: isinstance(node, epyqlib.pm.parametermodel.Parameter),
+        )
+        if dependents.nodes_by_parameter_uuid(node.uuid) == []
+    )
+    message = next(
+        child
+        for child in project.models.can.root.children
+        if isinstance(child, mpm.canmodel.Message)
+    )
+    signal = mpm.canmodel.Signal(name="New", parameter_uuid=parameter.uuid)
+    message.append_child(signal)
+
+    assert checker.dependents("can") is dependents
+    assert dependents.nodes_by_parameter_uuid(parameter.uuid) == [signal]
+
+    checker.check_all()
+    project.models.parameters.node_from_uuid(parameter.uuid).name = "Renamed"
+    assert checker.pending() == [("parameters", parameter), ("can", signal)]
+
+    message.remove_child(child=signal)
+
+    assert checker.dependents("can") is dependents
+    assert dependents.nodes_by_parameter_uuid(parameter.uuid) == []
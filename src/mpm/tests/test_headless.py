@@ -0,0 +1,76 @@
+import pathlib
+
+import epyqlib.attrsmodel
+import epyqlib.utils.qt
+
+import mpm.canmodel
+import mpm.headless
+import mpm.project
+
+
+def load_example(headless):
+    return mpm.project.loadp(
+        pathlib.Path(__file__).with_name("example_project.pmp"),
+        headless=headless,
+    )
+
+
+def created(node):
+    return (
+        node.pyqt_signals.created is not None,
+        epyqlib.utils.qt.pyqtify_signals(node).created is not None,
+    )
+
+
+def test_signals_are_created_when_connected():
+    signal = mpm.canmodel.Signal(name="First")
+    signal.name = "Second"
+
+    assert created(signal) == (False, False)
+
+    names = []
+    epyqlib.utils.qt.pyqtify_signals(signal).name.connect(names.append)
+    signal.name = "Third"
+
+    assert created(signal) == (False, True)
+    assert names == ["Third"]
+
+
+def test_model_creates_signals():
+    root = mpm.canmodel.Root()
+    message = mpm.canmodel.Message()
+    signal = mpm.canmodel.Signal()
+    message.append_child(signal)
+    root.append_child(message)
+
+    epyqlib.attrsmodel.Model(root=root, columns=mpm.canmodel.columns)
+
+    assert created(signal) == (True, True)
+
+
+def test_headless_load():
+    project = load_example(headless=True)
+    model = project.models.can
+
+    assert type(model) is mpm.headless.Model
+
+    signals = [
+        node
+        for node in model.uuid_to_node.values()
+        if isinstance(node, mpm.canmodel.Signal)
+    ]
+    assert len(signals) > 0
+    assert all(created(signal) == (False, False) for signal in signals)
+
+    index = project.index["can"]
+    message = signals[0].tree_parent
+    added = mpm.canmodel.Signal(name="Added")
+    message.append_child(added)
+
+    assert model.node_from_uuid(added.uuid) is added
+    assert project.index["can"] is not index
+    assert project.index["can"].node_from_uuid(added.uuid) is added
+
+    message.remove_child(child=added)
+
+    assert added.uuid not in model.uuid_to_node
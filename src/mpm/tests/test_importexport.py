@@ -0,0 +1,183 @@
+import pathlib
+
+import epyqlib.pm.parametermodel
+import graham
+
+import mpm
+import mpm.canmodel
+import mpm.importexport
+import mpm.project
+
+this = pathlib.Path(__file__).resolve()
+here = this.parent
+
+
+def dump_models(project):
+    return {
+        name: graham.dumps(project.models[name].root, indent=4).data
+        for name in ("parameters", "can")
+    }
+
+
+def test_merged_bcu_models_is_undone():
+    project = mpm.project.loadp(here / "project" / "project.pmp")
+    bcu_project = mpm.project.loadp(here / "project" / "project.pmp")
+
+    original = dump_models(project)
+    original_uuids = {
+        name: dict(project.models[name].uuid_to_node) for name in ("parameters", "can")
+    }
+
+    with mpm.importexport.merged_bcu_models(
+        project=project,
+        bcu_project=bcu_project,
+    ):
+        merged = dump_models(project)
+
+        assert merged != original
+        assert any(
+            child.name.startswith("BCU_") for child in project.models.can.root.children
+        )
+
+    assert dump_models(project) == original
+    assert dump_models(bcu_project) == original
+
+    for name, uuid_to_node in original_uuids.items():
+        assert project.models[name].uuid_to_node == uuid_to_node
+
+
+def controller_project(prefix, enumeration):
+    """Build a project laid out like a TCU or BCU project sharing an enumeration."""
+    project = mpm.project.create_blank()
+    parameters_root = project.models.parameters.root
+    can_root = project.models.can.root
+
+    enumerations = epyqlib.pm.parametermodel.Enumerations(name="Enumerations")
+    parameters_root.append_child(enumerations)
+    enumerations.append_child(
+        graham.schema(type(enumeration))
+        .load(
+            graham.schema(type(enumeration)).dump(enumeration).data,
+        )
+        .data,
+    )
+
+    group = epyqlib.pm.parametermodel.Group(name="Parameters")
+    parameters_root.append_child(group)
+    parameters = [
+        epyqlib.pm.parametermodel.Parameter(name=f"{prefix}Parameter{index}")
+        for index in range(3)
+    ]
+    for parameter in parameters:
+        group.append_child(parameter)
+
+    query = mpm.canmodel.MultiplexedMessage(name="ParameterQuery")
+    can_root.append_child(query)
+    for index, parameter in enumerate(parameters):
+        multiplexer = mpm.canmodel.Multiplexer(
+            name=f"{prefix}Multiplexer{index}",
+            identifier=index,
+        )
+        query.append_child(multiplexer)
+        multiplexer.append_child(
+            mpm.canmodel.Signal(name=parameter.name, parameter_uuid=parameter.uuid),
+        )
+    can_root.append_child(mpm.canmodel.MultiplexedMessage(name="ParameterResponse"))
+    can_root.append_child(mpm.canmodel.Message(name=f"{prefix}Status"))
+
+    return project
+
+
+def test_merged_bcu_models_with_shared_enumerations_is_undone():
+    enumeration = epyqlib.pm.parametermodel.Enumeration(name="OnOff")
+    enumeration.append_child(epyqlib.pm.parametermodel.Enumerator(name="Off"))
+    enumeration.append_child(epyqlib.pm.parametermodel.Enumerator(name="On"))
+
+    project = controller_project(prefix="TCU", enumeration=enumeration)
+    bcu_project = controller_project(prefix="BCU", enumeration=enumeration)
+
+    original = dump_models(project)
+    bcu_original = dump_models(bcu_project)
+    original_uuids = {
+        name: dict(project.models[name].uuid_to_node) for name in ("parameters", "can")
+    }
+    shared_uuid = enumeration.children[0].uuid
+    bcu_enumerator = bcu_project.models.parameters.uuid_to_node[shared_uuid]
+
+    with mpm.importexport.merged_bcu_models(
+        project=project,
+        bcu_project=bcu_project,
+    ):
+        can_root = project.models.can.root
+        query = can_root.child_by_name("ParameterQuery")
+
+        assert [child.identifier for child in query.children] == [
+            0,
+            1,
+            2,
+            1500,
+            1501,
+            1502,
+        ]
+        assert [child.name for child in can_root.children] == [
+            "ParameterQuery",
+            "ParameterResponse",
+            "TCUStatus",
+            "BCU_BCUStatus",
+        ]
+        bcu_group = project.models.parameters.root.descendent(
+            "Parameters",
+            "BCU_Parameters",
+        )
+        assert [child.name for child in bcu_group.children] == [
+            "BCUParameter0",
+            "BCUParameter1",
+            "BCUParameter2",
+        ]
+        assert project.models.parameters.uuid_to_node[shared_uuid] is bcu_enumerator
+
+    assert dump_models(project) == original
+    assert dump_models(bcu_project) == bcu_original
+
+    for name, uuid_to_node in original_uuids.items():
+        assert project.models[name].uuid_to_node == uuid_to_node
+
+
+def test_merge_can_models_allocates_free_multiplexer_ids():
+    def parameter_query(*identifiers):
+        root = mpm.canmodel.Root()
+        message = mpm.canmodel.MultiplexedMessage(name="ParameterQuery")
+        root.append_child(message)
+
+        for identifier in identifiers:
+            message.append_child(mpm.canmodel.Multiplexer(identifier=identifier))
+
+        return root, message
+
+    dest, dest_message = parameter_query(0, 1501)
+    src, src_message = parameter_query(1, 2)
+
+    mpm.importexport.merge_can_models(dest=dest, src=src)
+
+    assert [mux.identifier for mux in dest_message.children] == [0, 1501, 1502, 1503]
+    assert mpm.canmodel.IdentifierIndex.build(dest).conflicts() == []
+
+
+def test_generator_models_are_loaded_before_forking():
+    export = mpm.importexport._load_export(
+        project_path=here / "project" / "project.pmp",
+        bcu_project_path=None,
+        paths=None,
+        options={},
+    )
+    models = export["project"].models
+
+    assert "anomalies" not in models.loaded()
+
+    mpm.importexport._load_generator_models(export, generator_names=["anomalies_h"])
+
+    assert {"anomalies", "parameters"} <= set(models.loaded())
+
+
+def test_manifest_version_includes_commit():
+    assert mpm.__sha__ in mpm.importexport.manifest_version()
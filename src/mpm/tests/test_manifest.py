@@ -0,0 +1,105 @@
+import mpm.manifest
+
+
+def create_manifest(tmp_path, version="1.0"):
+    return mpm.manifest.Manifest.load(
+        path=tmp_path / mpm.manifest.file_name,
+        version=version,
+    )
+
+
+def test_unrecorded_is_stale(tmp_path):
+    manifest = create_manifest(tmp_path)
+
+    assert manifest.is_stale(name="sym", inputs={}, outputs=[])
+
+
+def test_roundtrip_not_stale(tmp_path):
+    source = tmp_path / "parameters.json"
+    source.write_text("{}")
+    output = tmp_path / "out.c"
+    output.write_text("int x;")
+
+    manifest = create_manifest(tmp_path)
+    manifest.record(
+        name="sil",
+        inputs={"parameters": source},
+        outputs=[output],
+        options={"a": True},
+    )
+    manifest.save()
+
+    manifest = create_manifest(tmp_path)
+
+    assert not manifest.is_stale(
+        name="sil",
+        inputs={"parameters": source},
+        outputs=[output],
+        options={"a": True},
+    )
+    assert manifest.records["sil"].outputs == {"out.c": mpm.manifest.hash_path(output)}
+
+
+def test_touch_without_change_is_not_stale(tmp_path):
+    source = tmp_path / "parameters.json"
+    source.write_text("{}")
+    output = tmp_path / "out.c"
+    output.write_text("int x;")
+
+    manifest = create_manifest(tmp_path)
+    manifest.record(name="sil", inputs={"parameters": source}, outputs=[output])
+    manifest.save()
+
+    source.write_text("{}")
+
+    manifest = create_manifest(tmp_path)
+
+    assert not manifest.is_stale(
+        name="sil", inputs={"parameters": source}, outputs=[output]
+    )
+
+
+def test_changes_are_stale(tmp_path):
+    source = tmp_path / "parameters.json"
+    source.write_text("{}")
+    output = tmp_path / "out.c"
+    output.write_text("int x;")
+
+    manifest = create_manifest(tmp_path)
+    manifest.record(name="sil", inputs={"parameters": source}, outputs=[output])
+    manifest.save()
+
+    def stale(options={}):
+        return create_manifest(tmp_path).is_stale(
+            name="sil",
+            inputs={"parameters": source},
+            outputs=[output],
+            options=options,
+        )
+
+    assert stale(options={"a": True})
+
+    output.write_text("int y;")
+    assert stale()
+
+    output.unlink()
+    assert stale()
+
+    output.write_text("int x;")
+    assert not stale()
+
+    source.write_text('{"a": 1}')
+    assert stale()
+
+
+def test_version_change_discards_records(tmp_path):
+    manifest = create_manifest(tmp_path, version="1.0")
+    manifest.record(name="sil", inputs={}, outputs=[])
+    manifest.save()
+
+    assert not create_manifest(tmp_path, version="1.0").is_stale(
+        name="sil", inputs={}, outputs=[]
+    )
+    assert create_manifest(tmp_path, version="2.0").is_stale(
+        name="sil", inputs={}, outputs=[]
+    )
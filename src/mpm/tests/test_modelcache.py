@@ -0,0 +1,129 @@
+import pathlib
+
+import graham
+import pytest
+
+import mpm
+import mpm.canmodel
+import mpm.modelcache
+import mpm.project
+import mpm.sunspecmodel
+
+
+this = pathlib.Path(__file__).resolve()
+here = this.parent
+
+
+def dump_models(project):
+    return {
+        name: graham.dumps(model.root, indent=4).data
+        for name, model in project.models.items()
+    }
+
+
+def test_cached_load_matches_json_load(tmp_path, monkeypatch):
+    monkeypatch.setattr(mpm.project, "model_cache", None)
+    expected = dump_models(mpm.project.loadp(here / "project" / "project.pmp"))
+
+    cache = mpm.modelcache.ModelCache(directory=tmp_path)
+    monkeypatch.setattr(mpm.project, "model_cache", cache)
+
+    uncached = dump_models(mpm.project.loadp(here / "project" / "project.pmp"))
+    assert len(list(tmp_path.glob("*.pickle"))) == len(expected)
+
+    cached = dump_models(mpm.project.loadp(here / "project" / "project.pmp"))
+
+    assert uncached == expected
+    assert cached == expected
+
+
+def test_stale_entry_is_ignored(tmp_path):
+    cache = mpm.modelcache.ModelCache(directory=tmp_path, version="1.0")
+    types = mpm.canmodel.types
+    source = here / "project" / "can.json"
+    raw = source.read_text()
+    root = graham.schema(mpm.canmodel.Root).loads(raw).data
+
+    cache.store(source=source, raw=raw, types=types, root=root)
+
+    assert type(cache.load(source=source, raw=raw, types=types)) is mpm.canmodel.Root
+    assert cache.load(source=source, raw=raw + " ", types=types) is None
+
+    other_version = mpm.modelcache.ModelCache(directory=tmp_path, version="2.0")
+    assert other_version.load(source=source, raw=raw, types=types) is None
+
+
+def test_default_version_identifies_the_commit():
+    version = mpm.modelcache.ModelCache(directory=None).version
+
+    assert mpm.__sha__ in version
+    assert mpm.modelcache.distribution_version("epyqlib") in version
+
+
+def test_store_rejects_unknown_types(tmp_path):
+    cache = mpm.modelcache.ModelCache(directory=tmp_path)
+    raw = (here / "project" / "can.json").read_text()
+    root = graham.schema(mpm.canmodel.Root).loads(raw).data
+
+    with pytest.raises(mpm.modelcache.UncacheableError):
+        cache.store(
+            source=here / "project" / "can.json",
+            raw=raw,
+            types=mpm.sunspecmodel.types,
+            root=root,
+        )
+
+
+def test_failing_store_still_loads(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(mpm.project, "model_cache", None)
+    expected = dump_models(mpm.project.loadp(here / "project" / "project.pmp"))
+
+    def store(**kwargs):
+        raise mpm.modelcache.UncacheableError()
+
+    cache = mpm.modelcache.ModelCache(directory=tmp_path)
+    monkeypatch.setattr(cache, "store", store)
+    monkeypatch.setattr(mpm.project, "model_cache", cache)
+
+    loaded = dump_models(mpm.project.loadp(here / "project" / "project.pmp"))
+
+    assert loaded == expected
+    assert "Unable to cache" in caplog.text
+
+
+def test_cache_is_opt_in(monkeypatch, tmp_path):
+    monkeypatch.delenv("MPM_CACHE", raising=False)
+    assert mpm.modelcache.default_directory() is None
+
+    monkeypatch.setenv("MPM_CACHE", "")
+    assert mpm.modelcache.default_directory() is None
+
+    monkeypatch.setenv("MPM_CACHE", str(tmp_path))
+    assert mpm.modelcache.default_directory() == tmp_path / "models"
+
+
+def test_flatten_shares_equal_values():
+    raw = (here / "project" / "sunspec1.json").read_text()
+    root = graham.schema(mpm.sunspecmodel.Root).loads(raw).data
+
+    values = {}
+
+    def collect(flattened):
+        cls, fields, children = flattened
+
+        for value in fields.values():
+            if isinstance(value, mpm.modelcache.shared_types):
+                values.setdefault(value, set()).add(id(value))
+
+        for child in children or ():
+            collect(child)
+
+    collect(
+        mpm.modelcache.flatten(
+            root,
+            names=mpm.modelcache.type_names(mpm.sunspecmodel.types),
+        )
+    )
+
+    assert len(values) > 0
+    assert all(len(ids) == 1 for ids in values.values())
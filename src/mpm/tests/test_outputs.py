@@ -0,0 +1,72 @@
+import os
+
+import mpm.outputs
+
+
+def test_write_creates_file(tmp_path):
+    path = tmp_path / "generated" / "out.c"
+
+    assert mpm.outputs.write_text(path=path, text="int x;\n")
+    assert path.read_bytes() == b"int x;\n"
+    assert [p.name for p in path.parent.iterdir()] == ["out.c"]
+
+
+def test_unchanged_not_rewritten(tmp_path):
+    path = tmp_path / "out.c"
+    mpm.outputs.write_text(path=path, text="int x;\n")
+
+    os.utime(path, ns=(0, 0))
+
+    assert not mpm.outputs.write_text(path=path, text="int x;\n")
+    assert path.stat().st_mtime_ns == 0
+
+
+def test_changed_rewritten(tmp_path):
+    path = tmp_path / "out.c"
+    mpm.outputs.write_text(path=path, text="int x;\n")
+
+    assert mpm.outputs.write_text(path=path, text="int y;\n")
+    assert path.read_text() == "int y;\n"
+
+
+def test_newline_and_encoding(tmp_path):
+    path = tmp_path / "out.sym"
+
+    mpm.outputs.write_text(
+        path=path,
+        text="a\nµ\n",
+        encoding="utf-8",
+        newline="\r\n",
+    )
+
+    assert path.read_bytes() == "a\r\nµ\r\n".encode("utf-8")
+
+
+def test_recording(tmp_path):
+    unchanged = tmp_path / "unchanged.h"
+    changed = tmp_path / "changed.h"
+    mpm.outputs.write_bytes(path=unchanged, data=b"a")
+
+    with mpm.outputs.recording() as outer:
+        with mpm.outputs.recording() as inner:
+            mpm.outputs.write_bytes(path=unchanged, data=b"a")
+            mpm.outputs.write_bytes(path=changed, data=b"b")
+
+        mpm.outputs.write_bytes(path=changed, data=b"c")
+
+    mpm.outputs.write_bytes(path=changed, data=b"d")
+
+    assert inner == [changed]
+    assert outer == [changed, changed]
+
+
+def test_chunks_unchanged_not_rewritten(tmp_path):
+    path = tmp_path / "out.c"
+
+    assert mpm.outputs.write_chunks(path=path, chunks=[b"int ", b"x;\n"])
+
+    os.utime(path, ns=(0, 0))
+
+    assert not mpm.outputs.write_chunks(path=path, chunks=iter([b"int x;\n"]))
+    assert path.stat().st_mtime_ns == 0
+    assert [p.name for p in tmp_path.iterdir()] == ["out.c"]
@@ -0,0 +1,67 @@
+import epyqlib.pm.parametermodel
+
+import mpm.parameterstointerface
+import mpm.sunspecmodel
+
+
+def create_repeating_blocks():
+    parameter = epyqlib.pm.parametermodel.Parameter(name="Point")
+    table_element = epyqlib.pm.parametermodel.TableArrayElement(original=parameter)
+
+    root = mpm.sunspecmodel.Root()
+    model = mpm.sunspecmodel.Model(id=705)
+    root.append_child(model)
+
+    curves = []
+    for name in ("Curve 1", "Curve 2"):
+        curve_parameter = epyqlib.pm.parametermodel.Parameter(name=name)
+
+        block = mpm.sunspecmodel.TableRepeatingBlock(name=name)
+        model.append_child(block)
+        point = mpm.sunspecmodel.DataPoint(parameter_uuid=curve_parameter.uuid)
+        block.append_child(point)
+
+        reference = mpm.sunspecmodel.TableRepeatingBlockReference(original=block)
+        model.append_child(reference)
+        point_reference = (
+            mpm.sunspecmodel.TableRepeatingBlockReferenceDataPointReference(
+                parameter_uuid=parameter.uuid,
+            )
+        )
+        reference.append_child(point_reference)
+
+        curves.append((point, point_reference))
+
+    return root, model, table_element, curves
+
+
+def test_table_repeating_block_references_point():
+    root, model, table_element, curves = create_repeating_blocks()
+
+    references = mpm.parameterstointerface.TableRepeatingBlockReferences.build(
+        root=root,
+    )
+
+    for point, point_reference in curves:
+        found = references.point_from_table_element(
+            sunspec_point=point,
+            table_element=table_element,
+        )
+        assert found is point_reference
+
+    other = mpm.sunspecmodel.DataPoint(parameter_uuid=table_element.uuid)
+    assert (
+        references.point_from_table_element(
+            sunspec_point=other,
+            table_element=table_element,
+        )
+        is None
+    )
+
+
+def test_table_repeating_block_references_empty():
+    references = mpm.parameterstointerface.TableRepeatingBlockReferences.build(
+        root=None,
+    )
+
+    assert references.point_references == {}
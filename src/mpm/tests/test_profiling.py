@@ -0,0 +1,61 @@
+import json
+
+import attr
+
+import mpm.profiling
+
+
+@attr.s
+class Node:
+    children = attr.ib(factory=list)
+
+
+def test_stage_without_profiler_is_not_measured():
+    with mpm.profiling.stage("unmeasured", nodes=lambda: 1 / 0):
+        pass
+
+
+def test_nested_stages(tmp_path):
+    profiler = mpm.profiling.Profiler(dump_directory=tmp_path / "dumps")
+    root = Node(children=[Node(), Node(children=[Node()])])
+
+    with mpm.profiling.profiling(profiler):
+        with mpm.profiling.stage(
+            "outer",
+            nodes=lambda: mpm.profiling.count_nodes(root),
+        ):
+            with mpm.profiling.stage("inner"):
+                pass
+
+    assert [(stage.name, stage.depth, stage.nodes) for stage in profiler.stages] == [
+        ("outer", 0, 4),
+        ("inner", 1, None),
+    ]
+    outer, inner = profiler.stages
+    assert outer.wall_time >= inner.wall_time >= 0
+
+    assert [path.name for path in (tmp_path / "dumps").iterdir()] == ["00_outer.prof"]
+
+    output = tmp_path / "profile.json"
+    profiler.save(output)
+    raw = json.loads(output.read_text())
+    assert [stage["name"] for stage in raw["stages"]] == ["outer", "inner"]
+
+    report = profiler.report().splitlines()
+    assert report[1].startswith("outer")
+    assert report[2].startswith("  inner")
+
+
+def test_failed_stage_recorded():
+    profiler = mpm.profiling.Profiler()
+
+    with mpm.profiling.profiling(profiler):
+        try:
+            with mpm.profiling.stage("failing", nodes=lambda: 1):
+                raise ValueError()
+        except ValueError:
+            pass
+
+    (stage,) = profiler.stages
+    assert stage.name == "failing"
+    assert stage.nodes is None
@@ -1,8 +1,12 @@
 import textwrap
+import uuid
 
 import graham
 
+import mpm.canmodel
+import mpm.profiling
 import mpm.project
+import mpm.sunspecmodel
 
 import pathlib
 
@@ -113,3 +117,134 @@ def test_model_proper_selection_roots():
     expected = epyqlib.pm.parametermodel.types.list_selection_roots()
 
     assert set(project.models.parameters.list_selection_roots.keys()) == expected
+
+
+def test_reference_fields():
+    assert mpm.project.reference_fields(
+        mpm.sunspecmodel.TableRepeatingBlockReference,
+    ) == ("original",)
+    assert mpm.project.reference_fields(mpm.sunspecmodel.DataPoint) == ()
+
+
+def test_resolve_references_shared_index():
+    reference_path = pathlib.Path(__file__).with_name("project")
+    roots = [
+        graham.schema(mpm.sunspecmodel.Root)
+        .loads((reference_path / name).read_text())
+        .data
+        for name in ("sunspec1.json", "sunspec2.json")
+    ]
+
+    uuid_to_node = {}
+    for root in roots:
+        mpm.project.resolve_references(root, uuid_to_node=uuid_to_node)
+
+    def check(node, _):
+        assert node.uuid in uuid_to_node
+
+        for name in mpm.project.reference_fields(type(node)):
+            value = getattr(node, name)
+            assert value is None or not isinstance(value, uuid.UUID)
+
+    for root in roots:
+        root.traverse(call_this=check, internal_nodes=True)
+
+
+def test_model_index_matches_traversal():
+    project = mpm.project.loadp(pathlib.Path(__file__).with_name("example_project.pmp"))
+    root = project.models.can.root
+
+    index = mpm.project.ModelIndex.build(root=root)
+
+    nodes = root.nodes_by_filter(filter=lambda node: True)
+    assert set(index.uuid_to_node.values()) == nodes
+    assert set(index.nodes_with_parameter_uuid()) == {
+        node for node in nodes if getattr(node, "parameter_uuid", None) is not None
+    }
+    assert set(index.nodes_of_types(mpm.canmodel.Signal)) == {
+        node for node in nodes if isinstance(node, mpm.canmodel.Signal)
+    }
+
+
+def test_project_index_invalidated_by_model_change():
+    project = mpm.project.loadp(pathlib.Path(__file__).with_name("example_project.pmp"))
+
+    index = project.index["parameters"]
+    assert project.index["parameters"] is index
+
+    group = epyqlib.pm.parametermodel.Group(name="New")
+    project.models.parameters.root.append_child(group)
+
+    updated = project.index["parameters"]
+    assert updated is not index
+    assert updated.node_from_uuid(group.uuid) is group
+
+
+def test_lazy_load_only_accessed_models():
+    path = pathlib.Path(__file__).with_name("example_project.pmp")
+    project = mpm.project.loadp(path, lazy=True)
+
+    assert project.models.loaded() == {}
+
+    parameters = project.models.parameters
+    assert list(project.models.loaded()) == ["parameters"]
+
+    sunspec1 = project.models.sunspec1
+    assert list(project.models.loaded()) == ["parameters", "sunspec1"]
+    assert parameters in sunspec1.droppable_from
+
+    eager = mpm.project.loadp(path)
+    expected = eager.models.sunspec1.list_selection_roots
+    assert sunspec1.list_selection_roots.keys() == expected.keys()
+    for name, root in expected.items():
+        assert getattr(sunspec1.list_selection_roots[name], "uuid", None) == getattr(
+            root, "uuid", None
+        )
+
+
+def test_lazy_load_profiles_enumeration_roots():
+    path = pathlib.Path(__file__).with_name("example_project.pmp")
+    project = mpm.project.loadp(path, lazy=True)
+    profiler = mpm.profiling.Profiler()
+
+    with mpm.profiling.profiling(profiler):
+        project.models.sunspec1
+
+    assert "update enumeration roots" in [stage.name for stage in profiler.stages]
+
+
+def test_snapshot_round_trip():
+    project = mpm.project.loadp(pathlib.Path(__file__).with_name("example_project.pmp"))
+
+    snapshot = mpm.project.snapshot(project)
+    copy = mpm.project.from_snapshot(snapshot)
+
+    assert mpm.project.snapshot(copy) == snapshot
+    for name, model in copy.models.items():
+        assert model is not project.models[name]
+        assert model.list_selection_roots.keys() == (
+            project.models[name].list_selection_roots.keys()
+        )
+
+
+def test_save_writes_only_changed_models(tmp_path):
+    project = mpm.project.create_blank()
+    project.filename = tmp_path / "project.pmp"
+    for name in project.paths:
+        project.paths[name] = f"{name}.json"
+
+    model_paths = {name: tmp_path / f"{name}.json" for name in project.paths}
+
+    assert set(project.save()) == {project.filename, *model_paths.values()}
+
+    project.models.can.root.append_child(mpm.canmodel.Message())
+
+    changed = [
+        name
+        for name, model in project.models.items()
+        if project.changes.is_changed(name=name, model=model, path=model_paths[name])
+    ]
+
+    assert changed == ["can"]
+    assert project.save() == [model_paths["can"]]
+    assert project.save() == []
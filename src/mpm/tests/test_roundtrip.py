@@ -13,7 +13,7 @@ import epyqlib.tests.common
 import mpm.cli.importsym
 import mpm.cli.exportsym
 import mpm.importexport
-import mpm.importexportdialog
+import mpm.paths
 
 
 round_trip = pathlib.Path(__file__).parents[3] / "roundtrip"
@@ -34,7 +34,7 @@ def _full_round_trip():
     project = mpm.project.loadp(pathlib.Path("full_import") / "project.pmp")
 
     directory = pathlib.Path(os.sep) / "epc" / "g" / "36" / "grid-tied"
-    paths = mpm.importexportdialog.paths_from_directory(directory)
+    paths = mpm.paths.paths_from_directory(directory)
 
     mpm.importexport.full_export(project=project, paths=paths, first_time=True)
 
@@ -0,0 +1,101 @@
+import json
+import pathlib
+import uuid
+
+import graham
+import pytest
+
+import epyqlib.pm.parametermodel
+
+import mpm.anomalymodel
+import mpm.canmodel
+import mpm.project
+import mpm.serialization
+import mpm.staticmodbusmodel
+import mpm.sunspecmodel
+
+
+this = pathlib.Path(__file__).resolve()
+here = this.parent
+
+project_path = here / "project" / "project.pmp"
+
+node_types = [
+    type_
+    for types in (
+        epyqlib.pm.parametermodel.types,
+        mpm.canmodel.types,
+        mpm.sunspecmodel.types,
+        mpm.staticmodbusmodel.types,
+        mpm.anomalymodel.types,
+    )
+    for type_ in types.types.values()
+]
+
+
+@pytest.mark.parametrize(
+    "type_",
+    node_types,
+    ids=[f"{type_.__module__}.{type_.__name__}" for type_ in node_types],
+)
+def test_node_types_are_compiled(type_):
+    assert mpm.serialization.plan_for(graham.schema(type_)) is not None
+
+
+def test_dump_matches_graham(monkeypatch):
+    monkeypatch.setattr(mpm.project, "model_cache", None)
+    project = mpm.project.loadp(project_path)
+
+    for name, model in project.models.items():
+        expected = graham.dumps(model.root, indent=4).data
+
+        # Without falling back to graham
+        dumped = json.dumps(mpm.serialization.dump(model.root), indent=4)
+
+        assert dumped == expected, name
+        assert mpm.serialization.dumps(model.root, indent=4) == expected, name
+
+
+def test_load_matches_graham():
+    raw_project = project_path.read_text()
+    project = mpm.serialization.loads(raw_project, mpm.project.Project)
+
+    assert project == graham.schema(mpm.project.Project).loads(raw_project).data
+
+    for name, path in project.paths.items():
+        root_type = mpm.project.model_kinds[name].root_type
+        raw = (project_path.parent / path).read_text()
+
+        expected = graham.schema(root_type).loads(raw).data
+        # Without falling back to graham
+        loaded = mpm.serialization.load(json.loads(raw), root_type)
+
+        mpm.project.resolve_references(expected)
+        mpm.project.resolve_references(loaded)
+
+        assert type(loaded) is root_type
+        assert (
+            graham.dumps(loaded, indent=4).data == graham.dumps(expected, indent=4).data
+        ), name
+
+
+def test_load_shares_equal_values():
+    parameter_uuid = "29cf3408-043e-4573-a511-0c7638688663"
+    root = mpm.canmodel.Root()
+    for index in range(2):
+        message = mpm.canmodel.Message(name=f"Message{index}")
+        root.append_child(message)
+        message.append_child(
+            mpm.canmodel.Signal(name="Shared", parameter_uuid=parameter_uuid),
+        )
+
+    loaded = mpm.serialization.load(
+        json.loads(mpm.serialization.dumps(root)),
+        mpm.canmodel.Root,
+    )
+
+    first, second = (message.children[0] for message in loaded.children)
+    assert first.parameter_uuid == uuid.UUID(parameter_uuid)
+    assert first.parameter_uuid is second.parameter_uuid
+    assert first.name is second.name
+    assert first.uuid is not second.uuid
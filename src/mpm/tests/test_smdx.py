@@ -0,0 +1,138 @@
+import textwrap
+
+import lxml.etree
+import xmldiff.main
+
+import mpm
+import mpm.smdx
+
+
+schema_string = textwrap.dedent(
+    """\
+    <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+      <xs:element name="sunSpecModels">
+        <xs:complexType>
+          <xs:sequence>
+            <xs:element name="model" maxOccurs="unbounded">
+              <xs:complexType>
+                <xs:attribute name="id" type="xs:integer" use="required"/>
+              </xs:complexType>
+            </xs:element>
+          </xs:sequence>
+        </xs:complexType>
+      </xs:element>
+    </xs:schema>
+    """
+)
+
+
+def smdx_string(attributes):
+    return f"<sunSpecModels><model {attributes}/></sunSpecModels>\n"
+
+
+def write_files(directory):
+    schema_path = directory / "smdx.xsd"
+    schema_path.write_text(schema_string)
+
+    reference_path = directory / "reference"
+    subject_path = directory / "subject"
+    reference_path.mkdir()
+    subject_path.mkdir()
+
+    (reference_path / "smdx_00001.xml").write_text(smdx_string('id="1"'))
+    (subject_path / "smdx_00001.xml").write_text(smdx_string('id="1"'))
+    (reference_path / "smdx_00002.xml").write_text(smdx_string('id="2"'))
+    (subject_path / "smdx_00002.xml").write_text(smdx_string('id="3"'))
+    (subject_path / "smdx_00004.xml").write_text(smdx_string(""))
+
+    validations = [
+        mpm.smdx.Validation(
+            subject=subject_path / name,
+            reference=reference_path / name,
+        )
+        for name in ("smdx_00001.xml", "smdx_00002.xml")
+    ]
+    validations.append(mpm.smdx.Validation(subject=subject_path / "smdx_00004.xml"))
+
+    return schema_path, validations
+
+
+def test_validate_all_parallel_matches_serial(tmp_path):
+    schema_path, validations = write_files(tmp_path)
+
+    serial = list(
+        mpm.smdx.validate_all(
+            validations=validations,
+            schema_path=schema_path,
+            jobs=1,
+        )
+    )
+    parallel = list(
+        mpm.smdx.validate_all(
+            validations=validations,
+            schema_path=schema_path,
+            jobs=2,
+        )
+    )
+
+    assert [validation for validation, result in serial] == validations
+    assert [result.failed for validation, result in serial] == [False, True, True]
+    assert parallel == serial
+
+
+def test_compare_identical_skips_diff(monkeypatch):
+    def diff_trees(*args, **kwargs):
+        raise Exception("Identical trees should not be diffed")
+
+    monkeypatch.setattr(xmldiff.main, "diff_trees", diff_trees)
+
+    reference, subject = (
+        lxml.etree.fromstring(
+            "<sunSpecModels><model id='1'> <description>{}</description></model>"
+            "</sunSpecModels>".format(description)
+        )
+        for description in ("a", "b")
+    )
+
+    assert mpm.smdx.compare_to_reference(subject=subject, reference=reference) == ()
+
+
+def test_validate_all_reuses_cached_results(tmp_path, monkeypatch):
+    schema_path, validations = write_files(tmp_path)
+    cache = mpm.smdx.ValidationCache(directory=tmp_path / "cache")
+
+    validated = list(
+        mpm.smdx.validate_all(
+            validations=validations,
+            schema_path=schema_path,
+            cache=cache,
+        )
+    )
+
+    def run(self, schema):
+        raise Exception("Cached results should be reused")
+
+    monkeypatch.setattr(mpm.smdx.Validation, "run", run)
+
+    cached = list(
+        mpm.smdx.validate_all(
+            validations=validations,
+            schema_path=schema_path,
+            cache=cache,
+        )
+    )
+
+    assert cached == validated
+
+
+def test_cache_key_identifies_the_commit(tmp_path, monkeypatch):
+    cache = mpm.smdx.ValidationCache(directory=tmp_path / "cache")
+    key = ["schema", "reference", "subject"]
+    cache.store(key, mpm.smdx.ValidationResult(failed=False))
+
+    assert cache.load(key) is not None
+
+    monkeypatch.setattr(mpm, "__sha__", "another commit")
+    other = mpm.smdx.ValidationCache(directory=tmp_path / "cache")
+
+    assert other.load(key) is None
@@ -1,6 +1,8 @@
 import csv
 import pathlib
 
+import openpyxl
+
 import mpm.mpm_helper
 import mpm.project
 import mpm.smdxtosunspec
@@ -86,6 +88,7 @@ def test_x():
     ]
 
     workbook.save("test_sunspectoxlsx.xlsx")
+    workbook = openpyxl.load_workbook("test_sunspectoxlsx.xlsx")
 
     with open("test_sunspectoxlsx.csv", "w", newline="") as file:
         writer = csv.writer(file)
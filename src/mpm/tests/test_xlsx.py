@@ -0,0 +1,73 @@
+import openpyxl
+import openpyxl.styles
+
+import mpm.xlsx
+
+
+def test_streamed_sheets(tmp_path):
+    path = tmp_path / "streamed.xlsx"
+
+    def gen_rows():
+        yield ("Name", "Value")
+        for value in range(3):
+            yield (f"row {value}", value)
+
+    workbook = mpm.xlsx.Workbook(
+        styles=[
+            openpyxl.styles.NamedStyle(
+                name="Header",
+                font=openpyxl.styles.Font(bold=True),
+            ),
+        ],
+    )
+    workbook.create_sheet(
+        "Data",
+        rows=gen_rows(),
+        header_style="Header",
+        column_widths={"A": 30},
+        row_height=20,
+    )
+    removed = workbook.create_sheet("Removed")
+    workbook.remove(removed)
+
+    assert workbook.sheetnames == ["Data"]
+
+    workbook.save(path)
+
+    loaded = openpyxl.load_workbook(path)
+    assert loaded.sheetnames == ["Data"]
+
+    data = loaded["Data"]
+    assert [[cell.value for cell in row] for row in data.rows] == [
+        ["Name", "Value"],
+        ["row 0", 0],
+        ["row 1", 1],
+        ["row 2", 2],
+    ]
+    assert data["A1"].font.bold
+    assert not data["A2"].font.bold
+    assert data.column_dimensions["A"].width == 30
+    assert data.row_dimensions[2].height == 20
+
+
+def test_links(tmp_path):
+    path = tmp_path / "links.xlsx"
+
+    workbook = mpm.xlsx.Workbook(write_only=False)
+    workbook.create_sheet("Data", rows=[("Name",), ("Target",)])
+    workbook.create_sheet(
+        "Links",
+        rows=[("Link",), ("plain", mpm.xlsx.Link(text="x", location="#Data!A2"))],
+    )
+    workbook.save(path)
+
+    loaded = openpyxl.load_workbook(path)
+    assert loaded.sheetnames == ["Data", "Links"]
+
+    links = loaded["Links"]
+    assert [[cell.value for cell in row] for row in links.rows] == [
+        ["Link", None],
+        ["plain", "x"],
+    ]
+    assert links["A2"].hyperlink is None
+    assert links["B2"].hyperlink.target == "#Data!A2"
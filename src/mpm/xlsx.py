@@ -0,0 +1,133 @@
+"""Streaming spreadsheet output shared by the Excel exporters."""
+
+from __future__ import (
+    annotations,
+)  # See PEP 563, check to remove in future Python version higher than 3.7
+import pathlib
+import typing
+
+import attr
+import openpyxl
+import openpyxl.cell
+import openpyxl.styles
+
+
+@attr.s(frozen=True)
+class Link:
+    """
+    A cell value linking to a location within the workbook.  openpyxl 2.5
+    write only worksheets drop cell hyperlinks, so links can only be written
+    by a `Workbook` which is not write only.
+    """
+
+    text = attr.ib()
+    location = attr.ib(type=str)
+
+
+def styled_cell(worksheet, value, style: str):
+    cell = openpyxl.cell.WriteOnlyCell(worksheet, value=value)
+    cell.style = style
+
+    return cell
+
+
+@attr.s
+class Sheet:
+    """
+    A worksheet to be written, the rows are only consumed when saving.
+
+    Styles are referenced by the name of a `openpyxl.styles.NamedStyle`
+    registered with the `Workbook`.
+    """
+
+    title = attr.ib(default=None, type=str)
+    rows = attr.ib(factory=list, type=typing.Iterable[typing.Sequence])
+    header_style = attr.ib(default=None, type=str)
+    style = attr.ib(default=None, type=str)
+    column_widths = attr.ib(factory=dict, type=typing.Dict[str, float])
+    row_height = attr.ib(default=None, type=float)
+
+    def write(self, worksheet) -> None:
+        """
+        Stream the rows into a worksheet.
+
+        Args:
+            worksheet: empty openpyxl worksheet, write only unless the rows
+                hold `Link` values
+        """
+        # Dimensions must be set before the rows are written
+        for column, width in self.column_widths.items():
+            worksheet.column_dimensions[column].width = width
+
+        for index, row in enumerate(self.rows, start=1):
+            links = [
+                (column, value)
+                for column, value in enumerate(row, start=1)
+                if isinstance(value, Link)
+            ]
+            if len(links) > 0:
+                row = [
+                    value.text if isinstance(value, Link) else value for value in row
+                ]
+
+            if index == 1:
+                style = self.header_style
+            else:
+                style = self.style
+                if self.row_height is not None:
+                    worksheet.row_dimensions[index].height = self.row_height
+
+            if style is None:
+                worksheet.append(row)
+            else:
+                worksheet.append(
+                    [styled_cell(worksheet, value, style) for value in row]
+                )
+
+            for column, link in links:
+                worksheet.cell(row=index, column=column).hyperlink = link.location
+
+
+@attr.s
+class Workbook:
+    """
+    Sheets and the named styles they use, written in write only mode unless
+    disabled for small sheets needing features such as cell hyperlinks.
+    """
+
+    sheets = attr.ib(factory=list, type=typing.List[Sheet])
+    styles = attr.ib(factory=list, type=typing.List[openpyxl.styles.NamedStyle])
+    write_only = attr.ib(default=True, type=bool)
+
+    @property
+    def sheetnames(self) -> typing.List[str]:
+        return [sheet.title for sheet in self.sheets]
+
+    def create_sheet(self, title: str = None, **kwargs) -> Sheet:
+        sheet = Sheet(title=title, **kwargs)
+        self.sheets.append(sheet)
+
+        return sheet
+
+    def remove(self, sheet: Sheet) -> None:
+        self.sheets.remove(sheet)
+
+    def save(self, path: pathlib.Path) -> None:
+        """
+        Write the workbook, consuming the sheet rows as they are written.
+
+        Args:
+            path: path and filename for .xlsx file
+        """
+        workbook = openpyxl.Workbook(write_only=self.write_only)
+        if not self.write_only:
+            workbook.remove(workbook.active)
+
+        for style in self.styles:
+            workbook.add_named_style(style)
+
+        for sheet in self.sheets:
+            sheet.write(workbook.create_sheet(title=sheet.title))
+
+        pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        workbook.save(path)